@@ -0,0 +1,62 @@
+"""
+Benchmarks of the prediction pipeline on synthetic standings.
+
+Usage:
+    python -m benchmarks run --seasons 1 5 --output benchmarks/results/head.json
+    python -m benchmarks compare benchmarks/results/base.json benchmarks/results/head.json
+"""
+import argparse
+import sys
+from pathlib import Path
+
+from benchmarks.runner import compare, load_report, run, save_report
+from benchmarks.scenarios import SCENARIOS
+
+RESULTS_DIR = Path(__file__).resolve().parent / 'results'
+
+
+def run_command(args):
+    sizes = [(args.drivers, args.rounds, seasons) for seasons in args.seasons]
+    report = run(args.scenarios, sizes, repeat=args.repeat, seed=args.seed)
+
+    output = Path(args.output) if args.output else RESULTS_DIR / f"{report['commit'] or 'local'}.json"
+    save_report(report, output)
+    print(f"Saved results to {output}")
+
+
+def compare_command(args):
+    rows = compare(load_report(args.baseline), load_report(args.current), threshold=args.threshold)
+
+    for (scenario, drivers, rounds, seasons), time_ratio, memory_ratio, regressed in rows:
+        flag = 'REGRESSION' if regressed else ''
+        print(f"{scenario:<22} {drivers}x{rounds}x{seasons:<4} time {time_ratio:>6.2f}x memory {memory_ratio:>6.2f}x {flag}")
+
+    return 1 if any(row[3] for row in rows) else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description='Prediction pipeline benchmarks')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help='Run scenarios and save the results as JSON')
+    run_parser.add_argument('--scenarios', nargs='+', choices=list(SCENARIOS), default=list(SCENARIOS))
+    run_parser.add_argument('--drivers', type=int, default=20)
+    run_parser.add_argument('--rounds', type=int, default=24)
+    run_parser.add_argument('--seasons', type=int, nargs='+', default=[1, 5])
+    run_parser.add_argument('--repeat', type=int, default=3)
+    run_parser.add_argument('--seed', type=int, default=0)
+    run_parser.add_argument('--output', help='Defaults to benchmarks/results/<commit>.json')
+    run_parser.set_defaults(func=run_command)
+
+    compare_parser = subparsers.add_parser('compare', help='Compare two saved results')
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+    compare_parser.add_argument('--threshold', type=float, default=0.1, help='Relative change flagged as a regression')
+    compare_parser.set_defaults(func=compare_command)
+
+    args = parser.parse_args()
+    sys.exit(args.func(args))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+"""
+Compare the vectorized feature engine with the per-row loop it replaced.
+
+Usage: python -m benchmarks.bench_features --seasons 1 5 10
+"""
+import argparse
+import time
+
+import pandas as pd
+
+from benchmarks.synthetic import generate_standings
+from predictions.utils import Predictor
+
+
+def best_of(func, df, repeat):
+    """Best wall-clock time of `repeat` runs, in seconds"""
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(df)
+        timings.append(time.perf_counter() - start)
+
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark Predictor.prepare_features')
+    parser.add_argument('--seasons', type=int, nargs='+', default=[1, 5, 10])
+    parser.add_argument('--drivers', type=int, default=20)
+    parser.add_argument('--rounds', type=int, default=24)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    predictor = Predictor()
+
+    print(f"{'seasons':>8} {'rows':>8} {'iterative (s)':>14} {'vectorized (s)':>15} {'speedup':>8}")
+    for seasons in args.seasons:
+        df = pd.DataFrame(generate_standings(args.drivers, args.rounds, seasons))
+
+        iterative = best_of(predictor._prepare_features_iterative, df, args.repeat)
+        vectorized = best_of(predictor.prepare_features, df, args.repeat)
+
+        print(f"{seasons:>8} {len(df):>8} {iterative:>14.3f} {vectorized:>15.4f} {iterative / vectorized:>7.0f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,148 @@
+"""
+Requests per second of the OpenF1 top 3 proxy under simulated upstream latency,
+served by gunicorn (WSGI, sync views) and by uvicorn (ASGI, async views).
+A local fake OpenF1 answers every request after --latency seconds.
+
+Usage: python -m benchmarks.bench_proxy --latency 0.1 --concurrency 50 --duration 10
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+TOP3 = [{'position': position, 'driver_number': driver_number} for position, driver_number in ((1, 81), (2, 4), (3, 1))]
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_upstream(latency):
+    """Fake OpenF1 on a free port, answering every request after `latency` seconds"""
+
+    body = json.dumps(TOP3).encode()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(latency)
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    ThreadingHTTPServer.request_queue_size = 1024
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def server_command(profile, port, workers):
+    if profile == 'wsgi':
+        # the Procfile profile, sync workers
+        return ['gunicorn', 'f1_predictor.wsgi', '--bind', f'127.0.0.1:{port}', '--workers', str(workers)]
+
+    return ['uvicorn', 'f1_predictor.asgi:application', '--port', str(port), '--workers', str(workers), '--log-level', 'warning']
+
+
+def wait_until_listening(port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.1)
+
+    raise RuntimeError(f"Server on port {port} didn't start")
+
+
+async def load(url, concurrency, duration):
+    """
+    Keep `concurrency` requests in flight for `duration` seconds
+    :return: successful and failed request counts
+    """
+
+    counts = {'ok': 0, 'failed': 0}
+    deadline = time.monotonic() + duration
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(limits=limits, timeout=30) as client:
+        async def user():
+            while time.monotonic() < deadline:
+                try:
+                    response = await client.get(url)
+                    counts['ok' if response.status_code == 200 else 'failed'] += 1
+                except httpx.HTTPError:
+                    counts['failed'] += 1
+
+        await asyncio.gather(*(user() for _ in range(concurrency)))
+
+    return counts
+
+
+def run_profile(profile, upstream_port, args):
+    port = free_port()
+    env = {
+        **os.environ,
+        'DJANGO_SETTINGS_MODULE': 'benchmarks.proxy_settings',
+        'OPENF1_URL': f'http://127.0.0.1:{upstream_port}/v1',
+        'ALLOWED_HOSTS': os.environ.get('ALLOWED_HOSTS', '127.0.0.1,localhost'),
+        'SECRET_KEY': os.environ.get('SECRET_KEY', 'benchmark'),
+    }
+    process = subprocess.Popen(
+        server_command(profile, port, args.workers), cwd=BACKEND_DIR, env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+
+    try:
+        wait_until_listening(port)
+        url = f'http://127.0.0.1:{port}/top3/latest/'
+        asyncio.run(load(url, args.concurrency, 1))
+        return asyncio.run(load(url, args.concurrency, args.duration))
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the OpenF1 proxy under WSGI and ASGI')
+    parser.add_argument('--latency', type=float, default=0.1, help='Simulated upstream latency in seconds')
+    parser.add_argument('--concurrency', type=int, default=50)
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--profiles', nargs='+', choices=['wsgi', 'asgi'], default=['wsgi', 'asgi'])
+    args = parser.parse_args()
+
+    upstream = start_upstream(args.latency)
+
+    print(f"upstream latency {args.latency * 1000:.0f} ms, {args.concurrency} concurrent clients, {args.workers} workers")
+    print(f"{'profile':>8} {'requests':>9} {'failed':>7} {'req/s':>8}")
+    try:
+        for profile in args.profiles:
+            counts = run_profile(profile, upstream.server_port, args)
+            print(f"{profile:>8} {counts['ok']:>9} {counts['failed']:>7} {counts['ok'] / args.duration:>8.1f}")
+    finally:
+        upstream.shutdown()
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,67 @@
+"""
+Compare the ?fast=1 list path with DRF serialization on large tables.
+Runs against a throwaway test database filled with synthetic standings.
+
+Usage: python -m benchmarks.bench_serialization --seasons 1 10 50
+"""
+import argparse
+import os
+import time
+
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'f1_predictor.settings')
+django.setup()
+
+from django.db import connection  # noqa: E402
+from django.test import Client  # noqa: E402
+from django.test.utils import setup_test_environment  # noqa: E402
+
+from benchmarks.synthetic import generate_standings  # noqa: E402
+from drivers.models import DriverStanding  # noqa: E402
+
+
+def best_of(client, url, params, repeat):
+    """Best wall-clock time of `repeat` requests in seconds, and the response size in bytes"""
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        response = client.get(url, params)
+        timings.append(time.perf_counter() - start)
+
+    return min(timings), len(response.content)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark list serialization')
+    parser.add_argument('--seasons', type=int, nargs='+', default=[1, 10, 50])
+    parser.add_argument('--drivers', type=int, default=20)
+    parser.add_argument('--rounds', type=int, default=24)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    client = Client()
+
+    try:
+        print(f"{'seasons':>8} {'rows':>8} {'drf (s)':>9} {'fast (s)':>9} {'speedup':>8}")
+        for seasons in args.seasons:
+            DriverStanding.objects.all().delete()
+            DriverStanding.objects.bulk_create([
+                DriverStanding(**{key: value for key, value in standing.items() if key != 'id'})
+                for standing in generate_standings(args.drivers, args.rounds, seasons)
+            ], batch_size=1000)
+
+            drf, _ = best_of(client, '/driverstandings/', {}, args.repeat)
+            fast, _ = best_of(client, '/driverstandings/', {'fast': '1'}, args.repeat)
+            rows = DriverStanding.objects.count()
+
+            print(f"{seasons:>8} {rows:>8} {drf:>9.3f} {fast:>9.4f} {drf / fast:>7.1f}x")
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
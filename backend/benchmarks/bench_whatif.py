@@ -0,0 +1,106 @@
+"""
+Latency of the what-if endpoint under concurrent clients, with requests micro-batched
+into one model call and with every request calling the model on its own.
+Runs in-process against a throwaway test database filled with synthetic standings.
+
+Usage: python -m benchmarks.bench_whatif --concurrency 1 8 32 --requests 400
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'f1_predictor.settings')
+django.setup()
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test import Client  # noqa: E402
+from django.test.utils import override_settings, setup_test_environment  # noqa: E402
+
+from benchmarks.synthetic import DRIVER_NUMBERS, generate_standings  # noqa: E402
+from drivers.models import DriverStanding  # noqa: E402
+from predictions import whatif  # noqa: E402
+from predictions.artifacts import load_or_train  # noqa: E402
+from predictions.utils import Predictor  # noqa: E402
+
+
+def measure(concurrency, requests, seed=0):
+    """
+    Send `requests` what-if scenarios from `concurrency` threads
+    :return: latencies in seconds
+    """
+
+    rng = np.random.default_rng(seed)
+    latencies = []
+    lock = threading.Lock()
+
+    def user(count):
+        client = Client()
+        for _ in range(count):
+            order = rng.permutation(DRIVER_NUMBERS)[:10]
+            results = [{'driver_number': int(n), 'position': i + 1} for i, n in enumerate(order)]
+
+            start = time.perf_counter()
+            response = client.post('/predictions/whatif/', {'results': results}, content_type='application/json')
+            elapsed = time.perf_counter() - start
+
+            assert response.status_code == 200, response.content
+            with lock:
+                latencies.append(elapsed)
+
+    threads = [threading.Thread(target=user, args=(requests // concurrency,)) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return np.array(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark what-if prediction latency')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 8, 32])
+    parser.add_argument('--requests', type=int, default=400)
+    parser.add_argument('--rounds', type=int, default=12)
+    args = parser.parse_args()
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    folder = tempfile.TemporaryDirectory()
+
+    try:
+        with override_settings(MODEL_ARTIFACT_DIR=Path(folder.name)):
+            standings = generate_standings(drivers=20, rounds=args.rounds)
+            DriverStanding.objects.bulk_create(
+                DriverStanding(**{key: value for key, value in standing.items() if key != 'id'})
+                for standing in standings
+            )
+
+            predictor = Predictor('xgboost')
+            load_or_train(predictor, predictor.prepare_features(pd.DataFrame(standings)))
+
+            print(f"{'mode':>9} {'clients':>8} {'p50 (ms)':>9} {'p99 (ms)':>9} {'req/s':>8}")
+            for mode, max_batch in (('batched', whatif.MAX_BATCH), ('unbatched', 1)):
+                whatif.batcher.max_batch = max_batch
+                measure(1, 20)
+
+                for concurrency in args.concurrency:
+                    start = time.perf_counter()
+                    latencies = measure(concurrency, args.requests) * 1000
+                    rate = len(latencies) / (time.perf_counter() - start)
+
+                    print(f"{mode:>9} {concurrency:>8} {np.percentile(latencies, 50):>9.1f} "
+                          f"{np.percentile(latencies, 99):>9.1f} {rate:>8.1f}")
+    finally:
+        folder.cleanup()
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,7 @@
+"""
+Settings for bench_proxy: the response cache is disabled, so every request that isn't
+collapsed into an in-flight one waits on the simulated upstream.
+"""
+from f1_predictor.settings import *  # noqa: F401,F403
+
+CACHES = {'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}
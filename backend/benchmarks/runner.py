@@ -0,0 +1,138 @@
+import gc
+import json
+import platform
+import statistics
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime
+
+from benchmarks.scenarios import SCENARIOS
+from benchmarks.synthetic import generate_standings
+
+
+def git_commit():
+    """Commit the benchmarks run against, None outside a git checkout"""
+
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def measure(func, repeat):
+    """
+    Time `func` and track its peak Python-visible memory.
+    NumPy buffers are traced by tracemalloc, native allocations inside xgboost are not.
+    :param func:
+    :param repeat: timed runs, memory is tracked on one extra run
+    :return: dict of timings in seconds and peak memory in bytes
+    """
+
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'min_seconds': min(timings),
+        'median_seconds': statistics.median(timings),
+        'peak_memory_bytes': peak,
+    }
+
+
+def run(scenarios, sizes, repeat=3, seed=0, log=print):
+    """
+    Run every scenario on synthetic standings of every size
+    :param scenarios: names from SCENARIOS
+    :param sizes: list of (drivers, rounds, seasons)
+    :param repeat: timed runs per scenario and size
+    :param seed: seed of the synthetic standings
+    :param log: called with a line per finished measurement
+    :return: report dict, as saved to JSON
+    """
+
+    results = []
+    for drivers, rounds, seasons in sizes:
+        standings = generate_standings(drivers=drivers, rounds=rounds, seasons=seasons, seed=seed)
+
+        for name in scenarios:
+            result = {
+                'scenario': name,
+                'drivers': drivers,
+                'rounds': rounds,
+                'seasons': seasons,
+                'rows': len(standings),
+                **measure(SCENARIOS[name](standings), repeat),
+            }
+            results.append(result)
+            log(format_result(result))
+
+    return {
+        'commit': git_commit(),
+        'created_at': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'repeat': repeat,
+        'seed': seed,
+        'results': results,
+    }
+
+
+def result_key(result):
+    return result['scenario'], result['drivers'], result['rounds'], result['seasons']
+
+
+def format_result(result):
+    return (
+        f"{result['scenario']:<22} {result['rows']:>8} rows "
+        f"{result['min_seconds']:>10.4f}s {result['peak_memory_bytes'] / 2 ** 20:>9.1f} MiB"
+    )
+
+
+def compare(baseline, current, threshold=0.1):
+    """
+    Compare two reports measurement by measurement
+    :param baseline: report dict
+    :param current: report dict
+    :param threshold: relative slowdown or memory growth reported as a regression
+    :return: list of (key, time ratio, memory ratio, regressed) for measurements in both reports
+    """
+
+    baseline_results = {result_key(result): result for result in baseline['results']}
+    rows = []
+
+    for result in current['results']:
+        before = baseline_results.get(result_key(result))
+        if before is None:
+            continue
+
+        time_ratio = result['min_seconds'] / before['min_seconds']
+        memory_ratio = result['peak_memory_bytes'] / max(before['peak_memory_bytes'], 1)
+        regressed = time_ratio > 1 + threshold or memory_ratio > 1 + threshold
+        rows.append((result_key(result), time_ratio, memory_ratio, regressed))
+
+    return rows
+
+
+def load_report(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_report(report, path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2)
@@ -0,0 +1,64 @@
+import contextlib
+import io
+
+import pandas as pd
+
+from predictions.simulation import simulate_championship
+from predictions.utils import DEFAULT_PARAMS, Predictor
+
+
+def quietly(func, *args, **kwargs):
+    """Call func with its progress prints silenced"""
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        return func(*args, **kwargs)
+
+
+def feature_engineering(standings):
+    """Predictor.prepare_features over every standing"""
+
+    df = pd.DataFrame(standings)
+    predictor = Predictor()
+
+    return lambda: predictor.prepare_features(df)
+
+
+def training(model_type):
+    """Predictor.train of one model type, including feature engineering"""
+
+    def scenario(standings):
+        return lambda: quietly(Predictor(model_type).train, standings)
+
+    return scenario
+
+
+def grid_prediction(standings):
+    """Predictor.predict_many for the whole grid of the latest season"""
+
+    predictor = Predictor('xgboost')
+    quietly(predictor.train, standings)
+
+    return lambda: predictor.predict_many(standings)
+
+
+def championship_simulation(standings):
+    """100k simulated seasons from the whole-grid predictions"""
+
+    predictor = Predictor('xgboost')
+    quietly(predictor.train, standings)
+    predictions = list(predictor.predict_many(standings).values())
+
+    current_points = [prediction['current_points'] for prediction in predictions]
+    expected_gain = [prediction['predicted_points_gain'] for prediction in predictions]
+    std = predictor.residual_std['points']
+
+    return lambda: simulate_championship(current_points, expected_gain, std, 10, simulations=100_000)
+
+
+# Each scenario takes the standings and returns the callable to time, so setup isn't measured
+SCENARIOS = {
+    'features': feature_engineering,
+    **{f'train_{model_type}': training(model_type) for model_type in DEFAULT_PARAMS},
+    'predict_many': grid_prediction,
+    'championship': championship_simulation,
+}
@@ -0,0 +1,62 @@
+import numpy as np
+
+# Points for P1-P10 in a grand prix
+POINTS_TABLE = [25, 18, 15, 12, 10, 8, 6, 4, 2, 1]
+
+# Permanent numbers of a current grid, extended with made-up numbers for bigger grids
+DRIVER_NUMBERS = [1, 4, 5, 6, 10, 12, 14, 16, 18, 22, 23, 27, 30, 31, 43, 44, 55, 63, 81, 87]
+
+
+def generate_standings(drivers=20, rounds=24, seasons=1, first_season=2025, seed=0, dnf_rate=0.05):
+    """
+    Generate deterministic DriverStanding-shaped rows.
+    Each round every driver gets a race finish drawn around a fixed pace for the season,
+    some drivers retire and finish last, and the championship table is rebuilt from
+    cumulative points and wins.
+    :param drivers: drivers on the grid
+    :param rounds: rounds per season
+    :param seasons: number of consecutive seasons
+    :param first_season: year of the first season
+    :param seed: random seed
+    :param dnf_rate: chance of a driver retiring from a race
+    :return: list of dicts, as returned by DriverStanding.objects.values()
+    """
+
+    rng = np.random.default_rng(seed)
+    numbers = (DRIVER_NUMBERS + list(range(100, 100 + drivers)))[:drivers]
+    points_table = np.zeros(drivers, dtype=int)
+    points_table[:min(drivers, len(POINTS_TABLE))] = POINTS_TABLE[:drivers]
+
+    standings = []
+    row_id = 1
+
+    for season in range(first_season, first_season + seasons):
+        pace = rng.normal(0, 1, drivers)
+        points = np.zeros(drivers, dtype=int)
+        wins = np.zeros(drivers, dtype=int)
+
+        for round_num in range(1, rounds + 1):
+            race_pace = pace + rng.normal(0, 1.5, drivers)
+            race_pace[rng.random(drivers) < dnf_rate] += 100
+            finishing_order = np.argsort(race_pace)
+            points[finishing_order] += points_table
+            wins[finishing_order[0]] += 1
+
+            # championship table: most points first, wins break ties
+            table = np.lexsort((-wins, -points))
+            positions = np.empty(drivers, dtype=int)
+            positions[table] = np.arange(1, drivers + 1)
+
+            for i in range(drivers):
+                standings.append({
+                    'id': row_id,
+                    'position': int(positions[i]),
+                    'points': int(points[i]),
+                    'wins': int(wins[i]),
+                    'season': str(season),
+                    'round': round_num,
+                    'driver_number': numbers[i],
+                })
+                row_id += 1
+
+    return standings
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.4 on 2026-10-18 10:27
+
+from django.db import migrations, models
+from django.db.models import Max
+
+
+def delete_duplicates(apps, schema_editor):
+    """Keep only the most recently created row of every constructor_id"""
+
+    Constructor = apps.get_model('constructors', 'Constructor')
+    keep = Constructor.objects.values('constructor_id').annotate(keep_id=Max('id')).values('keep_id')
+    Constructor.objects.exclude(id__in=keep).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('constructors', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(delete_duplicates, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='constructor',
+            name='constructor_id',
+            field=models.CharField(max_length=50, unique=True),
+        ),
+    ]
@@ -2,7 +2,7 @@ from django.db import models
 
 class Constructor(models.Model):
     """Model to store constructor information"""
-    constructor_id = models.CharField(max_length=50)
+    constructor_id = models.CharField(max_length=50, unique=True)
     url = models.CharField(max_length=100)
     name = models.CharField(max_length=50)
     nationality = models.CharField(max_length=50)
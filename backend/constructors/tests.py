@@ -1,3 +1,11 @@
 from django.test import TestCase
 
-# Create your tests here.
+from .models import Constructor
+
+
+class FastListTests(TestCase):
+    def test_matches_serializer(self):
+        Constructor.objects.create(constructor_id='mclaren', url='http://example.com', name='McLaren', nationality='British')
+
+        expected = self.client.get('/constructors/').json()
+        self.assertEqual(self.client.get('/constructors/', {'fast': 'true'}).json(), expected)
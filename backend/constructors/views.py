@@ -1,9 +1,10 @@
 from django.shortcuts import render
 from rest_framework import viewsets, status
+from f1_predictor.fast_list import FastListMixin
 from .serializers import ConstructorSerializer
 from .models import Constructor
 
-class ConstructorViewSet(viewsets.ModelViewSet):
+class ConstructorViewSet(FastListMixin, viewsets.ModelViewSet):
     """API viewset for Constructor objects."""
     queryset = Constructor.objects.all().order_by('constructor_id')
     serializer_class = ConstructorSerializer
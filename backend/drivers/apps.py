@@ -1,5 +1,14 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_save
+
 
 class DriversConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'drivers'
+
+    def ready(self):
+        from .models import DriverStanding
+        from .standings import bump_standing_version
+
+        post_save.connect(bump_standing_version, sender=DriverStanding, dispatch_uid='drivers_standings_version_on_save')
+        post_delete.connect(bump_standing_version, sender=DriverStanding, dispatch_uid='drivers_standings_version_on_delete')
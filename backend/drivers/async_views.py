@@ -0,0 +1,40 @@
+import logging
+
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET
+
+from . import openf1
+
+logger = logging.getLogger(__name__)
+
+
+@require_GET
+async def latest_top3(request):
+    """
+    Async twin of ResultViewSet.latest_top3 for ASGI deployments, routed instead of it when
+    ASYNC_PROXY_VIEWS is set. Waiting on OpenF1 yields the event loop instead of holding a worker.
+    """
+    try:
+        results = await openf1.latest_top3.aget()
+
+        # Handle empty results
+        if not results:
+            logger.warning("OpenF1 API returned no results for latest session")
+            return JsonResponse({
+                'results': [],
+                'message': 'No recent race results available. Check back after the next F1 session!',
+                'has_data': False
+            }, status=200)
+
+        return JsonResponse({
+            'results': results,
+            'has_data': True
+        })
+
+    except openf1.UpstreamError as e:
+        logger.error(f"Error getting results: {e}")
+        return JsonResponse({'error': 'API returned non-200 status'}, status=e.status)
+
+    except Exception as e:
+        logger.error(f"Error getting results: {e}")
+        return JsonResponse({"error": str(e)}, status=500)
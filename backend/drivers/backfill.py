@@ -0,0 +1,189 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import transaction
+
+from f1_predictor.http_cache import response_cache
+from f1_predictor.upsert import bulk_upsert
+from .jolpica import MAX_PAGE_SIZE, fetch_pages
+from .models import BackfillCheckpoint, DriverStanding
+
+logger = logging.getLogger(__name__)
+
+# Numbers given to drivers of a season without a permanent number, whose car number another driver already had
+SYNTHETIC_NUMBER_START = 1000
+
+
+def safe_int(value):
+    try:
+        return int(value)
+    except (ValueError, TypeError):
+        return None
+
+
+def permanent_number(driver):
+    number = safe_int(driver.get('permanentNumber'))
+
+    # Verstappen's permanent #33 is stored as his current #1
+    return 1 if number == 33 else number
+
+
+def merge_races(pages):
+    """
+    Results of every race of a season from result pages, joining races split over two pages
+    :param pages: documents of the season's results resource
+    :return: dict of round -> list of results
+    """
+
+    races = {}
+    for page in pages:
+        for race in page.get('MRData', {}).get('RaceTable', {}).get('Races', []):
+            races.setdefault(int(race['round']), []).extend(race.get('Results', []))
+
+    return races
+
+
+def driver_numbers(races):
+    """
+    Number of every driver of a season: the permanent number, given since 2014, otherwise the first
+    car number they raced with that season, unless another driver of the season already has it
+    :param races: dict of round -> list of results
+    :return: dict of Ergast driverId -> number
+    """
+
+    results = [result for round_num in sorted(races) for result in races[round_num]]
+
+    numbers = {}
+    for result in results:
+        number = permanent_number(result['Driver'])
+        if number is not None:
+            numbers.setdefault(result['Driver']['driverId'], number)
+
+    taken = set(numbers.values())
+    synthetic = SYNTHETIC_NUMBER_START
+    for result in results:
+        driver_id = result['Driver']['driverId']
+        if driver_id in numbers:
+            continue
+
+        number = safe_int(result.get('number'))
+        if number is None or number in taken:
+            while synthetic in taken:
+                synthetic += 1
+            number = synthetic
+
+        numbers[driver_id] = number
+        taken.add(number)
+
+    return numbers
+
+
+def without_permanent_number(pages):
+    """
+    Whether any standing of driverstandings pages is of a driver without a permanent number,
+    who can only be numbered from the season's results
+    :param pages: documents of the driverstandings resource
+    :return:
+    """
+
+    return any(
+        permanent_number(standing.get('Driver', {})) is None
+        for page in pages
+        for standings_list in page.get('MRData', {}).get('StandingsTable', {}).get('StandingsLists', [])
+        for standing in standings_list.get('DriverStandings', [])
+    )
+
+
+def standings_rows(season, pages, numbers):
+    """
+    DriverStanding rows of driverstandings pages
+    :param season:
+    :param pages: documents of the driverstandings resource of one or more rounds
+    :param numbers: dict of Ergast driverId -> number, from driver_numbers
+    :return: list of dicts of DriverStanding fields
+    """
+
+    rows = []
+    for page in pages:
+        for standings_list in page.get('MRData', {}).get('StandingsTable', {}).get('StandingsLists', []):
+            round_number = int(standings_list['round'])
+
+            for standing in standings_list.get('DriverStandings', []):
+                driver = standing.get('Driver', {})
+                driver_number = numbers.get(driver.get('driverId'))
+                if driver_number is None:
+                    driver_number = permanent_number(driver)
+                position = safe_int(standing.get('position'))
+
+                # drivers excluded from a championship have no position
+                if driver_number is None or position is None:
+                    logger.warning(f"Skipping standing of {driver.get('driverId')} in round {round_number} of {season}")
+                    continue
+
+                rows.append({
+                    'season': str(season),
+                    'round': round_number,
+                    'driver_number': driver_number,
+                    'position': position,
+                    'points': float(standing.get('points', 0)),
+                    'wins': safe_int(standing.get('wins')) or 0,
+                })
+
+    return rows
+
+
+def fetch_season(season, page_size=MAX_PAGE_SIZE, offline=False, finished=True):
+    """
+    Standings after every round of a season. The season's results are walked page by page
+    first, for its rounds and the numbers of drivers without a permanent one, then every
+    round's standings are fetched concurrently.
+    :param season:
+    :param page_size: rows per page
+    :param offline: serve from the response cache only
+    :param finished: the season is over, its responses are cached as immutable once all of them arrived
+    :return: list of dicts of DriverStanding fields, number of rounds
+    """
+
+    base = f'{settings.JOLPICA_URL}/{season}'
+    results = fetch_pages(f'{base}/results/', page_size, offline=offline)
+    races = merge_races(results.values())
+    if not races:
+        raise ValueError(f"No race results for season {season}")
+
+    numbers = driver_numbers(races)
+
+    def fetch_round(round_num):
+        return fetch_pages(f'{base}/{round_num}/driverstandings/', page_size, offline=offline)
+
+    with ThreadPoolExecutor(max_workers=settings.JOLPICA_WORKERS) as executor:
+        standings = {url: page for pages in executor.map(fetch_round, sorted(races)) for url, page in pages.items()}
+
+    # a failed season's pages are revalidated by the next run, it may have failed on incomplete data
+    if finished:
+        for url in [*results, *standings]:
+            response_cache.mark_immutable(url)
+
+    return standings_rows(season, standings.values(), numbers), len(races)
+
+
+def load_season(season, rows, rounds, checkpoint=True):
+    """
+    Write a season's standings and its checkpoint in one transaction, so a season is either
+    loaded and checkpointed or left to the next run
+    :param season:
+    :param rows: from fetch_season
+    :param rounds:
+    :param checkpoint: record the season as done, skipped by later runs
+    :return: counts of bulk_upsert
+    """
+
+    with transaction.atomic():
+        counts = bulk_upsert(DriverStanding, rows, key_fields=['season', 'round', 'driver_number'])
+
+        if checkpoint:
+            BackfillCheckpoint.objects.update_or_create(
+                season=str(season), defaults={'rounds': rounds, 'rows': len(rows)}
+            )
+
+    return counts
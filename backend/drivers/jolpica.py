@@ -0,0 +1,184 @@
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.error import HTTPError, URLError
+
+from django.conf import settings
+from django.utils.dateparse import parse_datetime
+
+from f1_predictor.http_cache import get_json
+
+logger = logging.getLogger(__name__)
+
+# Jolpica's published limits for unauthenticated clients: bursts of 4 requests a second, 500 an hour
+BURST_LIMIT = 4
+HOURLY_LIMIT = 500
+
+# Responses worth asking again for, rate limited or a transient server error
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Largest page the API serves
+MAX_PAGE_SIZE = 100
+
+# Longest wait before a retry, whatever the backoff or Retry-After says
+MAX_RETRY_DELAY = 60
+
+
+class TokenBucket:
+    """Holds up to `capacity` tokens, refilled at `rate` tokens per second, shared by every thread"""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """
+        Take a token, possibly one that is still to be refilled
+        :return: seconds to wait until the token is available
+        """
+
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+            # going below zero queues callers in the order they arrived
+            self.tokens -= 1
+            return max(0, -self.tokens / self.rate)
+
+
+class RateLimiter:
+    """Wait for a token from every bucket, e.g. a per-second and a per-hour limit"""
+
+    def __init__(self, *buckets):
+        self.buckets = buckets
+
+    def acquire(self):
+        time.sleep(max(bucket.reserve() for bucket in self.buckets))
+
+
+rate_limiter = RateLimiter(TokenBucket(BURST_LIMIT, BURST_LIMIT), TokenBucket(HOURLY_LIMIT / 3600, HOURLY_LIMIT))
+
+
+def retry_delay(attempt, error=None):
+    """
+    Seconds to wait before retrying, the server's Retry-After if it sent one,
+    otherwise exponential backoff with jitter
+    :param attempt: number of failed attempts so far, from 0
+    :param error: HTTPError of the failed attempt
+    :return:
+    """
+
+    retry_after = error.headers.get('Retry-After') if error is not None and error.headers else None
+    if retry_after is not None:
+        try:
+            return min(float(retry_after), MAX_RETRY_DELAY)
+        except ValueError:
+            pass
+
+    return min(settings.JOLPICA_BACKOFF * 2 ** attempt * random.uniform(0.5, 1.5), MAX_RETRY_DELAY)
+
+
+def fetch_json(url, retries=None, offline=False):
+    """
+    Fetch a JSON document from the Jolpica API through the response cache, within its rate limits,
+    retrying with backoff on 429, 5xx and connection errors. Cached documents cost no request.
+    :param url:
+    :param retries: attempts after the first, settings.JOLPICA_RETRIES if None
+    :param offline: serve from the response cache only
+    :return: the decoded document
+    """
+
+    retries = settings.JOLPICA_RETRIES if retries is None else retries
+
+    for attempt in range(retries + 1):
+        try:
+            return get_json(
+                url, offline=offline, timeout=settings.JOLPICA_TIMEOUT, before_request=rate_limiter.acquire
+            )
+
+        except HTTPError as e:
+            if e.code not in RETRY_STATUSES or attempt == retries:
+                raise
+            error, delay = e, retry_delay(attempt, e)
+
+        except (URLError, TimeoutError) as e:
+            if attempt == retries:
+                raise
+            error, delay = e, retry_delay(attempt)
+
+        logger.warning(f"Fetching {url} failed: {error}, retrying in {delay:.1f}s")
+        time.sleep(delay)
+
+
+def fetch_many(urls, workers=None, offline=False):
+    """
+    Fetch JSON documents concurrently, every request within the shared rate limits
+    :param urls:
+    :param workers: threads, settings.JOLPICA_WORKERS if None
+    :param offline: serve from the response cache only
+    :return: list with the document or the raised exception of each url, in the order of urls
+    """
+
+    def fetch(url):
+        try:
+            return fetch_json(url, offline=offline)
+        except Exception as e:
+            return e
+
+    with ThreadPoolExecutor(max_workers=workers or settings.JOLPICA_WORKERS) as executor:
+        return list(executor.map(fetch, urls))
+
+
+def race_calendar(season, offline=False):
+    """
+    Start of every race of a season in round order, from the Jolpica schedule
+    :param season:
+    :param offline: serve from the response cache only
+    :return: list of aware datetimes
+    """
+
+    document = fetch_json(f'{settings.JOLPICA_URL}/{season}/races/?limit=100', offline=offline)
+    races = document.get('MRData', {}).get('RaceTable', {}).get('Races', [])
+
+    starts = {}
+    for race in races:
+        # races without a time are given the start of their day
+        start = parse_datetime(f"{race['date']}T{race.get('time', '00:00:00Z')}".replace('Z', '+00:00'))
+        if start is not None:
+            starts[int(race['round'])] = start
+
+    return [starts[round_num] for round_num in sorted(starts)]
+
+
+def page_url(url, limit, offset):
+    separator = '&' if '?' in url else '?'
+    return f'{url}{separator}limit={limit}&offset={offset}'
+
+
+def fetch_pages(url, page_size=MAX_PAGE_SIZE, offline=False):
+    """
+    Every page of a limit/offset paginated resource. The first page tells the total,
+    the others are then fetched concurrently.
+    :param url: resource without limit and offset
+    :param page_size: rows per page, at most MAX_PAGE_SIZE
+    :param offline: serve from the response cache only
+    :return: dict of page url -> document, in offset order
+    """
+
+    first_url = page_url(url, page_size, 0)
+    first = fetch_json(first_url, offline=offline)
+    total = int(first.get('MRData', {}).get('total', 0))
+
+    urls = [page_url(url, page_size, offset) for offset in range(page_size, total, page_size)]
+    pages = fetch_many(urls, offline=offline)
+    for page in pages:
+        if isinstance(page, Exception):
+            raise page
+
+    return {first_url: first, **dict(zip(urls, pages))}
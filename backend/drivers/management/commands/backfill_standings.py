@@ -0,0 +1,99 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+from django.utils import timezone
+from drivers.backfill import fetch_season, load_season
+from drivers.jolpica import MAX_PAGE_SIZE
+from drivers.models import BackfillCheckpoint
+from drivers.standings import bump_standings_versions, refresh_latest_standings
+from f1_predictor.upsert import describe
+from stats.cache import season_points
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# First season of the world championship
+FIRST_SEASON = 1950
+
+
+class Command(BaseCommand):
+    """Management command for loading the standings of past seasons, resuming where the last run stopped"""
+    help = 'Backfill DriverStanding objects of past seasons from the Jolpica-F1 API'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start', type=int, default=FIRST_SEASON, help='First season to load')
+        parser.add_argument('--end', type=int, default=None, help='Last season to load, the last finished one by default')
+        parser.add_argument('--jobs', type=int, default=2, help='Seasons fetched in parallel')
+        parser.add_argument('--page-size', type=int, default=MAX_PAGE_SIZE, help='Rows per API page')
+        parser.add_argument(
+            '--restart', action='store_true', help='Load every season again, ignoring the checkpoints'
+        )
+        parser.add_argument(
+            '--offline', action='store_true', help='Replay responses from the HTTP cache, without any request'
+        )
+
+    def handle(self, *args, **options):
+        current_season = timezone.now().year
+        end = options['end'] if options['end'] is not None else current_season - 1
+        seasons = [str(season) for season in range(options['start'], end + 1)]
+
+        # Seasons loaded by an earlier run are skipped, the current one is never done
+        done = set() if options['restart'] else set(
+            BackfillCheckpoint.objects.filter(season__in=seasons).values_list('season', flat=True)
+        )
+        pending = [season for season in seasons if season not in done]
+        self.stdout.write(f"{len(done)} of {len(seasons)} seasons already loaded, {len(pending)} to go")
+
+        loaded, failed = [], []
+        total_rows = 0
+        start = time.perf_counter()
+
+        try:
+            # Seasons are fetched in parallel, and loaded here one transaction each as soon as they arrive
+            with ThreadPoolExecutor(max_workers=max(options['jobs'], 1)) as executor:
+                futures = {
+                    executor.submit(
+                        fetch_season, season, options['page_size'], options['offline'],
+                        finished=int(season) < current_season,
+                    ): season
+                    for season in pending
+                }
+
+                for future in as_completed(futures):
+                    season = futures[future]
+
+                    try:
+                        rows, rounds = future.result()
+                        counts = load_season(season, rows, rounds, checkpoint=int(season) < current_season)
+                    except Exception as e:
+                        logger.error(f"Error loading season {season}: {e}")
+                        failed.append(season)
+                        continue
+
+                    loaded.append(season)
+                    total_rows += len(rows)
+                    elapsed = time.perf_counter() - start
+                    self.stdout.write(self.style.SUCCESS(
+                        f"Season {season}: {rounds} rounds, {describe(counts, 'standings')} "
+                        f"({total_rows / elapsed:.0f} rows/s so far)"
+                    ))
+
+        finally:
+            # Bulk writes send no signals, so the loaded seasons are invalidated and rebuilt here,
+            # also when the run is interrupted
+            if loaded:
+                bump_standings_versions(loaded)
+                refresh_latest_standings(loaded)
+                season_points()
+
+        elapsed = time.perf_counter() - start
+        self.stdout.write(
+            f"Loaded {total_rows} standings of {len(loaded)} seasons in {elapsed:.1f}s "
+            f"({total_rows / elapsed if elapsed else 0:.0f} rows/s)"
+        )
+
+        if failed:
+            raise CommandError(
+                f"Command failed: seasons {', '.join(sorted(failed))} could not be loaded, run again to resume"
+            )
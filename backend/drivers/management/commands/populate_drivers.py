@@ -1,40 +1,40 @@
 from django.core.management.base import BaseCommand
 from django.core.management.base import CommandError
 from drivers.models import Driver
-from urllib.request import urlopen
-import json
+from drivers.photos import generate_photos
+from f1_predictor.http_cache import get_json
+from f1_predictor.upsert import bulk_upsert, describe
+
+# OpenF1 driver fields stored on Driver, under the same names
+DRIVER_FIELDS = [
+    'broadcast_name', 'country_code', 'driver_number', 'first_name', 'full_name', 'headshot_url',
+    'last_name', 'meeting_key', 'name_acronym', 'session_key', 'team_colour', 'team_name',
+]
 
 
 class Command(BaseCommand):
     """Management command for populating Driver objects with data."""
     help = 'Populate Driver objects with data from OpenF1 API.'
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--offline', action='store_true', help='Replay responses from the HTTP cache, without any request'
+        )
+
     def handle(self, *args, **options):
         try:
             url = 'https://api.openf1.org/v1/drivers?&driver_number%3C=100&session_key=latest'
-            response = urlopen(url)
-
-            if response.status == 200:
-                drivers_data = json.loads(response.read().decode('utf-8'))
-                for driver in drivers_data:
-                    if not Driver.objects.filter(driver_number=driver['driver_number']).exists():
-                        new_driver = Driver(
-                            broadcast_name=driver['broadcast_name'],
-                            country_code=driver['country_code'],
-                            driver_number=driver['driver_number'],
-                            first_name=driver['first_name'],
-                            full_name=driver['full_name'],
-                            headshot_url=driver['headshot_url'],
-                            last_name=driver['last_name'],
-                            meeting_key=driver['meeting_key'],
-                            name_acronym=driver['name_acronym'],
-                            session_key=driver['session_key'],
-                            team_colour=driver['team_colour'],
-                            team_name=driver['team_name'],
-                        )
-                        new_driver.save()
-            else:
-                raise CommandError(response.status)
+            drivers_data = get_json(url, offline=options['offline'])
+
+            # Diffed against the stored drivers in one query, only new and changed ones are written
+            counts = bulk_upsert(Driver, [
+                {field: driver[field] for field in DRIVER_FIELDS} for driver in drivers_data
+            ], key_fields=['driver_number'])
+            self.stdout.write(self.style.SUCCESS(describe(counts, 'drivers')))
+
+            # Resize every headshot once here, so requests only ever send files
+            photo_count = generate_photos(Driver.objects.all(), offline=options['offline'])
+            self.stdout.write(f"Generated photos for {photo_count} drivers")
 
         except Exception as e:
             raise CommandError(f"Command failed: {e}")
@@ -1,10 +1,16 @@
+from concurrent.futures import ThreadPoolExecutor
 from django.core.management.base import BaseCommand
 from django.core.management.base import CommandError
+from django.conf import settings
+from django.utils import timezone
+from drivers.backfill import driver_numbers, merge_races, standings_rows, without_permanent_number
+from drivers.jolpica import fetch_pages, race_calendar
 from drivers.models import DriverStanding
-from urllib.request import urlopen
-import json
+from drivers.standings import bump_standings_versions, meeting_calendar, refresh_latest_standings, rounds_to_fetch
+from f1_predictor.http_cache import response_cache
+from f1_predictor.upsert import bulk_upsert, describe
+from stats.cache import season_points
 import logging
-import time
 
 logger = logging.getLogger(__name__)
 
@@ -13,131 +19,119 @@ class Command(BaseCommand):
     """Management command for populating DriverStanding objects with data"""
     help = 'Populate DriverStanding objects with data from the FastF1 API'
 
-    def handle(self, *args, **options):
-        try:
-            # Call the Jolpica-F1 api for results from each round
-            for round_num in range(1, 25):
-                self.stdout.write(f"Processing round {round_num}...")
-
-                url = f'https://api.jolpi.ca/ergast/f1/2025/{round_num}/driverstandings/'
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--season', nargs='+', default=None,
+            help='Seasons to populate, the current one by default. Past seasons backfill their missing rounds'
+        )
+        parser.add_argument(
+            '--full', action='store_true', help='Fetch every round run so far, not only the missing and latest ones'
+        )
+        parser.add_argument(
+            '--offline', action='store_true', help='Replay responses from the HTTP cache, without any request'
+        )
 
-                try:
-                    response = urlopen(url)
-
-                    if response.status == 200:
-                        standings_data = json.loads(response.read().decode('utf-8'))
+    def handle(self, *args, **options):
+        # Seasons fetched during this run, and their standings, written together at the end
+        self.seasons = set()
+        self.rows = []
 
-                        # Process the standings data
-                        success_count = self.process_standings_data(standings_data, round_num)
+        try:
+            now = timezone.now()
+            seasons = options['season'] or [str(now.year)]
 
-                        if success_count > 0:
-                            self.stdout.write(
-                                self.style.SUCCESS(
-                                    f"Successfully processed {success_count} standings for round {round_num}")
-                            )
-                        else:
-                            self.stdout.write(f"No standings data available for round {round_num}")
+            stored = {season: set() for season in seasons}
+            if not options['full']:
+                for season, round_num in DriverStanding.objects.filter(
+                        season__in=seasons).values_list('season', 'round').distinct():
+                    stored[season].add(round_num)
 
-                    else:
-                        logger.warning(f"Failed to fetch data for round {round_num}. Status: {response.status}")
+            for season in seasons:
+                self.populate_season(season, stored[season], now, options['offline'])
 
-                except Exception as e:
-                    logger.error(f"Error fetching data for round {round_num}: {e}")
-                    continue
+            counts = bulk_upsert(DriverStanding, self.rows, key_fields=['season', 'round', 'driver_number'])
+            self.stdout.write(self.style.SUCCESS(describe(counts, 'standings')))
 
-                # Rate limiting
-                time.sleep(0.5)
+            # Bulk writes send no signals, so stale seasons are invalidated here. The latest standings
+            # and the pivoted points of changed seasons are rebuilt once, instead of on every request
+            if counts['inserted'] or counts['updated']:
+                bump_standings_versions(self.seasons)
+                refresh_latest_standings(self.seasons)
+            season_points()
 
         except Exception as e:
             raise CommandError(f"Command failed: {e}")
 
-    def process_standings_data(self, standings_data, round_num):
-        """
-        Process the standings data from API response
-        Returns the number of successfully processed standings
-        """
-        success_count = 0
-
-        # Navigate through the nested data structure
-        mr_data = standings_data.get('MRData', {})
-        standings_table = mr_data.get('StandingsTable', {})
-        standings_lists = standings_table.get('StandingsLists', [])
-
-        if not standings_lists:
-            return 0  # No data for this round yet
-
-        standings_list = standings_lists[0]
-        season = standings_list.get('season')
-        round_number = self.safe_int_conversion(standings_list.get('round'), 'round number')
-
-        if round_number is None:
-            logger.error(f"Invalid round number for round {round_num}")
-            return 0
-
-        driver_standings_list = standings_list.get('DriverStandings', [])
-
-        for standing in driver_standings_list:
-            if self.process_single_standing(standing, season, round_number, round_num):
-                success_count += 1
-
-        return success_count
-
-    def process_single_standing(self, standing, season, round_number, round_num):
-        """
-        Process a single driver standing entry
-        Returns True if successful, False otherwise
-        """
-        try:
-            # Safely extract and convert numeric values
-            position = self.safe_int_conversion(standing.get('position'), 'position')
-            points = self.safe_int_conversion(standing.get('points'), 'points')
-            wins = self.safe_int_conversion(standing.get('wins'), 'wins')
-
-            # Extract driver data
-            driver_data = standing.get('Driver', {})
-            driver_number = self.safe_int_conversion(
-                driver_data.get('permanentNumber'),
-                'driver permanent number'
-            )
-
-            # Fix Verstappen's number (permanent #33 -> current #1)
-            if driver_number == 33:
-                driver_number = 1
-
-            if any(value is None for value in [position, points, wins, driver_number]):
-                logger.warning(f"Missing required data for a driver in round {round_num}")
-                return False
-
-            standing_obj, created = DriverStanding.objects.update_or_create(
-                season=season,
-                round=round_number,
-                driver_number=driver_number,
-                defaults={
-                    "position": position,
-                    "points": points,
-                    "wins": wins,
-                }
-            )
-
-            action = "Created" if created else "Updated"
-            logger.info(f"{action} standing for driver {driver_number} in round {round_number}")
-            return True
-
-        except Exception as e:
-            logger.error(f"Error processing driver standing for round {round_num}: {e}")
-            return False
-
-    def safe_int_conversion(self, value, field_name):
+    def populate_season(self, season, stored_rounds, now, offline):
         """
-        Safely convert a value to integer, handling None values
-        Returns the integer value or None if conversion fails
+        Fetch the rounds of a season that have been run and aren't stored yet, plus the latest
+        stored one, which may still be corrected. The calendar comes from the stored meetings,
+        or from the Jolpica schedule for seasons without any.
         """
-        if value is None:
-            logger.debug(f"Missing {field_name} in API response")
-            return None
-
-        try:
-            return int(value)
-        except (ValueError, TypeError) as e:
-            logger.warning(f"Could not convert {field_name} '{value}' to integer: {e}")
-            return None
\ No newline at end of file
+        calendar = meeting_calendar(season) or race_calendar(season, offline=offline)
+        season_over = int(season) < now.year
+
+        rounds = rounds_to_fetch(calendar, stored_rounds, now, season_over)
+        if not rounds:
+            self.stdout.write(f"Season {season} is up to date")
+            return
+
+        self.stdout.write(f"Season {season}: fetching rounds {', '.join(map(str, rounds))}")
+
+        # Fetch the rounds from the Jolpica-F1 api concurrently, then write them in round order
+        base = f'{settings.JOLPICA_URL}/{season}'
+
+        def fetch_round(round_num):
+            try:
+                return fetch_pages(f'{base}/{round_num}/driverstandings/', offline=offline)
+            except Exception as e:
+                return e
+
+        with ThreadPoolExecutor(max_workers=settings.JOLPICA_WORKERS) as executor:
+            responses = list(executor.map(fetch_round, rounds))
+
+        # Drivers without a permanent number, every one before 2014, are numbered from the season's
+        # results, the same way backfill_standings numbers them
+        fetched = [page for pages in responses if not isinstance(pages, Exception) for page in pages.values()]
+        numbers, results = {}, {}
+        if without_permanent_number(fetched):
+            results = fetch_pages(f'{base}/results/', offline=offline)
+            numbers = driver_numbers(merge_races(results.values()))
+
+        available = set(stored_rounds)
+
+        for round_num, pages in zip(rounds, responses):
+            self.stdout.write(f"Processing round {round_num}...")
+
+            try:
+                if isinstance(pages, Exception):
+                    raise pages
+
+                rows = standings_rows(season, pages.values(), numbers)
+
+                if rows:
+                    self.rows.extend(rows)
+                    self.seasons.add(season)
+                    available.add(round_num)
+                    self.stdout.write(
+                        self.style.SUCCESS(
+                            f"Successfully processed {len(rows)} standings for round {round_num}")
+                    )
+                else:
+                    self.stdout.write(f"No standings data available for round {round_num}")
+
+            except Exception as e:
+                logger.error(f"Error fetching data for round {round_num}: {e}")
+                continue
+
+        # A round is finished once the next one has standings, its response won't change any more
+        for round_num, pages in zip(rounds, responses):
+            if isinstance(pages, Exception):
+                continue
+            if round_num in available and (round_num + 1 in available or season_over):
+                for url in pages:
+                    response_cache.mark_immutable(url)
+
+        if season_over and numbers:
+            for url in results:
+                response_cache.mark_immutable(url)
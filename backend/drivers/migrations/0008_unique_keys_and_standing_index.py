@@ -0,0 +1,46 @@
+# Generated by Django 5.2.4 on 2026-10-18 10:27
+
+from django.db import migrations, models
+from django.db.models import Max
+
+
+def delete_duplicates(apps, schema_editor):
+    """Keep only the most recently created row of every key that is about to become unique"""
+
+    for model_name, key in [
+        ('Driver', ['driver_number']),
+        ('Meeting', ['meeting_key']),
+        ('DriverStanding', ['season', 'round', 'driver_number']),
+    ]:
+        model = apps.get_model('drivers', model_name)
+        keep = model.objects.values(*key).annotate(keep_id=Max('id')).values('keep_id')
+        model.objects.exclude(id__in=keep).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('drivers', '0007_driverstanding'),
+    ]
+
+    operations = [
+        migrations.RunPython(delete_duplicates, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='driver',
+            name='driver_number',
+            field=models.IntegerField(unique=True),
+        ),
+        migrations.AlterField(
+            model_name='meeting',
+            name='meeting_key',
+            field=models.IntegerField(unique=True),
+        ),
+        migrations.AddIndex(
+            model_name='driverstanding',
+            index=models.Index(fields=['driver_number', '-round'], name='standing_driver_round_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='driverstanding',
+            constraint=models.UniqueConstraint(fields=('season', 'round', 'driver_number'), name='unique_driver_standing'),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.4 on 2026-10-18 10:29
+
+from django.db import migrations, models
+
+
+def fill_latest_standings(apps, schema_editor):
+    DriverStanding = apps.get_model('drivers', 'DriverStanding')
+    LatestStanding = apps.get_model('drivers', 'LatestStanding')
+
+    latest = {}
+    for standing in DriverStanding.objects.order_by('season', 'driver_number', '-round'):
+        latest.setdefault((standing.season, standing.driver_number), standing)
+
+    LatestStanding.objects.bulk_create([
+        LatestStanding(
+            season=standing.season, driver_number=standing.driver_number, round=standing.round,
+            position=standing.position, points=standing.points, wins=standing.wins,
+        )
+        for standing in latest.values()
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('drivers', '0008_unique_keys_and_standing_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LatestStanding',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('season', models.CharField(max_length=5)),
+                ('driver_number', models.IntegerField()),
+                ('round', models.IntegerField()),
+                ('position', models.IntegerField()),
+                ('points', models.IntegerField()),
+                ('wins', models.IntegerField()),
+            ],
+            options={
+                'verbose_name_plural': 'Latest standings',
+                'ordering': ['season', 'position'],
+                'indexes': [models.Index(fields=['season', 'position'], name='latest_season_position_idx')],
+                'constraints': [models.UniqueConstraint(fields=('season', 'driver_number'), name='unique_latest_standing')],
+            },
+        ),
+        migrations.RunPython(fill_latest_standings, migrations.RunPython.noop),
+    ]
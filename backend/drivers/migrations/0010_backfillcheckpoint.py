@@ -0,0 +1,27 @@
+# Generated by Django 5.2.4 on 2026-10-18 10:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('drivers', '0009_lateststanding'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BackfillCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('season', models.CharField(max_length=5, unique=True)),
+                ('rounds', models.IntegerField()),
+                ('rows', models.IntegerField()),
+                ('completed_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Backfill checkpoints',
+                'ordering': ['season'],
+            },
+        ),
+    ]
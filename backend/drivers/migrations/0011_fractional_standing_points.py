@@ -0,0 +1,30 @@
+# Generated by Django 5.2.4 on 2026-10-18 11:07
+
+from django.db import migrations, models
+
+
+def forget_backfilled_seasons(apps, schema_editor):
+    """Seasons were backfilled with truncated points, the next backfill loads them again, from the response cache"""
+
+    apps.get_model('drivers', 'BackfillCheckpoint').objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('drivers', '0010_backfillcheckpoint'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='driverstanding',
+            name='points',
+            field=models.FloatField(),
+        ),
+        migrations.AlterField(
+            model_name='lateststanding',
+            name='points',
+            field=models.FloatField(),
+        ),
+        migrations.RunPython(forget_backfilled_seasons, migrations.RunPython.noop),
+    ]
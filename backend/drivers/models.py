@@ -4,7 +4,7 @@ class Driver(models.Model):
     """Model to store driver information"""
     broadcast_name = models.CharField(max_length=100)
     country_code = models.CharField(max_length=100, null=True)
-    driver_number = models.IntegerField()
+    driver_number = models.IntegerField(unique=True)
     first_name = models.CharField(max_length=100)
     full_name = models.CharField(max_length=100)
     headshot_url = models.URLField(null=True)
@@ -33,7 +33,7 @@ class Meeting(models.Model):
     date_start = models.CharField(max_length=50)
     gmt_offset = models.CharField(max_length=100)
     location = models.CharField(max_length=100)
-    meeting_key = models.IntegerField()
+    meeting_key = models.IntegerField(unique=True)
     meeting_name = models.CharField(max_length=100)
     meeting_official_name = models.CharField(max_length=100)
     year = models.IntegerField()
@@ -68,8 +68,58 @@ class Result(models.Model):
 class DriverStanding(models.Model):
     """Model to store current driver standing in the WDC"""
     position = models.IntegerField()
-    points = models.IntegerField()
+    # fractional since half points of shortened races, and shared drives of the 1950s
+    points = models.FloatField()
     wins = models.IntegerField()
     season = models.CharField(max_length=5)
     round = models.IntegerField()
     driver_number = models.IntegerField()
+
+    class Meta:
+        constraints = [
+            # ingest upserts and round lookups go by season, round and driver
+            models.UniqueConstraint(fields=['season', 'round', 'driver_number'], name='unique_driver_standing'),
+        ]
+        indexes = [
+            # a driver's standings, latest round first
+            models.Index(fields=['driver_number', '-round'], name='standing_driver_round_idx'),
+        ]
+
+
+class LatestStanding(models.Model):
+    """Model to store each driver's standing after the latest round of a season, refreshed at ingest"""
+    season = models.CharField(max_length=5)
+    driver_number = models.IntegerField()
+    round = models.IntegerField()
+    position = models.IntegerField()
+    points = models.FloatField()
+    wins = models.IntegerField()
+
+    class Meta:
+        ordering = ['season', 'position']
+        verbose_name_plural = 'Latest standings'
+        constraints = [
+            models.UniqueConstraint(fields=['season', 'driver_number'], name='unique_latest_standing'),
+        ]
+        indexes = [
+            # the whole grid of a season, in championship order
+            models.Index(fields=['season', 'position'], name='latest_season_position_idx'),
+        ]
+
+    def __str__(self):
+        return f'Driver #{self.driver_number}: P{self.position} after round {self.round} of {self.season}'
+
+
+class BackfillCheckpoint(models.Model):
+    """Model to store each season loaded by the backfill command, skipped when it runs again"""
+    season = models.CharField(max_length=5, unique=True)
+    rounds = models.IntegerField()
+    rows = models.IntegerField()
+    completed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['season']
+        verbose_name_plural = 'Backfill checkpoints'
+
+    def __str__(self):
+        return f'{self.season}: {self.rows} standings over {self.rounds} rounds'
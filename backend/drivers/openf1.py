@@ -0,0 +1,248 @@
+import asyncio
+import json
+import logging
+import threading
+import time
+import weakref
+from concurrent.futures import Future
+from operator import itemgetter
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+import httpx
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+
+class UpstreamError(Exception):
+    """OpenF1 answered with a status other than 200, kept in `status` so views can pass it on"""
+
+    def __init__(self, status):
+        super().__init__(f"OpenF1 API returned status {status}")
+        self.status = status
+
+
+def fetch_latest_top3():
+    """
+    Top 3 of the latest session from the OpenF1 API
+    :return: list of session results sorted by position
+    """
+
+    url = f'{settings.OPENF1_URL}/session_result?session_key=latest&position%3C=3'
+    try:
+        response = urlopen(url, timeout=settings.OPENF1_TIMEOUT)
+    except HTTPError as e:
+        raise UpstreamError(e.code) from e
+
+    if response.status != 200:
+        raise UpstreamError(response.status)
+
+    results = json.loads(response.read().decode('utf-8'))
+    return sorted(results, key=itemgetter('position'))
+
+
+# one pooled client per event loop, connections can't be shared across loops
+_clients = weakref.WeakKeyDictionary()
+
+
+def async_client():
+    """
+    Pooled HTTP client of the running event loop, keeping connections to OpenF1 alive between requests
+    :return: httpx.AsyncClient
+    """
+
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+
+    if client is None:
+        client = _clients[loop] = httpx.AsyncClient(
+            timeout=settings.OPENF1_TIMEOUT,
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+        )
+
+    return client
+
+
+async def afetch_latest_top3():
+    """
+    Top 3 of the latest session from the OpenF1 API, without blocking the event loop
+    :return: list of session results sorted by position
+    """
+
+    url = f'{settings.OPENF1_URL}/session_result?session_key=latest&position%3C=3'
+    response = await async_client().get(url)
+
+    if response.status_code != 200:
+        raise UpstreamError(response.status_code)
+
+    return sorted(response.json(), key=itemgetter('position'))
+
+
+class SingleFlight:
+    """Collapse concurrent calls for the same key into one, every caller gets its result"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, func):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = Future()
+
+        if leader:
+            try:
+                call.set_result(func())
+            except Exception as e:
+                call.set_exception(e)
+            finally:
+                with self._lock:
+                    del self._calls[key]
+
+        return call.result()
+
+
+class AsyncSingleFlight:
+    """SingleFlight for coroutines running on one event loop"""
+
+    def __init__(self):
+        self._calls = {}
+
+    async def do(self, key, func):
+        call = self._calls.get(key)
+
+        if call is None:
+            call = self._calls[key] = asyncio.ensure_future(func())
+            call.add_done_callback(lambda _: self._calls.pop(key, None))
+
+        # a cancelled caller must not cancel the fetch the others are waiting for
+        return await asyncio.shield(call)
+
+
+class StaleWhileRevalidate:
+    """
+    Cache of an upstream value shared by every worker through the Django cache.
+    A value older than the TTL is still served while one background thread (or task,
+    through aget), across all workers, fetches a new one. Concurrent misses in a worker share a single fetch,
+    and a failed fetch leaves the last good value in place.
+    """
+
+    def __init__(self, key, fetch, afetch=None, ttl=None):
+        """
+        :param key: cache key of the value
+        :param fetch: callable returning a fresh value, raising when the upstream fails
+        :param afetch: coroutine function doing the same as fetch, used by aget
+        :param ttl: seconds a value stays fresh, settings.OPENF1_CACHE_TTL if None
+        """
+
+        self.key = key
+        self.fetch = fetch
+        self.afetch = afetch
+        self._ttl = ttl
+        self._flight = SingleFlight()
+        self._aflight = AsyncSingleFlight()
+        # strong references to running background refreshes, the event loop only keeps weak ones
+        self._tasks = set()
+
+    @property
+    def ttl(self):
+        return self._ttl if self._ttl is not None else settings.OPENF1_CACHE_TTL
+
+    @property
+    def refresh_key(self):
+        return f'{self.key}:refreshing'
+
+    def get(self):
+        """
+        Cached value, fetched on a cold cache and revalidated in the background once stale
+        :return: the value returned by fetch
+        """
+
+        entry = cache.get(self.key)
+
+        if entry is None:
+            return self._flight.do(self.key, self.refresh)['value']
+
+        if time.time() - entry['fetched_at'] >= self.ttl:
+            self.revalidate()
+
+        return entry['value']
+
+    def refresh(self):
+        """
+        Fetch and store a new value
+        :return: the stored entry
+        """
+
+        entry = {'value': self.fetch(), 'fetched_at': time.time()}
+        # never expires, so the last good value outlives upstream failures
+        cache.set(self.key, entry, timeout=None)
+        return entry
+
+    def revalidate(self):
+        """
+        Refresh in a background thread, unless a worker is already refreshing
+        :return: the started thread, or None
+        """
+
+        if not cache.add(self.refresh_key, True, timeout=settings.OPENF1_TIMEOUT * 2):
+            return None
+
+        thread = threading.Thread(target=self._revalidate, daemon=True)
+        thread.start()
+        return thread
+
+    def _revalidate(self):
+        try:
+            self._flight.do(self.key, self.refresh)
+        except Exception as e:
+            logger.warning(f"Revalidating {self.key} failed, serving the last good value: {e}")
+        finally:
+            cache.delete(self.refresh_key)
+
+    async def aget(self):
+        """Same as get, for async views, the upstream is fetched with afetch"""
+
+        entry = await cache.aget(self.key)
+
+        if entry is None:
+            return (await self._aflight.do(self.key, self.arefresh))['value']
+
+        if time.time() - entry['fetched_at'] >= self.ttl:
+            await self.arevalidate()
+
+        return entry['value']
+
+    async def arefresh(self):
+        entry = {'value': await self.afetch(), 'fetched_at': time.time()}
+        await cache.aset(self.key, entry, timeout=None)
+        return entry
+
+    async def arevalidate(self):
+        """
+        Refresh in a background task on the running loop, unless a worker is already refreshing
+        :return: the started task, or None
+        """
+
+        if not await cache.aadd(self.refresh_key, True, timeout=settings.OPENF1_TIMEOUT * 2):
+            return None
+
+        task = asyncio.ensure_future(self._arevalidate())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def _arevalidate(self):
+        try:
+            await self._aflight.do(self.key, self.arefresh)
+        except Exception as e:
+            logger.warning(f"Revalidating {self.key} failed, serving the last good value: {e}")
+        finally:
+            await cache.adelete(self.refresh_key)
+
+
+latest_top3 = StaleWhileRevalidate('openf1:latest_top3', fetch_latest_top3, afetch_latest_top3)
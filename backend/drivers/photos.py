@@ -0,0 +1,166 @@
+import hashlib
+import io
+import json
+import logging
+from urllib.parse import urlencode
+from urllib.request import urlopen
+
+from django.conf import settings
+from django.urls import reverse
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+# longest side in pixels of every generated size, images are never scaled up
+PHOTO_SIZES = {'sm': 48, 'md': 96, 'lg': 192}
+DEFAULT_SIZE = 'md'
+
+# headshots shipped with the backend, named after the driver's first name
+SOURCE_DIR = settings.BASE_DIR / 'static' / 'images'
+SOURCE_EXTENSIONS = ('.webp', '.png')
+
+_manifest = {'key': None, 'photos': {}}
+
+
+def photo_dir():
+    return settings.DRIVER_PHOTO_DIR
+
+
+def manifest_path():
+    return photo_dir() / 'manifest.json'
+
+
+def find_source(driver, offline=False):
+    """
+    Original headshot of a driver, a bundled image matching one of their first names or the OpenF1 headshot
+    :param driver: Driver
+    :param offline: only look at bundled images
+    :return: PIL image, which the caller closes, or None if there is no headshot
+    """
+
+    for name in driver.first_name.lower().split():
+        for extension in SOURCE_EXTENSIONS:
+            path = SOURCE_DIR / f'{name}{extension}'
+            if path.exists():
+                return Image.open(path)
+
+    if driver.headshot_url and not offline:
+        try:
+            return Image.open(io.BytesIO(urlopen(driver.headshot_url, timeout=10).read()))
+        except Exception as e:
+            logger.warning(f"Could not download headshot of driver {driver.driver_number}: {e}")
+
+    return None
+
+
+def resize(image, size):
+    """
+    Encode a copy of the image as WebP, no larger than size on its longest side
+    :param image:
+    :param size:
+    :return: bytes
+    """
+
+    copy = image.convert('RGBA')
+    copy.thumbnail((size, size), Image.LANCZOS)
+
+    buffer = io.BytesIO()
+    copy.save(buffer, format='WEBP', quality=85, method=6)
+    return buffer.getvalue()
+
+
+def generate_photos(drivers, offline=False):
+    """
+    Write every size of each driver's photo to DRIVER_PHOTO_DIR, and the manifest the photo
+    endpoint serves from. Files are named after their content, so they never change once written.
+    :param drivers: iterable of Driver
+    :param offline: skip headshots that would have to be downloaded
+    :return: number of drivers with photos
+    """
+
+    directory = photo_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+
+    photos = {}
+    for driver in drivers:
+        source = find_source(driver, offline)
+        if source is None:
+            logger.warning(f"No headshot for driver {driver.driver_number}")
+            continue
+
+        entries = {}
+        try:
+            for name, size in PHOTO_SIZES.items():
+                data = resize(source, size)
+                digest = hashlib.sha256(data).hexdigest()[:20]
+                filename = f'{driver.driver_number}-{name}-{digest}.webp'
+
+                path = directory / filename
+                if not path.exists():
+                    path.write_bytes(data)
+
+                entries[name] = {'file': filename, 'etag': f'"{digest}"'}
+        finally:
+            # releases the file a bundled source holds open, which loading alone doesn't for every format
+            source.close()
+
+        photos[str(driver.driver_number)] = entries
+
+    # written to a temporary file first, so requests never read a half-written manifest
+    temporary = directory / 'manifest.json.tmp'
+    temporary.write_text(json.dumps(photos, indent=2))
+    temporary.replace(manifest_path())
+
+    current = {entry['file'] for entries in photos.values() for entry in entries.values()}
+    for path in directory.glob('*.webp'):
+        if path.name not in current:
+            path.unlink()
+
+    return len(photos)
+
+
+def get_photo(driver_number, size=DEFAULT_SIZE):
+    """
+    Generated photo of a driver, read from the manifest, which is reloaded whenever it changes
+    :param driver_number:
+    :param size: one of PHOTO_SIZES
+    :return: dict with the path and etag of the file, or None if there is no photo
+    """
+
+    path = manifest_path()
+    try:
+        key = (str(path), path.stat().st_mtime_ns)
+    except FileNotFoundError:
+        return None
+
+    if key != _manifest['key']:
+        _manifest.update(key=key, photos=json.loads(path.read_text()))
+
+    entry = _manifest['photos'].get(str(driver_number), {}).get(size)
+    if entry is None:
+        return None
+
+    return {'path': photo_dir() / entry['file'], 'file': entry['file'], 'etag': entry['etag']}
+
+
+def photo_urls(driver_number, request=None):
+    """
+    URL of every size of a driver's photo, naming the current version, so clients may cache it forever
+    :param driver_number:
+    :param request: makes the URLs absolute
+    :return: dict of size -> URL, or None if there is no photo
+    """
+
+    path = reverse('drivers-get-photo', kwargs={'driver_number': driver_number})
+
+    urls = {}
+    for size in PHOTO_SIZES:
+        photo = get_photo(driver_number, size)
+        if photo is None:
+            return None
+
+        version = photo['etag'].strip('"')
+        url = f"{path}?{urlencode({'size': size, 'v': version})}"
+        urls[size] = request.build_absolute_uri(url) if request is not None else url
+
+    return urls
@@ -1,12 +1,18 @@
 from rest_framework import serializers
-from drivers.models import Driver, Meeting, Result, DriverStanding
+from drivers import photos
+from drivers.models import Driver, Meeting, Result, DriverStanding, LatestStanding
 
 class DriverSerializer(serializers.ModelSerializer):
+    photo_urls = serializers.SerializerMethodField()
+
     class Meta:
         model = Driver
         fields = '__all__'
         read_only_fields = ('driver_number',)
 
+    def get_photo_urls(self, driver):
+        return photos.photo_urls(driver.driver_number, self.context.get('request'))
+
 
 class MeetingSerializer(serializers.ModelSerializer):
     class Meta:
@@ -24,4 +30,10 @@ class ResultSerializer(serializers.ModelSerializer):
 class DriverStandingSerializer(serializers.ModelSerializer):
     class Meta:
         model = DriverStanding
-        fields = '__all__'
\ No newline at end of file
+        fields = '__all__'
+
+
+class LatestStandingSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = LatestStanding
+        fields = 'season', 'round', 'driver_number', 'position', 'points', 'wins'
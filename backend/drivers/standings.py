@@ -0,0 +1,130 @@
+import logging
+from datetime import timezone as dt_timezone
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import DriverStanding, LatestStanding, Meeting
+
+logger = logging.getLogger(__name__)
+
+LATEST_FIELDS = ['round', 'position', 'points', 'wins']
+
+# bumped on every write to a season's standings, anything built from an older version is stale
+VERSION_KEY = 'drivers:standings:version:{season}'
+
+
+def standings_versions(seasons):
+    """
+    Current version of the standings of each season
+    :param seasons:
+    :return: dict of season -> version, 0 for a season not written to since the cache was cleared
+    """
+
+    cached = cache.get_many([VERSION_KEY.format(season=season) for season in seasons])
+    return {season: cached.get(VERSION_KEY.format(season=season), 0) for season in seasons}
+
+
+def bump_standings_versions(seasons):
+    """
+    Mark everything built from the standings of these seasons stale
+    :param seasons:
+    :return:
+    """
+
+    for season in set(seasons):
+        key = VERSION_KEY.format(season=season)
+        cache.add(key, 0, timeout=None)
+        cache.incr(key)
+
+
+def bump_standing_version(sender, instance, **kwargs):
+    """Signal receiver bumping the version of the standing's season"""
+
+    bump_standings_versions([instance.season])
+
+
+def latest_per_driver(rows):
+    """
+    Keep the first row of every season and driver
+    :param rows: (season, driver_number, round, position, points, wins) tuples, latest round first within each driver
+    :return: dict of (season, driver_number) -> dict of LATEST_FIELDS
+    """
+
+    latest = {}
+    for season, driver_number, *values in rows:
+        latest.setdefault((season, driver_number), dict(zip(LATEST_FIELDS, values)))
+
+    return latest
+
+
+def refresh_latest_standings(seasons=None):
+    """
+    Rebuild the latest standing of every driver from DriverStanding
+    :param seasons: seasons to rebuild, every season if None
+    :return: number of latest standings written
+    """
+
+    standings = DriverStanding.objects.all()
+    stale = LatestStanding.objects.all()
+    if seasons is not None:
+        standings = standings.filter(season__in=seasons)
+        stale = stale.filter(season__in=seasons)
+
+    rows = standings.order_by('season', 'driver_number', '-round').values_list('season', 'driver_number', *LATEST_FIELDS)
+    latest = latest_per_driver(rows)
+
+    with transaction.atomic():
+        stale.delete()
+        LatestStanding.objects.bulk_create([
+            LatestStanding(season=season, driver_number=driver_number, **values)
+            for (season, driver_number), values in latest.items()
+        ])
+
+    logger.info(f"Refreshed {len(latest)} latest standings")
+    return len(latest)
+
+
+def meeting_calendar(season):
+    """
+    Start of every race weekend of a season in round order, from the stored OpenF1 meetings
+    :param season:
+    :return: list of aware datetimes, empty if no meeting of the season is stored
+    """
+
+    starts = []
+    for name, date_start in Meeting.objects.filter(year=int(season)).values_list('meeting_name', 'date_start'):
+        # pre-season testing is a meeting too, but not a round
+        if 'testing' in name.lower():
+            continue
+
+        start = parse_datetime(date_start)
+        if start is None:
+            logger.warning(f"Unreadable start '{date_start}' of meeting {name}")
+            continue
+
+        starts.append(start if timezone.is_aware(start) else timezone.make_aware(start, dt_timezone.utc))
+
+    return sorted(starts)
+
+
+def rounds_to_fetch(calendar, stored_rounds, now, season_over=False):
+    """
+    Rounds of a season whose standings are missing or may still change
+    :param calendar: start of each round, in round order
+    :param stored_rounds: rounds with stored standings
+    :param now:
+    :param season_over: the latest stored round is final too
+    :return: sorted list of round numbers
+    """
+
+    started = [round_num for round_num, start in enumerate(calendar, start=1) if start <= now]
+    rounds = {round_num for round_num in started if round_num not in stored_rounds}
+
+    # penalties and corrections land on the latest round until the next one is run
+    if stored_rounds and not season_over:
+        rounds.add(max(stored_rounds))
+
+    return sorted(rounds)
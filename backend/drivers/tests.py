@@ -1,3 +1,878 @@
-from django.test import TestCase
+import asyncio
+import hashlib
+import io
+import json
+import re
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone as dt_timezone
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import AsyncRequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from PIL import Image
+
+from constructors.models import Constructor
+from f1_predictor.http_cache import OfflineMiss
+from f1_predictor.upsert import bulk_upsert
+from .backfill import driver_numbers
+from .models import BackfillCheckpoint, Driver, DriverStanding, LatestStanding, Meeting
+from .photos import PHOTO_SIZES, generate_photos
+from . import async_views, jolpica, photos
+from .jolpica import RateLimiter, TokenBucket, fetch_json, fetch_many
+from .openf1 import StaleWhileRevalidate, afetch_latest_top3, fetch_latest_top3
+from .standings import refresh_latest_standings, rounds_to_fetch
+
+# plan lines of a query reading or sorting a whole table: SQLite's SCAN without an
+# index and full sorts, or a sequential scan on PostgreSQL
+FULL_SCAN = re.compile(r'^SCAN \w+$|USE TEMP B-TREE FOR ORDER BY|Seq Scan')
+
+
+def query_plan(sql):
+    """
+    Plan the database would use for a query
+    :param sql: query as captured by CaptureQueriesContext
+    :return: list of plan lines
+    """
+
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            # tables in tests are tiny, where a sequential scan is always cheapest
+            cursor.execute('SET LOCAL enable_seqscan = off')
+            cursor.execute(f'EXPLAIN {sql}')
+            return [row[0] for row in cursor.fetchall()]
+
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+        return [row[-1] for row in cursor.fetchall()]
+
+
+class QueryPlanMixin:
+    """Assertions on the number of queries a block runs and on how the database plans them"""
+
+    def assert_indexed(self, func, queries=1):
+        with CaptureQueriesContext(connection) as context:
+            result = func()
+
+        selects = [query['sql'] for query in context.captured_queries if query['sql'].startswith('SELECT')]
+        self.assertEqual(len(selects), queries, selects)
+
+        for sql in selects:
+            plan = query_plan(sql)
+            self.assertFalse(any(FULL_SCAN.search(line) for line in plan), f"{sql}\n{plan}")
+
+        return result
+
+    def assert_get_indexed(self, url, params=None, queries=1):
+        response = self.assert_indexed(lambda: self.client.get(url, params or {}), queries)
+        self.assertLess(response.status_code, 400)
+        return response
+
+
+class FastListTests(TestCase):
+    """?fast=1 must return exactly what the serializers return"""
+
+    def setUp(self):
+        for driver_number, last_name in ((1, 'Verstappen'), (4, 'Norris')):
+            Driver.objects.create(
+                broadcast_name=last_name.upper(), country_code=None, driver_number=driver_number,
+                first_name='Driver', full_name=f'Driver {last_name}', headshot_url=None, last_name=last_name,
+                meeting_key=1, name_acronym=last_name[:3].upper(), session_key=1,
+                team_colour='FFFFFF', team_name='Team',
+            )
+            DriverStanding.objects.create(
+                position=driver_number, points=25 - driver_number, wins=1, season='2025', round=1,
+                driver_number=driver_number,
+            )
+
+    def assert_same_list(self, url):
+        expected = self.client.get(url)
+        fast = self.client.get(url, {'fast': '1'})
+
+        self.assertEqual(fast.status_code, 200)
+        self.assertEqual(fast['Content-Type'], 'application/json')
+        self.assertEqual(fast.json(), expected.json())
+
+    def test_drivers(self):
+        self.assert_same_list('/drivers/')
+
+    def test_standings(self):
+        self.assert_same_list('/driverstandings/')
+
+
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        # several standings per driver, so the ordering on driver_number alone has ties
+        for driver_number in (1, 4, 16):
+            for round_number in (1, 2, 3):
+                DriverStanding.objects.create(
+                    position=1, points=round_number, wins=0, season='2025', round=round_number,
+                    driver_number=driver_number,
+                )
+
+        self.expected = list(DriverStanding.objects.order_by('driver_number', 'id').values_list('id', flat=True))
+
+    def walk(self, url, params, link='next'):
+        ids = []
+        while url:
+            body = self.client.get(url, params).json()
+            page = [row['id'] for row in body['results']]
+            ids = ids + page if link == 'next' else page + ids
+            url, params = body[link], {}
+
+        return ids
+
+    def test_pages_cover_the_ordering(self):
+        self.assertEqual(self.walk('/driverstandings/', {'page_size': 2}), self.expected)
+        self.assertEqual(self.walk('/driverstandings/', {'page_size': 2, 'fast': '1'}), self.expected)
+
+    def test_previous_links_walk_back(self):
+        body = self.client.get('/driverstandings/', {'page_size': 4}).json()
+        last_page = self.client.get(self.client.get(body['next']).json()['next']).json()
+
+        self.assertIsNone(last_page['next'])
+        self.assertEqual(self.walk(last_page['previous'], {}, link='previous'), self.expected[:8])
+
+    def test_cursor_survives_inserts(self):
+        body = self.client.get('/driverstandings/', {'page_size': 3}).json()
+        # a row sorting before the cursor would shift an offset-based page by one
+        DriverStanding.objects.create(position=1, points=0, wins=0, season='2025', round=4, driver_number=0)
+
+        page = self.client.get(body['next']).json()['results']
+        self.assertEqual([row['id'] for row in page], self.expected[3:6])
+
+    def test_unpaginated_on_request(self):
+        body = self.client.get('/driverstandings/', {'paginate': 'false'}).json()
+        self.assertEqual([row['id'] for row in body], self.expected)
+
+    def test_invalid_cursor(self):
+        self.assertEqual(self.client.get('/driverstandings/', {'cursor': 'garbage'}).status_code, 404)
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class QueryPlanTests(QueryPlanMixin, TestCase):
+    """Every endpoint reads through an index, in a fixed number of queries"""
+
+    def setUp(self):
+        cache.clear()
+        for driver_number in (1, 4):
+            Driver.objects.create(
+                broadcast_name='DRIVER', country_code=None, driver_number=driver_number, first_name='Driver',
+                full_name='Driver', headshot_url=None, last_name='Driver', meeting_key=1,
+                name_acronym='DRI', session_key=1, team_colour='FFFFFF', team_name='Team',
+            )
+            for round_number in (1, 2, 3):
+                DriverStanding.objects.create(
+                    position=driver_number, points=round_number, wins=0, season='2025', round=round_number,
+                    driver_number=driver_number,
+                )
+        Constructor.objects.create(constructor_id='mclaren', url='', name='McLaren', nationality='British')
+
+    def test_drivers(self):
+        self.assert_get_indexed('/drivers/1/')
+        body = self.assert_get_indexed('/drivers/', {'page_size': 1}).json()
+        self.assert_get_indexed(body['next'])
+
+    def test_standings(self):
+        refresh_latest_standings()
+        self.assert_get_indexed('/driverstandings/round/2/driver/1/')
+        self.assert_get_indexed('/driverstandings/round/latest/driver/1/')
+        body = self.assert_get_indexed('/driverstandings/', {'page_size': 2}).json()
+        self.assert_get_indexed(body['next'])
+
+    def test_latest_grid(self):
+        refresh_latest_standings()
+        self.assert_get_indexed('/driverstandings/latest/')
+
+    def test_driver_points(self):
+        self.assert_get_indexed('/driverpoints/', {'season': '2025'})
+        # the latest season's payload is cached by the request above
+        self.assert_get_indexed('/driverpoints/')
+
+    def test_constructors(self):
+        self.assert_get_indexed('/constructors/', {'page_size': 1})
+
+    def test_standing_upsert(self):
+        # populate_standing diffs the fetched standings against the stored ones by their unique key
+        self.assert_indexed(lambda: bulk_upsert(DriverStanding, [
+            {'season': '2025', 'round': 2, 'driver_number': 4, 'position': 1, 'points': 10, 'wins': 1},
+        ], key_fields=['season', 'round', 'driver_number']))
+
+
+class LatestStandingTests(TestCase):
+    def setUp(self):
+        for season, driver_number, round_number, position in [
+            ('2024', 1, 24, 1),
+            ('2025', 1, 1, 2), ('2025', 1, 2, 1),
+            ('2025', 4, 1, 1), ('2025', 4, 2, 2),
+        ]:
+            DriverStanding.objects.create(
+                position=position, points=10 * round_number, wins=0, season=season, round=round_number,
+                driver_number=driver_number,
+            )
+
+    def test_keeps_latest_round_per_season(self):
+        self.assertEqual(refresh_latest_standings(), 3)
+        self.assertEqual(
+            list(LatestStanding.objects.values_list('season', 'driver_number', 'round', 'position')),
+            [('2024', 1, 24, 1), ('2025', 1, 2, 1), ('2025', 4, 2, 2)],
+        )
+
+    def test_refresh_only_touches_given_seasons(self):
+        refresh_latest_standings()
+        DriverStanding.objects.create(position=1, points=50, wins=1, season='2025', round=3, driver_number=4)
+        DriverStanding.objects.filter(season='2024').delete()
+
+        refresh_latest_standings(['2025'])
+
+        self.assertTrue(LatestStanding.objects.filter(season='2024').exists())
+        self.assertEqual(LatestStanding.objects.get(season='2025', driver_number=4).round, 3)
+
+    def test_grid_defaults_to_latest_season(self):
+        refresh_latest_standings()
+
+        grid = self.client.get('/driverstandings/latest/').json()
+        self.assertEqual([(row['driver_number'], row['position']) for row in grid], [(1, 1), (4, 2)])
+
+        grid = self.client.get('/driverstandings/latest/', {'season': '2024'}).json()
+        self.assertEqual([row['driver_number'] for row in grid], [1])
+
+    def test_driver_round_defaults_to_latest_season(self):
+        DriverStanding.objects.create(position=3, points=5, wins=0, season='2024', round=2, driver_number=1)
+
+        standing = self.client.get('/driverstandings/round/2/driver/1/').json()
+        self.assertEqual((standing['season'], standing['position']), ('2025', 1))
+
+        standing = self.client.get('/driverstandings/round/2/driver/1/', {'season': '2024'}).json()
+        self.assertEqual((standing['season'], standing['position']), ('2024', 3))
+
+        self.assertEqual(self.client.get('/driverstandings/round/24/driver/1/').status_code, 404)
+
+    def test_driver_latest_defaults_to_latest_season(self):
+        refresh_latest_standings()
+
+        standing = self.client.get('/driverstandings/round/latest/driver/1/').json()
+        self.assertEqual((standing['season'], standing['round']), ('2025', 2))
+
+        standing = self.client.get('/driverstandings/round/latest/driver/1/', {'season': '2024'}).json()
+        self.assertEqual((standing['season'], standing['round']), ('2024', 24))
+
+        self.assertEqual(self.client.get('/driverstandings/round/latest/driver/44/').status_code, 404)
+
+
+class FakeOpenF1(BaseHTTPRequestHandler):
+    """Local stand-in for the OpenF1 API, serving `body` with `status` after `delay` seconds"""
+
+    status = 200
+    body = []
+    delay = 0
+    hits = 0
+
+    def do_GET(self):
+        type(self).hits += 1
+        time.sleep(self.delay)
+
+        payload = json.dumps(self.body).encode()
+        self.send_response(self.status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+TOP3 = [{'position': position, 'driver_number': driver_number} for position, driver_number in ((2, 4), (1, 81), (3, 1))]
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}, OPENF1_CACHE_TTL=60)
+class LatestTop3CacheTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), FakeOpenF1)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        cache.clear()
+        FakeOpenF1.status, FakeOpenF1.body, FakeOpenF1.delay, FakeOpenF1.hits = 200, TOP3, 0, 0
+
+        override = override_settings(OPENF1_URL=f'http://127.0.0.1:{self.server.server_port}/v1')
+        override.enable()
+        self.addCleanup(override.disable)
+
+        self.top3 = StaleWhileRevalidate('test:top3', fetch_latest_top3, afetch_latest_top3)
+
+    def wait_for_revalidation(self, timeout=5):
+        deadline = time.monotonic() + timeout
+        while cache.get(self.top3.refresh_key) and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def test_serves_cached_value_within_ttl(self):
+        response = self.client.get('/top3/latest/')
+        self.client.get('/top3/latest/')
+
+        self.assertEqual([row['position'] for row in response.json()['results']], [1, 2, 3])
+        self.assertEqual(FakeOpenF1.hits, 1)
+
+    def test_concurrent_misses_share_one_fetch(self):
+        FakeOpenF1.delay = 0.2
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(lambda _: self.top3.get(), range(8)))
+
+        self.assertEqual(FakeOpenF1.hits, 1)
+        self.assertTrue(all(result == results[0] for result in results))
+
+    def test_stale_value_is_served_while_revalidating(self):
+        self.top3.get()
+        FakeOpenF1.body = TOP3[:1]
+
+        with override_settings(OPENF1_CACHE_TTL=0):
+            # the stale value comes back at once, the refresh happens in the background
+            self.assertEqual(len(self.top3.get()), 3)
+            self.wait_for_revalidation()
+
+        self.assertEqual(len(self.top3.get()), 1)
+
+    def test_upstream_failure_keeps_last_good_value(self):
+        self.top3.get()
+        FakeOpenF1.status, FakeOpenF1.body = 503, {'error': 'unavailable'}
+
+        with override_settings(OPENF1_CACHE_TTL=0):
+            self.top3.revalidate().join()
+            self.assertEqual(len(self.top3.get()), 3)
+
+        self.assertEqual(FakeOpenF1.hits, 2)
+
+    def test_cold_failure_is_an_error(self):
+        FakeOpenF1.status = 500
+        self.assertEqual(self.client.get('/top3/latest/').status_code, 500)
+
+    def test_upstream_status_is_passed_on(self):
+        FakeOpenF1.status = 503
+        response = self.client.get('/top3/latest/')
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json(), {'error': 'API returned non-200 status'})
+
+    async def test_async_misses_share_one_fetch(self):
+        FakeOpenF1.delay = 0.2
+        results = await asyncio.gather(*(self.top3.aget() for _ in range(8)))
+
+        self.assertEqual(FakeOpenF1.hits, 1)
+        self.assertEqual([row['position'] for row in results[0]], [1, 2, 3])
+
+    async def test_async_view(self):
+        response = await async_views.latest_top3(AsyncRequestFactory().get('/top3/latest/'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row['position'] for row in json.loads(response.content)['results']], [1, 2, 3])
+
+    async def test_async_view_passes_on_upstream_status(self):
+        FakeOpenF1.status = 503
+        response = await async_views.latest_top3(AsyncRequestFactory().get('/top3/latest/'))
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(json.loads(response.content), {'error': 'API returned non-200 status'})
+
+
+class DriverPhotoTests(TestCase):
+    def setUp(self):
+        folder = tempfile.TemporaryDirectory()
+        self.addCleanup(folder.cleanup)
+        override = override_settings(DRIVER_PHOTO_DIR=Path(folder.name))
+        override.enable()
+        self.addCleanup(override.disable)
+
+        # Kimi Antonelli's bundled headshot is kimi.webp
+        self.driver = Driver.objects.create(
+            broadcast_name='K ANTONELLI', country_code='ITA', driver_number=12, first_name='Andrea Kimi',
+            full_name='Andrea Kimi ANTONELLI', headshot_url=None, last_name='Antonelli', meeting_key=1,
+            name_acronym='ANT', session_key=1, team_colour='00D7B6', team_name='Mercedes',
+        )
+        self.assertEqual(generate_photos([self.driver]), 1)
+
+    def test_generates_every_size(self):
+        files = sorted(path.name for path in Path(settings.DRIVER_PHOTO_DIR).glob('*.webp'))
+        self.assertEqual(len(files), len(PHOTO_SIZES))
+
+        for name in PHOTO_SIZES:
+            path = next(Path(settings.DRIVER_PHOTO_DIR).glob(f'12-{name}-*.webp'))
+            with Image.open(path) as image:
+                self.assertLessEqual(max(image.size), PHOTO_SIZES[name])
+
+    def test_closes_source_images(self):
+        sources = []
+        original = photos.find_source
+
+        def find_source(driver, offline=False):
+            source = original(driver, offline)
+            source.close = mock.Mock(wraps=source.close)
+            sources.append(source)
+            return source
+
+        with mock.patch('drivers.photos.find_source', side_effect=find_source):
+            generate_photos([self.driver])
+
+        sources[0].close.assert_called_once()
+
+    def test_serves_with_validators(self):
+        response = self.client.get('/drivers/12/photo/', {'size': 'sm'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'image/webp')
+        self.assertIn('no-cache', response['Cache-Control'])
+
+        etag = response['ETag']
+        self.assertEqual(self.client.get('/drivers/12/photo/', {'size': 'sm'}, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        versioned = self.client.get('/drivers/12/photo/', {'size': 'sm', 'v': etag.strip('"')})
+        self.assertIn('immutable', versioned['Cache-Control'])
+
+    def test_drivers_link_versioned_photos(self):
+        urls = self.client.get('/drivers/12/').json()['photo_urls']
+        self.assertEqual(set(urls), set(PHOTO_SIZES))
+
+        response = self.client.get(urls['sm'])
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('immutable', response['Cache-Control'])
+
+        fast = self.client.get('/drivers/', {'fast': '1'}).json()
+        self.assertEqual(fast['results'][0]['photo_urls'], urls)
+
+    @override_settings(DRIVER_PHOTO_SENDFILE='x-accel-redirect')
+    def test_hands_off_to_web_server(self):
+        response = self.client.get('/drivers/12/photo/')
+
+        self.assertEqual(response.content, b'')
+        self.assertTrue(response['X-Accel-Redirect'].startswith('/protected/photos/12-md-'))
+
+    def test_missing_photo_and_size(self):
+        self.assertEqual(self.client.get('/drivers/99/photo/').status_code, 404)
+        self.assertEqual(self.client.get('/drivers/12/photo/', {'size': 'xl'}).status_code, 400)
+
+
+# a clock after the 2025 season, whose standings are final
+AFTER_2025 = datetime(2026, 1, 15, tzinfo=dt_timezone.utc)
+
+
+def jolpica_standings(season, round_number, drivers):
+    """Jolpica driverstandings document, drivers as (permanent number, position, points, wins)"""
+
+    return {'MRData': {'StandingsTable': {'StandingsLists': [{
+        'season': season,
+        'round': str(round_number),
+        'DriverStandings': [
+            {'position': str(position), 'points': str(points), 'wins': str(wins),
+             'Driver': {'permanentNumber': str(number)}}
+            for number, position, points, wins in drivers
+        ],
+    }] if drivers else []}}}
+
+
+class FakeJolpica(BaseHTTPRequestHandler):
+    """
+    Local stand-in for the Jolpica API. Each path answers with the queued (status, body)
+    responses first, then with `documents[path]`, or no standings when there is none.
+    Requests with the ETag of the answer get a 304.
+    """
+
+    documents = {}
+    queued = {}
+    hits = {}
+    revalidated = {}
+
+    def do_GET(self):
+        type(self).hits[self.path] = self.hits.get(self.path, 0) + 1
+
+        queue = self.queued.get(self.path)
+        status, body = queue.pop(0) if queue else (200, self.documents.get(self.path, jolpica_standings('2025', 0, [])))
+
+        payload = json.dumps(body).encode()
+        etag = f'"{hashlib.sha256(payload).hexdigest()[:16]}"'
+        if status == 200 and self.headers.get('If-None-Match') == etag:
+            type(self).revalidated[self.path] = self.revalidated.get(self.path, 0) + 1
+            status, payload = 304, b''
+
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.send_header('ETag', etag)
+        if status == 429:
+            self.send_header('Retry-After', '0')
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeJolpicaMixin:
+    """Run FakeJolpica for the test case, with a fresh response cache and no rate limits for each test"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), FakeJolpica)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        FakeJolpica.documents, FakeJolpica.queued, FakeJolpica.hits, FakeJolpica.revalidated = {}, {}, {}, {}
+        self.url = f'http://127.0.0.1:{self.server.server_port}/ergast/f1'
+
+        folder = tempfile.TemporaryDirectory()
+        self.addCleanup(folder.cleanup)
+        override = override_settings(JOLPICA_URL=self.url, HTTP_CACHE_DIR=Path(folder.name))
+        override.enable()
+        self.addCleanup(override.disable)
+
+        # tests don't wait on Jolpica's real limits
+        patcher = mock.patch.object(jolpica, 'rate_limiter', RateLimiter(TokenBucket(1000, 1000)))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+    JOLPICA_BACKOFF=0.01, JOLPICA_RETRIES=2,
+)
+class JolpicaFetchTests(FakeJolpicaMixin, TestCase):
+    def test_token_bucket_spaces_out_requests(self):
+        limiter = RateLimiter(TokenBucket(50, 2))
+
+        start = time.monotonic()
+        for _ in range(7):
+            limiter.acquire()
+
+        # two from the full bucket, five more at 50 a second
+        self.assertGreaterEqual(time.monotonic() - start, 0.09)
+
+    def test_retries_rate_limited_and_server_errors(self):
+        FakeJolpica.queued['/ergast/f1/doc/'] = [(429, {}), (503, {})]
+        FakeJolpica.documents['/ergast/f1/doc/'] = {'ok': True}
+
+        self.assertEqual(fetch_json(f'{self.url}/doc/'), {'ok': True})
+        self.assertEqual(FakeJolpica.hits['/ergast/f1/doc/'], 3)
+
+    def test_gives_up_on_client_errors_and_after_retries(self):
+        FakeJolpica.queued['/ergast/f1/missing/'] = [(404, {})]
+        FakeJolpica.queued['/ergast/f1/down/'] = [(500, {})] * 3
+
+        missing, down, ok = fetch_many([f'{self.url}/missing/', f'{self.url}/down/', f'{self.url}/ok/'])
+
+        self.assertIsInstance(missing, Exception)
+        self.assertIsInstance(down, Exception)
+        self.assertEqual(FakeJolpica.hits, {'/ergast/f1/missing/': 1, '/ergast/f1/down/': 3, '/ergast/f1/ok/': 1})
+        self.assertIn('MRData', ok)
+
+    def populate_two_rounds(self, *args, now=AFTER_2025):
+        # three rounds of 2025 on the calendar, the third one without standings
+        for meeting_key, (name, date_start) in enumerate([
+            ('Pre-Season Testing', '2025-02-26T07:00:00+00:00'),
+            ('Australian Grand Prix', '2025-03-14T01:30:00+00:00'),
+            ('Chinese Grand Prix', '2025-03-21T03:30:00+00:00'),
+            ('Japanese Grand Prix', '2025-04-04T02:30:00+00:00'),
+        ]):
+            Meeting.objects.get_or_create(meeting_key=meeting_key, defaults=dict(
+                circuit_key=1, circuit_short_name='Circuit', meeting_code='XXX', country_code='XXX', country_key=1,
+                country_name='Country', date_start=date_start, gmt_offset='00:00:00', location='Location',
+                meeting_name=name, meeting_official_name=name, year=2025,
+            ))
+
+        FakeJolpica.documents['/ergast/f1/2025/1/driverstandings/?limit=100&offset=0'] = jolpica_standings(
+            '2025', 1, [(33, 1, 25, 1), (4, 2, 18, 0)]
+        )
+        FakeJolpica.documents['/ergast/f1/2025/2/driverstandings/?limit=100&offset=0'] = jolpica_standings(
+            '2025', 2, [(4, 1, 43, 1), (33, 2, 43, 1)]
+        )
+        FakeJolpica.queued['/ergast/f1/2025/2/driverstandings/?limit=100&offset=0'] = [(429, {})]
+
+        stdout = io.StringIO()
+        with mock.patch('django.utils.timezone.now', return_value=now):
+            call_command('populate_standing', '--season', '2025', *args, stdout=stdout)
+        return stdout.getvalue()
+
+    def test_populate_standing(self):
+        self.populate_two_rounds()
+
+        self.assertEqual(FakeJolpica.hits, {
+            '/ergast/f1/2025/1/driverstandings/?limit=100&offset=0': 1,
+            '/ergast/f1/2025/2/driverstandings/?limit=100&offset=0': 2,
+            '/ergast/f1/2025/3/driverstandings/?limit=100&offset=0': 1,
+        })
+        self.assertEqual(
+            list(DriverStanding.objects.order_by('round', 'position').values_list('round', 'driver_number', 'points')),
+            [(1, 1, 25), (1, 4, 18), (2, 4, 43), (2, 1, 43)],
+        )
+        self.assertEqual(LatestStanding.objects.get(driver_number=4).round, 2)
+
+    def test_rerun_fetches_only_missing_rounds(self):
+        self.populate_two_rounds()
+        FakeJolpica.hits = {}
+
+        self.populate_two_rounds()
+        self.assertEqual(FakeJolpica.hits, {'/ergast/f1/2025/3/driverstandings/?limit=100&offset=0': 1})
+
+    def test_rerun_during_the_season_revalidates_the_latest_round(self):
+        # after the third round, whose standings aren't published yet
+        now = datetime(2025, 4, 8, tzinfo=dt_timezone.utc)
+        self.populate_two_rounds(now=now)
+        FakeJolpica.hits, FakeJolpica.revalidated = {}, {}
+
+        with mock.patch('django.utils.timezone.now', return_value=now):
+            call_command('populate_standing', '--season', '2025', stdout=io.StringIO())
+
+        # the latest round with standings may still be corrected, the next one may have been published
+        rerun = {
+            '/ergast/f1/2025/2/driverstandings/?limit=100&offset=0': 1,
+            '/ergast/f1/2025/3/driverstandings/?limit=100&offset=0': 1,
+        }
+        self.assertEqual(FakeJolpica.hits, rerun)
+        self.assertEqual(FakeJolpica.revalidated, rerun)
+
+    def test_calendar_falls_back_to_jolpica_schedule(self):
+        FakeJolpica.documents['/ergast/f1/2024/races/?limit=100'] = {'MRData': {'RaceTable': {'Races': [
+            {'round': '2', 'date': '2024-03-09', 'time': '17:00:00Z'},
+            {'round': '1', 'date': '2024-03-02', 'time': '15:00:00Z'},
+        ]}}}
+        FakeJolpica.documents['/ergast/f1/2024/1/driverstandings/?limit=100&offset=0'] = jolpica_standings('2024', 1, [(1, 1, 26, 1)])
+
+        with mock.patch('django.utils.timezone.now', return_value=AFTER_2025):
+            call_command('populate_standing', '--season', '2024', stdout=io.StringIO())
+
+        self.assertEqual(set(FakeJolpica.hits), {
+            '/ergast/f1/2024/races/?limit=100',
+            '/ergast/f1/2024/1/driverstandings/?limit=100&offset=0',
+            '/ergast/f1/2024/2/driverstandings/?limit=100&offset=0',
+        })
+        self.assertEqual(DriverStanding.objects.get().season, '2024')
+
+    def test_rounds_to_fetch(self):
+        calendar = [datetime(2025, 3, day, tzinfo=dt_timezone.utc) for day in (1, 8, 15, 22, 29)]
+        now = datetime(2025, 3, 16, tzinfo=dt_timezone.utc)
+
+        self.assertEqual(rounds_to_fetch(calendar, set(), now), [1, 2, 3])
+        # the latest stored round is revalidated, it may still be corrected
+        self.assertEqual(rounds_to_fetch(calendar, {1, 2}, now), [2, 3])
+        self.assertEqual(rounds_to_fetch(calendar, {1, 2, 3}, now), [3])
+        self.assertEqual(rounds_to_fetch(calendar, {1, 3}, now), [2, 3])
+        self.assertEqual(rounds_to_fetch(calendar, {1, 2, 3}, now, season_over=True), [])
+
+    def test_cached_responses_are_revalidated(self):
+        fetch_json(f'{self.url}/doc/')
+        self.assertEqual(fetch_json(f'{self.url}/doc/'), jolpica_standings('2025', 0, []))
+
+        self.assertEqual(FakeJolpica.hits['/ergast/f1/doc/'], 2)
+        self.assertEqual(FakeJolpica.revalidated['/ergast/f1/doc/'], 1)
+
+        FakeJolpica.documents['/ergast/f1/doc/'] = {'changed': True}
+        self.assertEqual(fetch_json(f'{self.url}/doc/'), {'changed': True})
+
+    def test_finished_rounds_are_not_requested_again(self):
+        self.populate_two_rounds()
+        FakeJolpica.hits = {}
+
+        self.populate_two_rounds('--full')
+
+        # rounds 1 and 2 of a past season are final, round 3 without standings is revalidated
+        self.assertEqual(FakeJolpica.hits, {'/ergast/f1/2025/3/driverstandings/?limit=100&offset=0': 1})
+
+    def test_offline_replays_the_cache(self):
+        self.populate_two_rounds()
+        DriverStanding.objects.all().delete()
+        FakeJolpica.hits = {}
+
+        stdout = self.populate_two_rounds('--offline')
+
+        self.assertEqual(FakeJolpica.hits, {})
+        self.assertEqual(DriverStanding.objects.count(), 4)
+        self.assertIn('4 standings inserted', stdout)
+
+        with self.assertRaises(OfflineMiss):
+            fetch_json(f'{self.url}/never-fetched/', offline=True)
+
+
+def ergast_driver(driver_id, permanent_number=None):
+    driver = {'driverId': driver_id}
+    if permanent_number is not None:
+        driver['permanentNumber'] = str(permanent_number)
+    return driver
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+    JOLPICA_BACKOFF=0.01, JOLPICA_RETRIES=0,
+)
+class BackfillTests(FakeJolpicaMixin, TestCase):
+    # car numbers of a season before permanent numbers, a replacement driver takes over car 3 in round 2
+    RACES = {
+        1: [('schumacher', None, 3), ('hamilton', 44, 2), ('barrichello', None, 4)],
+        2: [('hamilton', 44, 2), ('barrichello', None, 4), ('zonta', None, 3)],
+    }
+    STANDINGS = {
+        1: [('schumacher', 1, '10', 1), ('hamilton', 2, '6', 0), ('barrichello', 3, '4', 0)],
+        2: [('schumacher', 1, '10', 1), ('barrichello', 2, '10.5', 1), ('hamilton', 3, '6', 0), ('zonta', 4, '4', 0)],
+    }
+
+    def serve_season(self, season, page_size=2):
+        # results split into pages of page_size rows, round 1 straddles the first two pages
+        results = [
+            (round_num, {'number': str(number), 'Driver': ergast_driver(driver_id, permanent)})
+            for round_num, entries in self.RACES.items() for driver_id, permanent, number in entries
+        ]
+        for offset in range(0, len(results), page_size):
+            races = {}
+            for round_num, result in results[offset:offset + page_size]:
+                races.setdefault(round_num, []).append(result)
+
+            FakeJolpica.documents[f'/ergast/f1/{season}/results/?limit={page_size}&offset={offset}'] = {'MRData': {
+                'total': str(len(results)),
+                'RaceTable': {'Races': [{'round': str(r), 'Results': rows} for r, rows in races.items()]},
+            }}
+
+        for round_num, entries in self.STANDINGS.items():
+            FakeJolpica.documents[f'/ergast/f1/{season}/{round_num}/driverstandings/?limit={page_size}&offset=0'] = {
+                'MRData': {'StandingsTable': {'StandingsLists': [{'round': str(round_num), 'DriverStandings': [
+                    {'position': str(position), 'points': points, 'wins': str(wins),
+                     'Driver': ergast_driver(driver_id, 44 if driver_id == 'hamilton' else None)}
+                    for driver_id, position, points, wins in entries
+                ]}]}},
+            }
+
+    def backfill(self, *args):
+        stdout = io.StringIO()
+        call_command('backfill_standings', '--start', '2000', '--end', '2001', '--page-size', '2', *args, stdout=stdout)
+        return stdout.getvalue()
+
+    def test_loads_seasons_and_resumes_after_failure(self):
+        self.serve_season(2000)
+
+        # 2001 has no results yet, the run fails after loading 2000
+        with self.assertRaisesMessage(CommandError, 'seasons 2001 could not be loaded'):
+            self.backfill()
+
+        self.assertEqual(list(BackfillCheckpoint.objects.values_list('season', 'rows')), [('2000', 7)])
+        self.assertEqual(
+            dict(DriverStanding.objects.filter(round=2).values_list('driver_number', 'points')),
+            {3: 10, 44: 6, 4: 10.5, 1000: 4},
+        )
+        self.assertEqual(LatestStanding.objects.filter(season='2000').count(), 4)
+
+        self.serve_season(2001)
+        FakeJolpica.hits = {}
+        output = self.backfill()
+
+        self.assertTrue(FakeJolpica.hits)
+        self.assertTrue(all(path.startswith('/ergast/f1/2001/') for path in FakeJolpica.hits))
+        self.assertEqual(BackfillCheckpoint.objects.count(), 2)
+        self.assertIn('rows/s', output)
+
+    def test_restart_replays_finished_seasons_from_cache(self):
+        self.serve_season(2000)
+        self.serve_season(2001)
+        self.backfill()
+        FakeJolpica.hits = {}
+
+        self.backfill('--restart')
+
+        # past seasons never change, their pages are served from the response cache
+        self.assertEqual(FakeJolpica.hits, {})
+        self.assertEqual(DriverStanding.objects.count(), 14)
+
+    def test_populate_standing_numbers_drivers_like_backfill(self):
+        self.serve_season(2000, page_size=100)
+        FakeJolpica.documents['/ergast/f1/2000/races/?limit=100'] = {'MRData': {'RaceTable': {'Races': [
+            {'round': '1', 'date': '2000-03-12', 'time': '06:00:00Z'},
+            {'round': '2', 'date': '2000-03-26', 'time': '17:00:00Z'},
+        ]}}}
+
+        call_command('populate_standing', '--season', '2000', stdout=io.StringIO())
+        populated = list(DriverStanding.objects.order_by('round', 'position').values_list('round', 'driver_number', 'points'))
+        DriverStanding.objects.all().delete()
+
+        self.backfill('--end', '2000', '--page-size', '100')
+
+        self.assertEqual(len(populated), 7)
+        self.assertEqual(
+            list(DriverStanding.objects.order_by('round', 'position').values_list('round', 'driver_number', 'points')),
+            populated,
+        )
+
+    def test_driver_numbers(self):
+        races = {1: [
+            {'number': '44', 'Driver': ergast_driver('other')},
+            {'number': '2', 'Driver': ergast_driver('hamilton', 44)},
+            {'number': '33', 'Driver': ergast_driver('max_verstappen', 33)},
+        ]}
+
+        # permanent numbers first, a car number someone has permanently gets a synthetic one
+        self.assertEqual(driver_numbers(races), {'hamilton': 44, 'max_verstappen': 1, 'other': 1000})
+
+
+class BulkUpsertTests(TestCase):
+    KEY = ['season', 'round', 'driver_number']
+
+    def standings(self, points):
+        return [
+            {'season': '2025', 'round': 1, 'driver_number': driver_number, 'position': position,
+             'points': str(points[driver_number]), 'wins': 0}
+            for position, driver_number in enumerate(points, start=1)
+        ]
+
+    def test_counts_inserted_updated_and_unchanged(self):
+        counts = bulk_upsert(DriverStanding, self.standings({1: 25, 4: 18}), self.KEY)
+        self.assertEqual(counts, {'inserted': 2, 'updated': 0, 'unchanged': 0})
+
+        counts = bulk_upsert(DriverStanding, self.standings({1: 25, 4: 19, 16: 15}), self.KEY)
+        self.assertEqual(counts, {'inserted': 1, 'updated': 1, 'unchanged': 1})
+        self.assertEqual(
+            dict(DriverStanding.objects.values_list('driver_number', 'points')), {1: 25, 4: 19, 16: 15}
+        )
+
+    def test_queries_do_not_grow_with_rows(self):
+        for drivers in (5, 200):
+            rows = self.standings({driver_number: driver_number for driver_number in range(drivers)})
+            bulk_upsert(DriverStanding, rows[:drivers // 2], self.KEY)
+
+            # one read and one insert, inside a savepoint as the test already runs in a transaction
+            with self.assertNumQueries(4):
+                bulk_upsert(DriverStanding, rows, self.KEY)
+
+    def test_populate_drivers(self):
+        drivers = [{
+            'broadcast_name': 'L NORRIS', 'country_code': 'GBR', 'driver_number': 4, 'first_name': 'Lando',
+            'full_name': 'Lando NORRIS', 'headshot_url': None, 'last_name': 'Norris', 'meeting_key': 1,
+            'name_acronym': 'NOR', 'session_key': 1, 'team_colour': 'FF8000', 'team_name': 'McLaren',
+        }]
+        stdout = io.StringIO()
+
+        with mock.patch('drivers.management.commands.populate_drivers.get_json', return_value=drivers), \
+                mock.patch('drivers.management.commands.populate_drivers.generate_photos', return_value=0):
+            call_command('populate_drivers', stdout=stdout)
+            drivers[0]['team_colour'] = '000000'
+            call_command('populate_drivers', stdout=stdout)
+
+        self.assertIn('1 drivers inserted, 0 updated, 0 unchanged', stdout.getvalue())
+        self.assertIn('0 drivers inserted, 1 updated, 0 unchanged', stdout.getvalue())
+        self.assertEqual(Driver.objects.get().team_colour, '000000')
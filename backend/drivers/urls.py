@@ -1,6 +1,8 @@
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 
+from . import async_views
 from .views import (
     DriverViewSet,
     MeetingViewSet,
@@ -14,4 +16,8 @@ router.register('drivers', DriverViewSet, basename='drivers')
 router.register('driverstandings', DriverStandingViewSet, basename='driverstandings')
 urlpatterns = [
     path('', include(router.urls))
-]
\ No newline at end of file
+]
+
+# Under ASGI the upstream proxies are served by async views, matched before the router's sync ones
+if settings.ASYNC_PROXY_VIEWS:
+    urlpatterns.insert(0, path('top3/latest/', async_views.latest_top3, name='top3-latest-async'))
@@ -3,60 +3,93 @@ from rest_framework import viewsets, status
 from rest_framework.views import APIView
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from django.http import Http404, JsonResponse, FileResponse
-from operator import itemgetter
+from django.http import Http404, HttpResponse, JsonResponse, FileResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
 from django.conf import settings
+from django.db.models import Subquery
+from f1_predictor.fast_list import FastListMixin
 
-from .models import Driver, Meeting, Result, DriverStanding
+from . import openf1, photos
+from .models import Driver, Meeting, Result, DriverStanding, LatestStanding
 from .serializers import (
     DriverSerializer,
     MeetingSerializer,
     ResultSerializer,
-    DriverStandingSerializer
+    DriverStandingSerializer,
+    LatestStandingSerializer
 )
 
 import logging
-from urllib.request import urlopen
-import json
-import os
 import mimetypes
 
 logger = logging.getLogger(__name__)
 
-class DriverViewSet(viewsets.ModelViewSet):
+class DriverViewSet(FastListMixin, viewsets.ModelViewSet):
     """API viewset for Driver objects."""
     queryset = Driver.objects.all().order_by('driver_number')
     serializer_class = DriverSerializer
     lookup_field = 'driver_number'
 
+    def add_fast_fields(self, rows):
+        for row in rows:
+            row['photo_urls'] = photos.photo_urls(row['driver_number'], self.request)
+        return rows
+
     @action(detail=True, methods=['get'], url_path='photo')
     def get_photo(self, request, driver_number=None):
-        """Endpoint to get the headshot photo of a driver"""
+        """
+        Endpoint to get the headshot photo of a driver, resized at ingest, ?size=sm|md|lg.
+        Photo files never change, so a request naming the current version with ?v=<etag>
+        may be cached forever. Unversioned requests are revalidated with the ETag instead.
+        """
         try:
-            driver = self.get_object()
-            images_folder = os.path.join(settings.BASE_DIR, 'static', 'images')
-
-            image_path = os.path.join(images_folder, f"{driver_number}.webp")
+            size = request.query_params.get('size', photos.DEFAULT_SIZE)
+            if size not in photos.PHOTO_SIZES:
+                return Response({"error": f"size must be one of {', '.join(photos.PHOTO_SIZES)}"}, status=status.HTTP_400_BAD_REQUEST)
 
-            if not image_path:
+            photo = photos.get_photo(driver_number, size)
+            if photo is None:
                 return Response({"error": f"Image was not found for driver with number {driver_number}"}, status=status.HTTP_404_NOT_FOUND)
 
-            return FileResponse(
-                open(image_path, 'rb'), content_type=mimetypes.guess_type(image_path), filename=f"driver_{driver_number}_photo{os.path.splitext(image_path)[1]}"
-            )
+            response = get_conditional_response(request, etag=photo['etag'])
+            if response is None:
+                response = self.photo_response(photo)
 
+            response['ETag'] = photo['etag']
+            if request.query_params.get('v') == photo['etag'].strip('"'):
+                patch_cache_control(response, public=True, max_age=365 * 24 * 60 * 60, immutable=True)
+            else:
+                patch_cache_control(response, public=True, no_cache=True)
+
+            return response
 
         except Exception as e:
-            logger.error(f"Error getting results: {e}")
+            logger.error(f"Error getting photo: {e}")
             return Response({"error": str(e)}, status=500)
 
-class MeetingViewSet(viewsets.ModelViewSet):
+    def photo_response(self, photo):
+        """Response for a photo file, handed off to the web server when DRIVER_PHOTO_SENDFILE is set"""
+        content_type = mimetypes.guess_type(photo['file'])[0] or 'application/octet-stream'
+
+        if settings.DRIVER_PHOTO_SENDFILE == 'x-accel-redirect':
+            response = HttpResponse(content_type=content_type)
+            response['X-Accel-Redirect'] = f"{settings.DRIVER_PHOTO_ACCEL_PREFIX.rstrip('/')}/{photo['file']}"
+            return response
+
+        if settings.DRIVER_PHOTO_SENDFILE == 'x-sendfile':
+            response = HttpResponse(content_type=content_type)
+            response['X-Sendfile'] = str(photo['path'])
+            return response
+
+        return FileResponse(open(photo['path'], 'rb'), content_type=content_type)
+
+class MeetingViewSet(FastListMixin, viewsets.ModelViewSet):
     """API viewset for Meeting objects."""
     queryset = Meeting.objects.all().order_by('meeting_key')
     serializer_class = MeetingSerializer
     lookup_field = 'meeting_key'
 
-class ResultViewSet(viewsets.ModelViewSet):
+class ResultViewSet(FastListMixin, viewsets.ModelViewSet):
     queryset = Result.objects.all().order_by('id')
     serializer_class = ResultSerializer
 
@@ -65,45 +98,59 @@ class ResultViewSet(viewsets.ModelViewSet):
     def latest_top3(self, request):
         """Custom GET endpoint to fetch top 3 results from the latest session."""
         try:
-            url = 'https://api.openf1.org/v1/session_result?session_key=latest&position%3C=3'
-            response = urlopen(url)
-
-            if response.status == 200:
-                results = json.loads(response.read().decode('utf-8'))
-
-                # Handle empty results
-                if not results or len(results) == 0:
-                    logger.warning("OpenF1 API returned no results for latest session")
-                    return Response({
-                        'results': [],
-                        'message': 'No recent race results available. Check back after the next F1 session!',
-                        'has_data': False
-                    }, status=200)
-
-                sorted_results = sorted(results, key=itemgetter('position'))
+            # Served from a shared cache, the upstream is only called when the cached top 3 goes stale
+            results = openf1.latest_top3.get()
+
+            # Handle empty results
+            if not results or len(results) == 0:
+                logger.warning("OpenF1 API returned no results for latest session")
                 return Response({
-                    'results': sorted_results,
-                    'has_data': True
-                })
-            else:
-                return Response({'error': 'API returned non-200 status'}, status=response.status)
+                    'results': [],
+                    'message': 'No recent race results available. Check back after the next F1 session!',
+                    'has_data': False
+                }, status=200)
+
+            return Response({
+                'results': results,
+                'has_data': True
+            })
+
+        except openf1.UpstreamError as e:
+            logger.error(f"Error getting results: {e}")
+            return Response({'error': 'API returned non-200 status'}, status=e.status)
 
         except Exception as e:
             logger.error(f"Error getting results: {e}")
             return Response({"error": str(e)}, status=500)
 
 
-class DriverStandingViewSet(viewsets.ModelViewSet):
-    queryset = DriverStanding.objects.all().order_by('driver_number')
+class DriverStandingViewSet(FastListMixin, viewsets.ModelViewSet):
+    # the primary key breaks ties, so an unpaginated list comes in the same order as the pages
+    queryset = DriverStanding.objects.all().order_by('driver_number', 'id')
     serializer_class = DriverStandingSerializer
     lookup_field = 'driver_number'
 
+    @staticmethod
+    def season_filter(request, model):
+        """
+        Season of a request, ?season= or else the latest one stored, resolved in the same query
+        :param request:
+        :param model: DriverStanding or LatestStanding
+        :return: value to filter the season field on
+        """
+        season = request.query_params.get('season')
+        if season:
+            return season
+
+        return Subquery(model.objects.order_by('-season').values('season')[:1])
+
     @action(detail=False, methods=['get'], url_path='round/(?P<round_number>[^/.]+)/driver/(?P<driver_number>[^/.]+)')
     def get_standing_by_driver(self, request, round_number=None, driver_number=None):
-        """Custom GET endpoint for getting the WDC standing of a driver"""
+        """Custom GET endpoint for getting the WDC standing of a driver after a round of a season, the latest one by default"""
         try:
             standing = get_object_or_404(
                 DriverStanding,
+                season=self.season_filter(request, DriverStanding),
                 round=round_number,
                 driver_number=driver_number
             )
@@ -120,13 +167,15 @@ class DriverStandingViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=['get'], url_path='round/latest/driver/(?P<driver_number>[^/.]+)')
     def get_latest_standing_for_driver(self, request, driver_number=None):
-        """Custom GET endpoint for getting the latest WDC standing of a driver"""
+        """Custom GET endpoint for getting the latest WDC standing of a driver in a season, the latest one by default"""
         try:
-            latest_standing = DriverStanding.objects.filter(
+            latest_standing = get_object_or_404(
+                LatestStanding,
+                season=self.season_filter(request, LatestStanding),
                 driver_number=driver_number
-            ).order_by('-round').first()
+            )
 
-            serializer = self.get_serializer(latest_standing)
+            serializer = LatestStandingSerializer(latest_standing)
             return Response(serializer.data)
 
         except Exception as e:
@@ -134,4 +183,20 @@ class DriverStandingViewSet(viewsets.ModelViewSet):
             return Response(
                 {'error': 'Latest standing not found'},
                 status=status.HTTP_404_NOT_FOUND
-            )
\ No newline at end of file
+            )
+
+    @action(detail=False, methods=['get'], url_path='latest')
+    def latest_grid(self, request):
+        """Custom GET endpoint for the latest WDC standing of every driver in a season, the latest one by default"""
+        try:
+            queryset = LatestStanding.objects.filter(season=self.season_filter(request, LatestStanding))
+
+            serializer = LatestStandingSerializer(queryset, many=True)
+            return Response(serializer.data)
+
+        except Exception as e:
+            logger.error(f"Error getting latest standings: {e}")
+            return Response(
+                {'error': 'Unable to fetch latest standings'},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
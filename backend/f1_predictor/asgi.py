@@ -3,6 +3,9 @@ ASGI config for f1_predictor project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Run with the ASGI profile in Procfile.asgi:
+    uvicorn f1_predictor.asgi:application --workers 2
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
@@ -12,5 +15,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'f1_predictor.settings')
+# Upstream proxies run as async views here, without holding a thread while OpenF1 answers
+os.environ.setdefault('ASYNC_PROXY_VIEWS', '1')
 
 application = get_asgi_application()
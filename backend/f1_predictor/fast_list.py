@@ -0,0 +1,81 @@
+import decimal
+
+import orjson
+from rest_framework.renderers import BaseRenderer
+from rest_framework.response import Response
+
+# query parameter that opts a list request into the fast path, e.g. /drivers/?fast=1
+FAST_PARAM = 'fast'
+
+
+def _default(value):
+    # DRF renders decimals as strings by default
+    if isinstance(value, decimal.Decimal):
+        return str(value)
+    raise TypeError
+
+
+class ORJSONRenderer(BaseRenderer):
+    """JSON renderer backed by orjson, for plain dicts and lists of model values"""
+
+    media_type = 'application/json'
+    format = 'json'
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        return orjson.dumps(data, default=_default, option=orjson.OPT_UTC_Z)
+
+
+class FastListMixin:
+    """
+    Opt-in read path for list endpoints of viewsets whose serializer is a plain
+    ModelSerializer over the model's own fields. With ?fast=1 the rows come straight
+    from .values() and are encoded by orjson, skipping model instances and per-field
+    serialization. Rows have the same keys and values as the serializer's output;
+    viewsets whose serializer computes fields add them in add_fast_fields.
+    """
+
+    def is_fast_list(self):
+        value = self.request.query_params.get(FAST_PARAM, '')
+        return self.action == 'list' and value.lower() in ('1', 'true', 'yes')
+
+    def get_renderers(self):
+        if self.is_fast_list():
+            return [ORJSONRenderer()]
+        return super().get_renderers()
+
+    def get_fast_fields(self):
+        """
+        Model fields included in fast rows, the serializer's fields
+        :return: list of field names
+        """
+
+        serializer_fields = getattr(self.get_serializer_class().Meta, 'fields', '__all__')
+        if serializer_fields != '__all__':
+            return list(serializer_fields)
+
+        return [field.name for field in self.get_queryset().model._meta.concrete_fields]
+
+    def add_fast_fields(self, rows):
+        """
+        Add the serializer's computed fields to fast rows, none by default
+        :param rows: list of dicts of model values
+        :return: the rows
+        """
+
+        return rows
+
+    def list(self, request, *args, **kwargs):
+        if not self.is_fast_list():
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset()).values(*self.get_fast_fields())
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(self.add_fast_fields(page))
+
+        return Response(self.add_fast_fields(list(queryset)))
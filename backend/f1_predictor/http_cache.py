@@ -0,0 +1,133 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+class OfflineMiss(LookupError):
+    """Offline and the response isn't cached"""
+
+
+class ResponseCache:
+    """
+    JSON responses of the ingest commands stored in HTTP_CACHE_DIR, one file per URL.
+    Entries keep the server's validators for conditional requests, and immutable entries,
+    e.g. the standings of a finished round, are served without asking the server at all.
+    """
+
+    def directory(self):
+        return settings.HTTP_CACHE_DIR
+
+    def path(self, url):
+        return self.directory() / f'{hashlib.sha256(url.encode()).hexdigest()}.json'
+
+    def load(self, url):
+        """
+        :param url:
+        :return: the cached entry, or None
+        """
+
+        try:
+            return json.loads(self.path(url).read_text())
+        except FileNotFoundError:
+            return None
+        except ValueError as e:
+            logger.warning(f"Ignoring unreadable cache entry of {url}: {e}")
+            return None
+
+    def store(self, url, document, etag=None, last_modified=None, immutable=False):
+        entry = {
+            'url': url,
+            'etag': etag,
+            'last_modified': last_modified,
+            'immutable': immutable,
+            'fetched_at': time.time(),
+            'document': document,
+        }
+
+        directory = self.directory()
+        directory.mkdir(parents=True, exist_ok=True)
+
+        # written to a temporary file first, so a crash or a concurrent reader never sees half an entry
+        handle, temporary = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(handle, 'w') as file:
+            json.dump(entry, file)
+        os.replace(temporary, self.path(url))
+
+        return entry
+
+    def mark_immutable(self, url):
+        """Serve the cached response of a URL from now on without revalidating it"""
+
+        entry = self.load(url)
+        if entry is not None and not entry['immutable']:
+            self.store(url, entry['document'], entry['etag'], entry['last_modified'], immutable=True)
+
+
+response_cache = ResponseCache()
+
+
+def conditional_headers(entry):
+    """Validators of a cached entry, so an unchanged document comes back as a bodiless 304"""
+
+    headers = {}
+    if entry is not None and entry['etag']:
+        headers['If-None-Match'] = entry['etag']
+    if entry is not None and entry['last_modified']:
+        headers['If-Modified-Since'] = entry['last_modified']
+
+    return headers
+
+
+def get_json(url, offline=False, timeout=10, before_request=None):
+    """
+    GET a JSON document through the response cache.
+    Immutable entries are returned as they are, others are revalidated with If-None-Match
+    and If-Modified-Since. Offline, every document comes from the cache.
+    :param url:
+    :param offline: never touch the network
+    :param timeout:
+    :param before_request: called before every request that reaches the network, e.g. to wait on a rate limiter
+    :return: the decoded document
+    """
+
+    entry = response_cache.load(url)
+
+    if entry is not None and (entry['immutable'] or offline):
+        return entry['document']
+
+    if offline:
+        raise OfflineMiss(f"{url} is not in the response cache")
+
+    if before_request is not None:
+        before_request()
+
+    try:
+        with urlopen(Request(url, headers=conditional_headers(entry)), timeout=timeout) as response:
+            if response.status != 200:
+                raise ValueError(f"{url} returned status {response.status}")
+
+            document = json.loads(response.read().decode('utf-8'))
+            response_cache.store(
+                url, document, response.headers.get('ETag'), response.headers.get('Last-Modified')
+            )
+            return document
+
+    except HTTPError as e:
+        if e.code != 304 or entry is None:
+            raise
+
+        # unchanged, the server may have sent fresher validators
+        response_cache.store(
+            url, entry['document'],
+            e.headers.get('ETag') or entry['etag'], e.headers.get('Last-Modified') or entry['last_modified'],
+        )
+        return entry['document']
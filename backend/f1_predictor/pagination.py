@@ -0,0 +1,176 @@
+import base64
+import binascii
+import json
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination over every field of the view's ordering.
+    A cursor holds the ordering values of the row it points at, so a page always starts
+    right after the previous one, however many rows were added or removed meanwhile.
+    The primary key is appended to the ordering whenever it isn't already part of it,
+    which keeps the ordering total and cursors stable when the other fields repeat.
+    ?paginate=false returns the whole list unpaginated, as before pagination existed.
+    """
+
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    paginate_query_param = 'paginate'
+    max_page_size = 1000
+    invalid_cursor_message = 'Invalid cursor'
+
+    def is_paginated(self, request):
+        return request.query_params.get(self.paginate_query_param, '').lower() not in ('false', '0', 'no')
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return api_settings.PAGE_SIZE
+
+        return min(max(page_size, 1), self.max_page_size)
+
+    def get_ordering(self, queryset, view):
+        """
+        Ordering of the view's queryset, or of its model, with the primary key as tie-break
+        :param queryset:
+        :param view:
+        :return: list of field names, '-' prefixed when descending
+        """
+
+        pk = queryset.model._meta.pk.name
+        ordering = [
+            pk if field.lstrip('-') == 'pk' else field
+            for field in (queryset.query.order_by or queryset.model._meta.ordering or [])
+        ]
+
+        if not any(field.lstrip('-') == pk for field in ordering):
+            ordering.append(pk)
+
+        return ordering
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if not self.is_paginated(request):
+            return None
+
+        self.request = request
+        self.ordering = self.get_ordering(queryset, view)
+        page_size = self.get_page_size(request)
+        cursor = self.decode_cursor(request)
+
+        # walking backwards is walking forwards over the reversed ordering
+        reverse = cursor is not None and cursor['reverse']
+        ordering = [self.flip(field) for field in self.ordering] if reverse else self.ordering
+
+        queryset = queryset.order_by(*ordering)
+        if cursor is not None:
+            queryset = queryset.filter(self.after(cursor['position'], ordering))
+
+        rows = list(queryset[:page_size + 1])
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if reverse:
+            rows.reverse()
+
+        self.has_next = cursor is not None if reverse else has_more
+        self.has_previous = has_more if reverse else cursor is not None
+        self.rows = rows
+
+        return rows
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_next_link(self):
+        if not self.has_next or not self.rows:
+            return None
+
+        return self.encode_cursor(self.position(self.rows[-1]), reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.rows:
+            return None
+
+        return self.encode_cursor(self.position(self.rows[0]), reverse=True)
+
+    @staticmethod
+    def flip(field):
+        return field[1:] if field.startswith('-') else f'-{field}'
+
+    @staticmethod
+    def after(position, ordering):
+        """
+        Filter for rows that come after `position` in `ordering`
+        :param position: ordering values of a row
+        :param ordering:
+        :return: Q
+        """
+
+        condition = Q()
+        for i, field in enumerate(ordering):
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            ties = {ordering[j].lstrip('-'): position[j] for j in range(i)}
+            condition |= Q(**ties, **{f"{field.lstrip('-')}__{lookup}": position[i]})
+
+        return condition
+
+    def position(self, row):
+        """Ordering values of a model instance or a .values() dict"""
+
+        names = [field.lstrip('-') for field in self.ordering]
+        if isinstance(row, dict):
+            return [row[name] for name in names]
+
+        return [getattr(row, name) for name in names]
+
+    def encode_cursor(self, position, reverse):
+        token = json.dumps({'p': position, 'r': int(reverse)}, separators=(',', ':'))
+        cursor = base64.urlsafe_b64encode(token.encode()).decode()
+        return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, cursor)
+
+    def decode_cursor(self, request):
+        """
+        Position and direction of the request's cursor
+        :param request:
+        :return: dict with position and reverse, or None on the first page
+        """
+
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+
+        try:
+            token = json.loads(base64.urlsafe_b64decode(encoded.encode()).decode())
+            position, reverse = token['p'], bool(token['r'])
+        except (binascii.Error, UnicodeDecodeError, ValueError, KeyError, TypeError):
+            raise NotFound(self.invalid_cursor_message)
+
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+
+        return {'position': position, 'reverse': reverse}
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def to_html(self):
+        return ''
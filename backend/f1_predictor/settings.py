@@ -27,6 +27,12 @@ INSTALLED_APPS = [
     'predictions.apps.PredictionsConfig'
 ]
 
+# List endpoints are paginated with keyset cursors, ?paginate=false returns the whole list
+REST_FRAMEWORK = {
+    'DEFAULT_PAGINATION_CLASS': 'f1_predictor.pagination.KeysetPagination',
+    'PAGE_SIZE': int(os.environ.get('API_PAGE_SIZE', 100)),
+}
+
 # Middlewares
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
@@ -82,6 +88,23 @@ if not os.environ.get('DATABASE_URL'):
         }
     }
 
+# Cache shared by the web workers and management commands, so commands can invalidate
+# cached responses. Redis needs the redis package, the file cache works on a single host.
+if os.environ.get('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ.get('REDIS_URL'),
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.environ.get('CACHE_DIR', BASE_DIR / '.cache'),
+        }
+    }
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -108,5 +131,34 @@ USE_TZ = True
 # Static files
 STATIC_URL = 'static/'
 
+# OpenF1 API, proxied for the latest top 3 and cached for OPENF1_CACHE_TTL seconds
+OPENF1_URL = os.environ.get('OPENF1_URL', 'https://api.openf1.org/v1')
+OPENF1_CACHE_TTL = int(os.environ.get('OPENF1_CACHE_TTL', 60))
+OPENF1_TIMEOUT = int(os.environ.get('OPENF1_TIMEOUT', 5))
+
+# Jolpica-F1 (Ergast) API of the ingest commands, fetched by JOLPICA_WORKERS threads within its rate limits.
+# Rate limited and failed requests are retried JOLPICA_RETRIES times, backing off from JOLPICA_BACKOFF seconds
+JOLPICA_URL = os.environ.get('JOLPICA_URL', 'https://api.jolpi.ca/ergast/f1')
+JOLPICA_WORKERS = int(os.environ.get('JOLPICA_WORKERS', 4))
+JOLPICA_TIMEOUT = int(os.environ.get('JOLPICA_TIMEOUT', 10))
+JOLPICA_RETRIES = int(os.environ.get('JOLPICA_RETRIES', 4))
+JOLPICA_BACKOFF = float(os.environ.get('JOLPICA_BACKOFF', 1))
+
+# Responses of the ingest commands, revalidated with ETag and If-Modified-Since, replayed by --offline
+HTTP_CACHE_DIR = Path(os.environ.get('HTTP_CACHE_DIR', BASE_DIR / 'http_cache'))
+
+# Serve the OpenF1 proxies from async views, switched on by the ASGI entry point
+ASYNC_PROXY_VIEWS = os.environ.get('ASYNC_PROXY_VIEWS', '').lower() in ('1', 'true', 'yes')
+
+# Driver photos resized at ingest. With DRIVER_PHOTO_SENDFILE set to 'x-accel-redirect' (nginx,
+# internal location at DRIVER_PHOTO_ACCEL_PREFIX) or 'x-sendfile' (Apache, lighttpd) the web
+# server sends the file instead of the Python worker
+DRIVER_PHOTO_DIR = Path(os.environ.get('DRIVER_PHOTO_DIR', BASE_DIR / 'media' / 'photos'))
+DRIVER_PHOTO_SENDFILE = os.environ.get('DRIVER_PHOTO_SENDFILE', '')
+DRIVER_PHOTO_ACCEL_PREFIX = os.environ.get('DRIVER_PHOTO_ACCEL_PREFIX', '/protected/photos/')
+
+# Trained prediction models
+MODEL_ARTIFACT_DIR = Path(os.environ.get('MODEL_ARTIFACT_DIR', BASE_DIR / 'artifacts'))
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
\ No newline at end of file
@@ -0,0 +1,69 @@
+from django.db import transaction
+
+
+def bulk_upsert(model, rows, key_fields, batch_size=500):
+    """
+    Write rows keyed by a unique constraint of the model. Existing rows are read in one query,
+    and only new or changed rows are written, with bulk_create(update_conflicts=True) in a
+    single transaction. Bulk writes send no signals, callers invalidate what depends on them.
+    :param model:
+    :param rows: dicts of field values including the key fields, a later row wins over an earlier one with its key
+    :param key_fields: fields of a unique constraint of the model
+    :param batch_size: rows per INSERT statement
+    :return: dict with the number of rows inserted, updated and unchanged
+    """
+
+    fields = {name: model._meta.get_field(name) for row in rows for name in row}
+    value_fields = [name for name in fields if name not in key_fields]
+
+    # compare in the types the database returns, e.g. '25' from the API as 25
+    incoming = {}
+    for row in rows:
+        values = {name: fields[name].to_python(value) for name, value in row.items()}
+        incoming[tuple(values[name] for name in key_fields)] = values
+
+    if not incoming:
+        return {'inserted': 0, 'updated': 0, 'unchanged': 0}
+
+    # narrowed by every key field separately, rows matching no key are dropped below
+    lookup = {
+        f'{name}__in': {key[i] for key in incoming}
+        for i, name in enumerate(key_fields)
+    }
+
+    with transaction.atomic():
+        existing = {
+            tuple(row[:len(key_fields)]): dict(zip(value_fields, row[len(key_fields):]))
+            for row in model.objects.filter(**lookup).values_list(*key_fields, *value_fields)
+        }
+
+        counts = {'inserted': 0, 'updated': 0, 'unchanged': 0}
+        changed = []
+        for key, values in incoming.items():
+            current = existing.get(key)
+            if current is None:
+                counts['inserted'] += 1
+            elif any(current[name] != values[name] for name in value_fields if name in values):
+                counts['updated'] += 1
+            else:
+                counts['unchanged'] += 1
+                continue
+            changed.append(model(**values))
+
+        if changed:
+            model.objects.bulk_create(
+                changed,
+                batch_size=batch_size,
+                update_conflicts=bool(value_fields),
+                ignore_conflicts=not value_fields,
+                unique_fields=key_fields if value_fields else None,
+                update_fields=value_fields or None,
+            )
+
+    return counts
+
+
+def describe(counts, name):
+    """One-line report of bulk_upsert counts, e.g. '3 drivers inserted, 1 updated, 16 unchanged'"""
+
+    return f"{counts['inserted']} {name} inserted, {counts['updated']} updated, {counts['unchanged']} unchanged"
@@ -1,6 +1,14 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_save
 
 
 class PredictionsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'predictions'
+
+    def ready(self):
+        from .cache import invalidate_payload
+        from .models import Prediction
+
+        post_save.connect(invalidate_payload, sender=Prediction, dispatch_uid='predictions_invalidate_on_save')
+        post_delete.connect(invalidate_payload, sender=Prediction, dispatch_uid='predictions_invalidate_on_delete')
@@ -0,0 +1,109 @@
+import hashlib
+import json
+import logging
+import time
+from datetime import datetime
+
+import pandas as pd
+import sklearn
+import xgboost as xgb
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Most recent artifacts kept per model type
+KEEP_ARTIFACTS = 5
+
+# Bumped whenever Predictor.save() stores something new, so older artifacts are retrained
+ARTIFACT_VERSION = 2
+
+
+def training_data_hash(features):
+    """
+    Hash of the feature rows a model is trained on
+    :param features:
+    :return: hex digest
+    """
+
+    digest = hashlib.sha256(json.dumps(list(features.columns)).encode())
+    digest.update(pd.util.hash_pandas_object(features, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def artifact_key(predictor, features):
+    """
+    Version of a trained predictor: its training data, hyperparameters and the
+    library versions the models are pickled with
+    :param predictor:
+    :param features:
+    :return: hex digest
+    """
+
+    tag = {
+        'version': ARTIFACT_VERSION,
+        'model_type': predictor.model_type,
+        'params': predictor.params,
+        'data': training_data_hash(features),
+        'sklearn': sklearn.__version__,
+        'xgboost': xgb.__version__,
+    }
+    return hashlib.sha256(json.dumps(tag, sort_keys=True).encode()).hexdigest()
+
+
+def artifact_path(predictor, key):
+    return settings.MODEL_ARTIFACT_DIR / predictor.model_type / f'{key}.joblib'
+
+
+def load_or_train(predictor, features, retrain=False):
+    """
+    Load the predictor's models from disk if they were trained on the same data with
+    the same hyperparameters, otherwise train and save them
+    :param predictor:
+    :param features: training feature rows
+    :param retrain: train even if a matching artifact exists
+    :return: metadata of the artifact, with 'cached' telling whether it was loaded
+    """
+
+    key = artifact_key(predictor, features)
+    path = artifact_path(predictor, key)
+
+    if path.exists() and not retrain:
+        start = time.perf_counter()
+        metadata = predictor.load(path)
+        logger.info(f"Loaded {predictor.model_type} artifact {key[:12]} in {time.perf_counter() - start:.3f}s")
+        return {**metadata, 'cached': True}
+
+    metadata = {
+        'key': key,
+        'trained_at': datetime.now().isoformat(),
+        'metrics': predictor.train(features=features),
+    }
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    predictor.save(path, metadata)
+    logger.info(f"Saved {predictor.model_type} artifact {key[:12]}")
+
+    prune_artifacts(path.parent)
+    return {**metadata, 'cached': False}
+
+
+def prune_artifacts(folder, keep=KEEP_ARTIFACTS):
+    """Delete all but the most recent artifacts in a folder"""
+
+    artifacts = sorted(folder.glob('*.joblib'), key=lambda path: path.stat().st_mtime, reverse=True)
+    for path in artifacts[keep:]:
+        path.unlink(missing_ok=True)
+
+
+def latest_artifact(model_type):
+    """
+    Most recently saved artifact of a model type
+    :param model_type:
+    :return: Path, or None if none was saved
+    """
+
+    artifacts = list((settings.MODEL_ARTIFACT_DIR / model_type).glob('*.joblib'))
+    if not artifacts:
+        return None
+
+    return max(artifacts, key=lambda path: path.stat().st_mtime)
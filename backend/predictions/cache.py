@@ -0,0 +1,92 @@
+import hashlib
+import json
+from datetime import datetime, timezone
+
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+
+from .models import Prediction
+from .serializers import PredictionSerializer
+
+PAYLOAD_KEY = 'predictions:payload'
+# bumped on every write to Prediction, a payload built for an older generation is stale
+GENERATION_KEY = 'predictions:generation'
+
+
+def build_payload(generation):
+    """
+    Serialize the current prediction run with its validators
+    :param generation: cache generation the payload is built for
+    :return: dict with the response body, etag and last_modified timestamp
+    """
+
+    data = PredictionSerializer(Prediction.objects.all(), many=True).data
+    first_prediction = data[0]
+
+    # the run is as recent as its most recently written row
+    generated_at = max(prediction['generated_at'] for prediction in data)
+    body = {
+        'predictions': data,
+        'model_type': first_prediction['model_type'],
+        'generated_at': first_prediction['generated_at']
+    }
+
+    # hashed from the body itself, so two different bodies never share a validator
+    serialized = json.dumps(body, sort_keys=True, cls=DjangoJSONEncoder)
+
+    return {
+        'generation': generation,
+        'body': body,
+        'etag': f'"{hashlib.sha1(serialized.encode()).hexdigest()}"',
+        'last_modified': parse_timestamp(generated_at),
+    }
+
+
+def parse_timestamp(value):
+    """
+    Unix timestamp of an ISO generated_at value, naive values are taken as UTC
+    :param value:
+    :return: int or None if the value isn't an ISO date
+    """
+
+    try:
+        moment = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+
+    return int(moment.timestamp())
+
+
+def get_payload():
+    """
+    Cached predictions payload, rebuilt from the database only after predictions changed
+    :return: dict as returned by build_payload
+    """
+
+    cached = cache.get_many([GENERATION_KEY, PAYLOAD_KEY])
+    generation = cached.get(GENERATION_KEY, 0)
+    payload = cached.get(PAYLOAD_KEY)
+
+    if payload is None or payload['generation'] != generation:
+        payload = build_payload(generation)
+        cache.set(PAYLOAD_KEY, payload, timeout=None)
+
+    return payload
+
+
+def bump_generation():
+    cache.add(GENERATION_KEY, 0, timeout=None)
+    cache.incr(GENERATION_KEY)
+
+
+def invalidate_payload(**kwargs):
+    """
+    Signal receiver marking the cached payload stale once the write commits. Bumped earlier,
+    a request between the bump and the commit would cache the old rows as the new generation.
+    """
+
+    transaction.on_commit(bump_generation)
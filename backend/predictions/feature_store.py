@@ -0,0 +1,131 @@
+import logging
+
+import pandas as pd
+from django.db import transaction
+
+from .features import FEATURE_COLUMNS, TARGET_COLUMNS, build_features, group_keys, sort_standings, upcoming_rounds
+from .models import FeatureRow
+
+logger = logging.getLogger(__name__)
+
+KEY_COLUMNS = ['season', 'driver_number', 'round']
+STANDING_COLUMNS = ['position', 'points', 'wins']
+
+# every stored row depends on the standing of its own round and of the round before it
+SOURCE_COLUMNS = ['source_position', 'source_points', 'source_wins']
+PREVIOUS_COLUMNS = ['current_championship_position', 'current_points', 'current_wins']
+INPUT_COLUMNS = SOURCE_COLUMNS + PREVIOUS_COLUMNS
+
+
+def with_upcoming(df):
+    """
+    Standings plus a placeholder for the next round of every driver in the latest season
+    :param df:
+    :return:
+    """
+
+    return pd.concat([df, upcoming_rounds(df)], ignore_index=True)
+
+
+def expected_inputs(df):
+    """
+    Key and input standings of every row the store should hold
+    :param df: standings including upcoming placeholders
+    :return:
+    """
+
+    df = sort_standings(df)
+    groups = df.groupby(group_keys(df), sort=False)
+    offsets = groups.cumcount().to_numpy()
+
+    inputs = df[KEY_COLUMNS].copy()
+    inputs[SOURCE_COLUMNS] = df[STANDING_COLUMNS].to_numpy()
+    inputs[PREVIOUS_COLUMNS] = groups[STANDING_COLUMNS].shift(1).to_numpy()
+
+    return inputs[offsets >= 1]
+
+
+def stored_inputs():
+    """
+    Key and input standings of every row currently in the store
+    :return:
+    """
+
+    columns = ['id'] + KEY_COLUMNS + INPUT_COLUMNS
+    rows = FeatureRow.objects.values_list(*columns)
+    return pd.DataFrame.from_records(rows, columns=columns, coerce_float=True)
+
+
+def sync_feature_store(standings):
+    """
+    Bring the stored feature rows in line with the standings.
+    Rows are compared by the standings they were computed from, and only driver seasons
+    that changed are recomputed, from their first changed round onwards.
+    :param standings:
+    :return: dict with the number of rows computed and deleted
+    """
+
+    df = pd.DataFrame(standings)
+
+    if len(df) == 0:
+        deleted, _ = FeatureRow.objects.all().delete()
+        return {'computed': 0, 'deleted': deleted}
+
+    df = with_upcoming(df[KEY_COLUMNS + STANDING_COLUMNS])
+    expected = expected_inputs(df)
+    stored = stored_inputs()
+
+    merged = expected.merge(stored, on=KEY_COLUMNS, how='outer', suffixes=('', '_stored'), indicator=True)
+    unchanged = merged['_merge'] == 'both'
+    for col in INPUT_COLUMNS:
+        new, old = merged[col], merged[f'{col}_stored']
+        unchanged &= (new == old) | (new.isna() & old.isna())
+
+    stale_ids = merged.loc[merged['_merge'] == 'right_only', 'id'].astype(int).tolist()
+
+    # a changed, missing or removed round invalidates every later row of that driver season
+    dirty_from = (
+        merged.loc[~unchanged]
+        .groupby(['season', 'driver_number'], as_index=False)['round'].min()
+        .rename(columns={'round': 'dirty_from'})
+    )
+
+    history = df.merge(dirty_from[['season', 'driver_number']], on=['season', 'driver_number'])
+    computed = build_features(history, with_season=True).merge(dirty_from, on=['season', 'driver_number'])
+    computed = computed[computed['round'] >= computed['dirty_from']]
+    computed = computed.merge(expected[KEY_COLUMNS + SOURCE_COLUMNS], on=KEY_COLUMNS)
+
+    fields = KEY_COLUMNS + SOURCE_COLUMNS + TARGET_COLUMNS + [col for col in FEATURE_COLUMNS if col not in KEY_COLUMNS]
+    records = computed[fields].astype(object).where(computed[fields].notna(), None).to_dict('records')
+
+    with transaction.atomic():
+        if stale_ids:
+            FeatureRow.objects.filter(id__in=stale_ids).delete()
+
+        FeatureRow.objects.bulk_create(
+            [FeatureRow(**record) for record in records],
+            update_conflicts=True,
+            unique_fields=['season', 'round', 'driver_number'],
+            update_fields=[field for field in fields if field not in KEY_COLUMNS],
+            batch_size=500,
+        )
+
+    logger.info(f"Feature store: computed {len(records)} rows, deleted {len(stale_ids)} stale rows")
+    return {'computed': len(records), 'deleted': len(stale_ids)}
+
+
+def load_features(upcoming=False, seasons=None):
+    """
+    Read feature rows from the store, with the same columns as Predictor.prepare_features
+    :param upcoming: read rows for the next round, which have no targets yet, instead of training rows
+    :param seasons: restrict to these seasons
+    :return: pd.DataFrame
+    """
+
+    queryset = FeatureRow.objects.filter(target_position__isnull=upcoming)
+    if seasons:
+        queryset = queryset.filter(season__in=seasons)
+
+    columns = TARGET_COLUMNS + FEATURE_COLUMNS
+    rows = queryset.order_by('driver_number', 'season', 'round').values_list(*columns)
+    return pd.DataFrame.from_records(rows, columns=columns, coerce_float=True)
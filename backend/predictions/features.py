@@ -0,0 +1,250 @@
+import numpy as np
+import pandas as pd
+
+# Races in a season, the scale of season_progress and the length of seasons without a known calendar
+SEASON_LENGTH = 23
+
+# Longest look-back window used by any feature
+MAX_LOOKBACK = 5
+
+TARGET_COLUMNS = ['target_position', 'target_points_gained']
+
+FEATURE_COLUMNS = [
+    'driver_number', 'round',
+    'last_position', 'last_2_avg_position', 'last_3_avg_position', 'last_5_avg_position',
+    'position_trend_3_races', 'points_trend_3_races',
+    'position_std_3_races', 'position_std_5_races',
+    'current_championship_position', 'current_points', 'current_wins',
+    'season_progress',
+    'recent_wins', 'races_since_last_win',
+    'points_per_race_avg', 'points_per_race_recent',
+    'position_change_last_race', 'best_position_last_5', 'worst_position_last_5',
+]
+
+
+def group_keys(df):
+    """
+    Columns that identify one driver's run of standings.
+    Standings reset every season, so history never crosses a season boundary.
+    :param df:
+    :return:
+    """
+
+    return ['season', 'driver_number'] if 'season' in df.columns else ['driver_number']
+
+
+def sort_standings(df):
+    """
+    Sort standings so every driver's rounds are contiguous and in order
+    :param df:
+    :return:
+    """
+
+    order = ['driver_number', 'season', 'round'] if 'season' in df.columns else ['driver_number', 'round']
+    return df.sort_values(order, kind='stable').reset_index(drop=True)
+
+
+def lagged(values, offsets, depth):
+    """
+    Stack the previous `depth` values of each row within its group.
+    Column k holds the value k + 1 rows back, NaN where the group has no such row.
+    :param values: 1-d array of a standings column, sorted by group
+    :param offsets: position of each row inside its group
+    :param depth: number of lags
+    :return: array of shape (len(values), depth)
+    """
+
+    values = np.asarray(values, dtype=float)
+    lags = np.full((len(values), depth), np.nan)
+
+    for k in range(1, depth + 1):
+        lags[k:, k - 1] = values[:len(values) - k]
+        lags[offsets < k, k - 1] = np.nan
+
+    return lags
+
+
+def rolling_slope(lags, history, window):
+    """
+    Least-squares slope of each row's last `window` values, in closed form.
+    Same as np.polyfit(range(n), values, 1)[0] over the n = min(history, window)
+    most recent values, and 0 when fewer than two values are available.
+    :param lags: lagged values, most recent first, as returned by lagged()
+    :param history: number of values available to each row
+    :param window: number of most recent values to fit
+    :return: 1-d array of slopes
+    """
+
+    n = np.minimum(history, window)[:, None]
+    k = np.arange(window)[None, :]
+    in_window = k < n
+
+    # x runs from 0 for the oldest value to n - 1 for the most recent one, so the
+    # slope is a weighted sum of the values with weights (x - mean(x)) / Sxx
+    sxx = n * (n ** 2 - 1) / 12
+    weights = np.where(in_window, (n - 1) / 2 - k, 0) / np.where(sxx > 0, sxx, 1)
+    values = np.where(in_window, lags[:, :window], 0)
+
+    return np.where(n[:, 0] >= 2, (weights * values).sum(axis=1), 0.0)
+
+
+def races_since_last_win(wins, offsets):
+    """
+    Number of races since the driver's win count last went up, measured from the
+    end of each row's history. Mirrors Predictor._races_since_last_win.
+    :param wins: 1-d array of cumulative wins, sorted by group
+    :param offsets: position of each row inside its group
+    :return: array aligned with `wins`, only meaningful where offsets >= 1
+    """
+
+    index = np.arange(len(wins))
+    starts = index - offsets
+
+    increased = np.zeros(len(wins), dtype=bool)
+    increased[1:] = wins[1:] > wins[:-1]
+    increased &= offsets >= 1
+
+    # index of the latest increase at or before each row (may belong to an earlier group)
+    latest_increase = np.maximum.accumulate(np.where(increased, index, -1))
+
+    # the history of row i ends at row i - 1
+    previous_increase = np.full(len(wins), -1)
+    previous_increase[1:] = latest_increase[:-1]
+    previous_wins = np.zeros_like(wins)
+    previous_wins[1:] = wins[:-1]
+
+    history_length = offsets
+    has_increase = (previous_increase >= starts) & (previous_wins != wins[starts])
+
+    return np.where(has_increase, history_length - (previous_increase - starts), history_length)
+
+
+def build_features(df, with_season=False):
+    """
+    Vectorized feature engineering from standings data.
+    Produces the same rows and columns as the per-row loop in Predictor, one row for
+    every round after a driver's first, using only the rounds before it.
+    :param df: standings with driver_number, round, position, points and wins
+    :param with_season: prepend the season of every row, e.g. to key stored features
+    :return: pd.DataFrame of features and targets
+    """
+
+    df = sort_standings(df)
+    offsets = df.groupby(group_keys(df), sort=False).cumcount().to_numpy()
+
+    driver_numbers = df['driver_number'].to_numpy()
+    rounds = df['round'].to_numpy()
+    positions = df['position'].to_numpy()
+    points = df['points'].to_numpy()
+    wins = df['wins'].to_numpy()
+
+    position_lags = lagged(positions, offsets, MAX_LOOKBACK)
+    points_lags = lagged(points, offsets, 3)
+    wins_lags = lagged(wins, offsets, 3)
+    since_last_win = races_since_last_win(wins, offsets)
+
+    # first race of every driver has no history to predict from
+    rows = offsets >= 1
+    history = offsets[rows]
+    position_lags = position_lags[rows]
+    points_lags = points_lags[rows]
+    wins_lags = wins_lags[rows]
+
+    # previous round, i.e. the end of the history
+    last = np.flatnonzero(rows) - 1
+
+    def window_stat(func, lags, window):
+        return func(lags[:, :window], axis=1)
+
+    features = pd.DataFrame({
+        # Target variables
+        'target_position': positions[rows],
+        'target_points_gained': points[rows] - points[last],
+
+        # Driver identifier
+        'driver_number': driver_numbers[rows],
+        'round': rounds[rows],
+
+        # Recent performance features (last 1-5 races)
+        'last_position': positions[last],
+        'last_2_avg_position': window_stat(np.nanmean, position_lags, 2),
+        'last_3_avg_position': window_stat(np.nanmean, position_lags, 3),
+        'last_5_avg_position': window_stat(np.nanmean, position_lags, 5),
+
+        # Momentum features
+        'position_trend_3_races': rolling_slope(position_lags, history, 3),
+        'points_trend_3_races': rolling_slope(points_lags, history, 3),
+
+        # Consistency features
+        'position_std_3_races': np.where(history >= 3, np.std(position_lags[:, :3], axis=1, ddof=1), 0),
+        'position_std_5_races': np.where(history >= 5, np.std(position_lags[:, :5], axis=1, ddof=1), 0),
+
+        # Championship standing features
+        'current_championship_position': positions[last],
+        'current_points': points[last],
+        'current_wins': wins[last],
+
+        # Season progress
+        'season_progress': rounds[rows] / SEASON_LENGTH,
+
+        # Win streak and performance streaks
+        'recent_wins': np.where(
+            history >= 3, window_stat(np.nanmax, wins_lags, 3) - window_stat(np.nanmin, wins_lags, 3), 0
+        ).astype(wins.dtype),
+        'races_since_last_win': since_last_win[rows],
+
+        # Points per race efficiency
+        'points_per_race_avg': points[last] / history,
+        'points_per_race_recent': np.where(history >= 3, (points_lags[:, 0] - points_lags[:, 2]) / 3, 0),
+
+        # Position improvement/decline
+        'position_change_last_race': np.where(
+            history >= 2, position_lags[:, 0] - position_lags[:, 1], 0
+        ).astype(positions.dtype),
+        'best_position_last_5': window_stat(np.nanmin, position_lags, 5).astype(positions.dtype),
+        'worst_position_last_5': window_stat(np.nanmax, position_lags, 5).astype(positions.dtype),
+    })
+
+    if with_season and 'season' in df.columns:
+        features.insert(0, 'season', df['season'].to_numpy()[rows])
+
+    return features
+
+
+def current_season(df):
+    """
+    Standings of the latest season only, the one predictions are made for
+    :param df:
+    :return:
+    """
+
+    if 'season' in df.columns:
+        df = df[df['season'] == df['season'].max()]
+
+    return sort_standings(df)
+
+
+def upcoming_rounds(df):
+    """
+    Placeholder standings for the round after each driver's latest one in the
+    latest season. Their results are unknown, so position, points and wins are NaN.
+    :param df:
+    :return:
+    """
+
+    latest = current_season(df).groupby('driver_number', sort=False).tail(1)
+    return latest.assign(round=latest['round'] + 1, position=np.nan, points=np.nan, wins=np.nan)
+
+
+def next_round_features(df):
+    """
+    Feature rows for the round after each driver's latest one, for every driver of
+    the latest season. The placeholder round is run through build_features with the
+    rest of the history, so prediction rows match training rows exactly.
+    :param df: standings with driver_number, round, position, points and wins
+    :return: pd.DataFrame with one row per driver, in driver_number order, targets left as NaN
+    """
+
+    df = current_season(df)
+    features = build_features(pd.concat([df, upcoming_rounds(df)], ignore_index=True))
+    return features.groupby('driver_number', sort=False).tail(1).reset_index(drop=True)
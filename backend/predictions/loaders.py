@@ -0,0 +1,62 @@
+import logging
+from itertools import islice
+
+import numpy as np
+
+from drivers.models import DriverStanding
+from drivers.standings import meeting_calendar
+from .features import SEASON_LENGTH
+
+logger = logging.getLogger(__name__)
+
+# Column types of the loaded standings, season keeps DriverStanding's CharField(max_length=5)
+STANDING_DTYPES = {
+    'season': 'U5',
+    'round': np.int32,
+    'driver_number': np.int32,
+    'position': np.int32,
+    'points': np.float64,
+    'wins': np.int32,
+}
+
+
+def load_standings(seasons=None, chunk_size=2000):
+    """
+    Load driver standings into typed NumPy columns.
+    Rows are streamed from the database as tuples in chunks, so no dict or model
+    instance is built per row.
+    :param seasons: seasons to load, all of them if None
+    :param chunk_size: rows fetched per round trip
+    :return: dict of column name to np.ndarray, accepted by Predictor.train and predict
+    """
+
+    queryset = DriverStanding.objects.all()
+    if seasons is not None:
+        queryset = queryset.filter(season__in=[str(season) for season in seasons])
+
+    names = list(STANDING_DTYPES)
+    rows = queryset.order_by('season', 'driver_number', 'round').values_list(*names).iterator(chunk_size=chunk_size)
+    chunks = {name: [] for name in names}
+
+    while chunk := list(islice(rows, chunk_size)):
+        for name, values in zip(names, zip(*chunk)):
+            chunks[name].append(np.array(values, dtype=STANDING_DTYPES[name]))
+
+    return {
+        name: np.concatenate(chunks[name]) if chunks[name] else np.empty(0, dtype=dtype)
+        for name, dtype in STANDING_DTYPES.items()
+    }
+
+
+def season_length(season):
+    """
+    Number of races in a season, from the stored meetings
+    :param season:
+    :return: SEASON_LENGTH if no meeting of the season is stored
+    """
+
+    calendar = meeting_calendar(season)
+    if not calendar:
+        logger.warning(f"No stored calendar of season {season}, assuming {SEASON_LENGTH} races")
+
+    return len(calendar) or SEASON_LENGTH
@@ -1,12 +1,18 @@
 from django.core.management.base import BaseCommand
 from django.core.management.base import CommandError
 import logging
+from django.db import transaction
+from django.utils import timezone
 from predictions import utils
+from predictions.artifacts import load_or_train
+from predictions.feature_store import load_features, sync_feature_store
+from predictions.loaders import load_standings, season_length
+from predictions.search import load_best_params
+from predictions.simulation import simulate_championship
 from rest_framework import status
-from drivers.models import Driver, DriverStanding
+from drivers.models import Driver
 from rest_framework.response import Response
-from datetime import datetime
-from predictions.models import Prediction
+from predictions.models import Prediction, ChampionshipProbability
 
 logger = logging.getLogger(__name__)
 
@@ -14,37 +20,103 @@ logger = logging.getLogger(__name__)
 class Command(BaseCommand):
     """Management command for running predictions"""
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--retrain',
+            action='store_true',
+            help='Train new models even if saved ones match the current standings',
+        )
+
     def handle(self, *args, **options):
         try:
-            standings = list(DriverStanding.objects.all().values())
-
-            chosen_model = 'xgboost'
-
-            predictor = utils.Predictor(model_type=chosen_model)
-            predictor.train(standings)
-
-            for driver in Driver.objects.all():
-                pred = predictor.predict(standings, driver.driver_number)
-                if pred:
-                    prediction_obj, created = Prediction.objects.update_or_create(
-                        driver_number=driver.driver_number,
-                        defaults={
-                            'predicted_position': pred['predicted_position'],
-                            'predicted_points_gain': pred['predicted_points_gain'],
-                            'predicted_total_points': pred['predicted_total_points'],
-                            'current_position': pred['current_position'],
-                            'current_points': pred['current_points'],
-                            'confidence': pred['confidence'],
-                            'generated_at': datetime.now().isoformat(),
-                            'model_type': chosen_model
-                        }
-                    )
-                    action = f'Created prediction for driver #{driver.driver_number}' if created else f'Updated prediction for driver #{driver.driver_number}'
-                    logger.info(action)
-
-                else:
-                    logger.error(f"Error predicting for driver #{driver.driver_number}")
+            standings = load_standings()
+
+            # use the winner of the last hyperparameter search if there is one
+            best = load_best_params()
+            chosen_model = best['model_type'] if best else 'xgboost'
+            chosen_params = best['params'] if best else None
+
+            # only rounds that changed since the last run are recomputed
+            sync_feature_store(standings)
+
+            # reuse saved models while the standings and hyperparameters are unchanged
+            predictor = utils.Predictor(model_type=chosen_model, params=chosen_params)
+            load_or_train(predictor, load_features(), retrain=options['retrain'])
+
+            # one pass over the standings and one call per model for the whole grid
+            upcoming = load_features(upcoming=True)
+            predictions = predictor.predict_many(features=upcoming)
+
+            # every row of a run shares its timestamp, the Last-Modified of the cached API response
+            generated_at = timezone.now().isoformat()
+
+            # written in one transaction, so the API never serves part of a run
+            with transaction.atomic():
+                for driver in Driver.objects.all():
+                    pred = predictions.get(driver.driver_number)
+                    if pred:
+                        prediction_obj, created = Prediction.objects.update_or_create(
+                            driver_number=driver.driver_number,
+                            defaults={
+                                'predicted_position': pred['predicted_position'],
+                                'predicted_points_gain': pred['predicted_points_gain'],
+                                'predicted_total_points': pred['predicted_total_points'],
+                                'current_position': pred['current_position'],
+                                'current_points': pred['current_points'],
+                                'confidence': pred['confidence'],
+                                'generated_at': generated_at,
+                                'model_type': chosen_model
+                            }
+                        )
+                        action = f'Created prediction for driver #{driver.driver_number}' if created else f'Updated prediction for driver #{driver.driver_number}'
+                        logger.info(action)
+
+                    else:
+                        logger.error(f"Error predicting for driver #{driver.driver_number}")
+
+            if predictions:
+                rounds_remaining = season_length(standings['season'].max()) - int(upcoming['round'].max()) + 1
+                self.save_championship(predictions, rounds_remaining, predictor.residual_std['points'])
 
         except Exception as e:
             logger.error(f"Error getting predictions: {e}")
             return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    def save_championship(self, predictions, rounds_remaining, std, simulations=100_000):
+        """
+        Simulate the rest of the season from the predictions and replace the stored probabilities
+        :param predictions: dict returned by Predictor.predict_many
+        :param rounds_remaining: rounds left in the season
+        :param std: spread of the points model's errors
+        :param simulations: simulated seasons
+        :return:
+        """
+
+        drivers = sorted(predictions)
+        current_points = [predictions[driver]['current_points'] for driver in drivers]
+        result = simulate_championship(
+            current_points,
+            [predictions[driver]['predicted_points_gain'] for driver in drivers],
+            std,
+            rounds_remaining,
+            simulations=simulations,
+        )
+
+        generated_at = timezone.now().isoformat()
+        with transaction.atomic():
+            ChampionshipProbability.objects.all().delete()
+            ChampionshipProbability.objects.bulk_create([
+                ChampionshipProbability(
+                    driver_number=driver,
+                    title_probability=result['title_probability'][i],
+                    podium_probability=result['podium_probability'][i],
+                    expected_points=result['expected_points'][i],
+                    current_points=current_points[i],
+                    rounds_remaining=max(rounds_remaining, 0),
+                    simulations=simulations,
+                    generated_at=generated_at,
+                )
+                for i, driver in enumerate(drivers)
+            ])
+
+        logger.info(f"Simulated {simulations} seasons over {rounds_remaining} remaining rounds")
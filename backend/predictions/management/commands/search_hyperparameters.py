@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+import logging
+from predictions.feature_store import load_features, sync_feature_store
+from predictions.loaders import load_standings
+from predictions.search import SEARCH_SPACE, save_best_params, successive_halving
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """Management command for searching model hyperparameters"""
+    help = 'Search hyperparameters with successive halving and save the winner for run_predictions.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--model-types', nargs='+', choices=list(SEARCH_SPACE), default=list(SEARCH_SPACE))
+        parser.add_argument('--budget', type=float, default=120, help='Wall-clock budget in seconds')
+        parser.add_argument('--candidates', type=int, default=16, help='Configurations per model type')
+        parser.add_argument('--folds', type=int, default=3)
+        parser.add_argument('--workers', type=int, default=None)
+
+    def handle(self, *args, **options):
+        try:
+            sync_feature_store(load_standings())
+
+            result = successive_halving(
+                load_features(),
+                model_types=options['model_types'],
+                candidates=options['candidates'],
+                folds=options['folds'],
+                budget=options['budget'],
+                workers=options['workers'],
+            )
+            save_best_params(result)
+
+            self.stdout.write(self.style.SUCCESS(
+                f"Best {result['model_type']} configuration scored {result['score']:.4f}: {result['params']}"
+            ))
+
+        except Exception as e:
+            raise CommandError(f"Command failed: {e}")
@@ -0,0 +1,51 @@
+# Generated by Django 5.2.4 on 2026-10-18 10:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('predictions', '0002_prediction_generated_at_prediction_model_type'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeatureRow',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('season', models.CharField(max_length=5)),
+                ('round', models.IntegerField()),
+                ('driver_number', models.IntegerField()),
+                ('source_position', models.IntegerField(null=True)),
+                ('source_points', models.IntegerField(null=True)),
+                ('source_wins', models.IntegerField(null=True)),
+                ('target_position', models.FloatField(null=True)),
+                ('target_points_gained', models.FloatField(null=True)),
+                ('last_position', models.FloatField()),
+                ('last_2_avg_position', models.FloatField()),
+                ('last_3_avg_position', models.FloatField()),
+                ('last_5_avg_position', models.FloatField()),
+                ('position_trend_3_races', models.FloatField()),
+                ('points_trend_3_races', models.FloatField()),
+                ('position_std_3_races', models.FloatField()),
+                ('position_std_5_races', models.FloatField()),
+                ('current_championship_position', models.FloatField()),
+                ('current_points', models.FloatField()),
+                ('current_wins', models.FloatField()),
+                ('season_progress', models.FloatField()),
+                ('recent_wins', models.FloatField()),
+                ('races_since_last_win', models.FloatField()),
+                ('points_per_race_avg', models.FloatField()),
+                ('points_per_race_recent', models.FloatField()),
+                ('position_change_last_race', models.FloatField()),
+                ('best_position_last_5', models.FloatField()),
+                ('worst_position_last_5', models.FloatField()),
+            ],
+            options={
+                'verbose_name_plural': 'Feature rows',
+                'ordering': ['driver_number', 'season', 'round'],
+                'constraints': [models.UniqueConstraint(fields=('season', 'round', 'driver_number'), name='unique_feature_row')],
+            },
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.4 on 2026-10-18 10:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('predictions', '0003_featurerow'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChampionshipProbability',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('driver_number', models.IntegerField()),
+                ('title_probability', models.FloatField()),
+                ('podium_probability', models.FloatField()),
+                ('expected_points', models.FloatField()),
+                ('current_points', models.IntegerField()),
+                ('rounds_remaining', models.IntegerField()),
+                ('simulations', models.IntegerField()),
+                ('generated_at', models.TextField()),
+            ],
+            options={
+                'verbose_name_plural': 'Championship probabilities',
+                'ordering': ['-title_probability', '-podium_probability', 'driver_number'],
+            },
+        ),
+    ]
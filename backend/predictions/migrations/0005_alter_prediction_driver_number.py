@@ -0,0 +1,28 @@
+# Generated by Django 5.2.4 on 2026-10-18 10:27
+
+from django.db import migrations, models
+from django.db.models import Max
+
+
+def delete_duplicates(apps, schema_editor):
+    """Keep only the most recently created prediction of every driver"""
+
+    Prediction = apps.get_model('predictions', 'Prediction')
+    keep = Prediction.objects.values('driver_number').annotate(keep_id=Max('id')).values('keep_id')
+    Prediction.objects.exclude(id__in=keep).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('predictions', '0004_championshipprobability'),
+    ]
+
+    operations = [
+        migrations.RunPython(delete_duplicates, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='prediction',
+            name='driver_number',
+            field=models.IntegerField(unique=True),
+        ),
+    ]
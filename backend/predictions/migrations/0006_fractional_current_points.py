@@ -0,0 +1,28 @@
+# Generated by Django 5.2.4 on 2026-10-18 11:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('predictions', '0005_alter_prediction_driver_number'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='championshipprobability',
+            name='current_points',
+            field=models.FloatField(),
+        ),
+        migrations.AlterField(
+            model_name='featurerow',
+            name='source_points',
+            field=models.FloatField(null=True),
+        ),
+        migrations.AlterField(
+            model_name='prediction',
+            name='current_points',
+            field=models.FloatField(),
+        ),
+    ]
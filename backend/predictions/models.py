@@ -2,12 +2,12 @@ from django.db import models
 
 class Prediction(models.Model):
     """Model to store current predictions for each driver"""
-    driver_number = models.IntegerField()
+    driver_number = models.IntegerField(unique=True)
     predicted_position = models.FloatField()
     predicted_points_gain = models.FloatField()
     predicted_total_points = models.FloatField()
     current_position = models.IntegerField()
-    current_points = models.IntegerField()
+    current_points = models.FloatField()
     confidence = models.FloatField()
     generated_at = models.TextField(default='2025-09-24')
     model_type = models.TextField(default='xgboost')
@@ -18,3 +18,67 @@ class Prediction(models.Model):
 
     def __str__(self):
         return f'Predicted: {self.predicted_position} for driver #{self.driver_number}'
+
+
+class ChampionshipProbability(models.Model):
+    """Model to store each driver's simulated chances in the current championship"""
+    driver_number = models.IntegerField()
+    title_probability = models.FloatField()
+    podium_probability = models.FloatField()
+    expected_points = models.FloatField()
+    current_points = models.FloatField()
+    rounds_remaining = models.IntegerField()
+    simulations = models.IntegerField()
+    generated_at = models.TextField()
+
+    class Meta:
+        ordering = ['-title_probability', '-podium_probability', 'driver_number']
+        verbose_name_plural = 'Championship probabilities'
+
+    def __str__(self):
+        return f'Title chance: {self.title_probability:.1%} for driver #{self.driver_number}'
+
+
+class FeatureRow(models.Model):
+    """Model to store the engineered features of a driver going into a round"""
+    season = models.CharField(max_length=5)
+    round = models.IntegerField()
+    driver_number = models.IntegerField()
+
+    # standing of the round itself, empty while the round is still upcoming
+    source_position = models.IntegerField(null=True)
+    source_points = models.FloatField(null=True)
+    source_wins = models.IntegerField(null=True)
+
+    target_position = models.FloatField(null=True)
+    target_points_gained = models.FloatField(null=True)
+
+    last_position = models.FloatField()
+    last_2_avg_position = models.FloatField()
+    last_3_avg_position = models.FloatField()
+    last_5_avg_position = models.FloatField()
+    position_trend_3_races = models.FloatField()
+    points_trend_3_races = models.FloatField()
+    position_std_3_races = models.FloatField()
+    position_std_5_races = models.FloatField()
+    current_championship_position = models.FloatField()
+    current_points = models.FloatField()
+    current_wins = models.FloatField()
+    season_progress = models.FloatField()
+    recent_wins = models.FloatField()
+    races_since_last_win = models.FloatField()
+    points_per_race_avg = models.FloatField()
+    points_per_race_recent = models.FloatField()
+    position_change_last_race = models.FloatField()
+    best_position_last_5 = models.FloatField()
+    worst_position_last_5 = models.FloatField()
+
+    class Meta:
+        ordering = ['driver_number', 'season', 'round']
+        verbose_name_plural = 'Feature rows'
+        constraints = [
+            models.UniqueConstraint(fields=['season', 'round', 'driver_number'], name='unique_feature_row'),
+        ]
+
+    def __str__(self):
+        return f'Features for driver #{self.driver_number} in {self.season} round {self.round}'
@@ -0,0 +1,219 @@
+import json
+import logging
+import math
+import os
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime
+
+from django.conf import settings
+from sklearn.metrics import mean_absolute_error
+from sklearn.model_selection import KFold
+
+from .features import TARGET_COLUMNS
+from .utils import DEFAULT_PARAMS, Predictor
+
+logger = logging.getLogger(__name__)
+
+# Values sampled for each hyperparameter, n_estimators is the resource halving grows instead
+SEARCH_SPACE = {
+    'random_forest': {
+        'max_depth': [6, 8, 10, 12, None],
+        'min_samples_leaf': [1, 2, 4, 8],
+        'max_features': [1.0, 0.7, 0.5, 'sqrt'],
+    },
+    'xgboost': {
+        'max_depth': [3, 4, 6, 8],
+        'learning_rate': [0.03, 0.05, 0.1, 0.2],
+        'subsample': [0.7, 0.85, 1.0],
+        'colsample_bytree': [0.6, 0.8, 1.0],
+        'min_child_weight': [1, 3, 5],
+    },
+}
+
+# Training data shared by every evaluation in a worker process, set once by _init_worker
+_data = {}
+
+
+def _stop_workers(executor, terminate):
+    """
+    Shut the search's process pool down without waiting for it
+    :param executor: ProcessPoolExecutor
+    :param terminate: also kill fits still running, which shutdown alone leaves to finish
+    :return:
+    """
+
+    # the pool forgets its processes on shutdown
+    processes = list((executor._processes or {}).values())
+    executor.shutdown(wait=False, cancel_futures=True)
+
+    if terminate:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.join()
+
+
+def sample_candidates(model_type, count, seed=42):
+    """
+    Draw distinct configurations from the search space, starting with the defaults
+    :param model_type:
+    :param count:
+    :param seed:
+    :return: list of params dicts without n_estimators
+    """
+
+    rng = random.Random(seed)
+    space = SEARCH_SPACE[model_type]
+    defaults = {name: value for name, value in DEFAULT_PARAMS[model_type].items() if name != 'n_estimators'}
+
+    candidates = [defaults]
+    for _ in range(count * 20):
+        if len(candidates) >= count:
+            break
+
+        candidate = {**defaults, **{name: rng.choice(values) for name, values in space.items()}}
+        if candidate not in candidates:
+            candidates.append(candidate)
+
+    return candidates
+
+
+def _init_worker(X, y_position, y_points, folds):
+    _data.update(X=X, y_position=y_position, y_points=y_points, folds=folds)
+
+
+def _evaluate(model_type, params):
+    """
+    Cross-validated score of one configuration on the worker's shared data.
+    Each target's MAE is divided by that target's spread so positions and points weigh the same.
+    :param model_type:
+    :param params:
+    :return: mean normalised MAE over folds and targets, lower is better
+    """
+
+    predictor = Predictor(model_type, params=params)
+    X = _data['X']
+    scores = []
+
+    for train_index, test_index in _data['folds']:
+        for y in (_data['y_position'], _data['y_points']):
+            model = predictor._build_model(n_jobs=1)
+            model.fit(X[train_index], y[train_index])
+            scores.append(mean_absolute_error(y[test_index], model.predict(X[test_index])) / (y.std() or 1))
+
+    return sum(scores) / len(scores)
+
+
+def successive_halving(features, model_types=('random_forest', 'xgboost'), candidates=16, eta=3,
+                       min_estimators=25, max_estimators=400, folds=3, budget=120, workers=None, seed=42):
+    """
+    Search hyperparameters with successive halving within a wall-clock budget.
+    Every rung scores the surviving configurations with cross-validation, keeps the best
+    1 / eta of them and gives those eta times more trees. Features are computed once by
+    the caller and sent once to each worker process, so folds never recompute them.
+    :param features: training feature rows, as from Predictor.prepare_features
+    :param model_types: model types to search
+    :param candidates: configurations sampled per model type
+    :param eta: halving rate
+    :param min_estimators: trees given to every configuration in the first rung
+    :param max_estimators: trees given in the last rung
+    :param folds: cross-validation folds
+    :param budget: wall-clock budget in seconds
+    :param workers: worker processes, one per cpu if None
+    :param seed:
+    :return: dict with the winning model_type, params and score
+    """
+
+    features = features.dropna(subset=TARGET_COLUMNS)
+    X = features.drop(columns=TARGET_COLUMNS).to_numpy(dtype=float)
+    y_position = features['target_position'].to_numpy(dtype=float)
+    y_points = features['target_points_gained'].to_numpy(dtype=float)
+    fold_indices = list(KFold(n_splits=folds, shuffle=True, random_state=seed).split(X))
+
+    configs = [
+        (model_type, params)
+        for model_type in model_types
+        for params in sample_candidates(model_type, candidates, seed)
+    ]
+
+    deadline = time.monotonic() + budget
+    executor = ProcessPoolExecutor(
+        max_workers=workers or os.cpu_count(),
+        initializer=_init_worker,
+        initargs=(X, y_position, y_points, fold_indices),
+    )
+
+    best = None
+    n_estimators = min_estimators
+    pending = {}
+
+    try:
+        while configs:
+            pending = {
+                executor.submit(_evaluate, model_type, {**params, 'n_estimators': n_estimators}): (model_type, params)
+                for model_type, params in configs
+            }
+            scored = []
+
+            while pending and time.monotonic() < deadline:
+                done, _ = wait(pending, timeout=deadline - time.monotonic(), return_when=FIRST_COMPLETED)
+                for future in done:
+                    scored.append((future.result(), pending.pop(future)))
+
+            if not scored:
+                break
+
+            scored.sort(key=lambda item: item[0])
+            score, (model_type, params) = scored[0]
+
+            # a partly finished rung only replaces the winner of a completed one if it beats it
+            if best is None or not pending or score < best['score']:
+                best = {'model_type': model_type, 'params': {**params, 'n_estimators': n_estimators}, 'score': score}
+
+            logger.info(f"Rung with {n_estimators} trees: scored {len(scored)} configurations, best {score:.4f}")
+
+            if pending or len(scored) == 1 or n_estimators >= max_estimators:
+                break
+
+            configs = [config for _, config in scored[:math.ceil(len(scored) / eta)]]
+            n_estimators = min(n_estimators * eta, max_estimators)
+
+    finally:
+        # fits still running past the deadline would otherwise hold the interpreter at exit
+        _stop_workers(executor, terminate=bool(pending))
+
+    if best is None:
+        raise ValueError("Search budget ran out before any configuration was scored.")
+
+    return best
+
+
+def best_params_path():
+    return settings.MODEL_ARTIFACT_DIR / 'best_params.json'
+
+
+def save_best_params(result):
+    """
+    Save the winning configuration of a search for run_predictions
+    :param result: dict returned by successive_halving
+    :return:
+    """
+
+    path = best_params_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({**result, 'searched_at': datetime.now().isoformat()}, indent=2))
+
+
+def load_best_params():
+    """
+    Winning configuration of the last search
+    :return: dict with model_type and params, or None if no search was saved
+    """
+
+    path = best_params_path()
+    if not path.exists():
+        return None
+
+    return json.loads(path.read_text())
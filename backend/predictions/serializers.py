@@ -1,7 +1,29 @@
 from rest_framework import serializers
-from predictions.models import Prediction
+from predictions.models import Prediction, ChampionshipProbability
 
 class PredictionSerializer(serializers.ModelSerializer):
     class Meta:
         model = Prediction
-        fields = '__all__'
\ No newline at end of file
+        fields = '__all__'
+
+class ChampionshipProbabilitySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ChampionshipProbability
+        fields = '__all__'
+
+class WhatIfResultSerializer(serializers.Serializer):
+    driver_number = serializers.IntegerField()
+    position = serializers.IntegerField(min_value=1)
+    points = serializers.FloatField(min_value=0, required=False)
+
+class WhatIfSerializer(serializers.Serializer):
+    """Hypothetical results of the next race, drivers left out finish without points"""
+    results = WhatIfResultSerializer(many=True, allow_empty=False)
+
+    def validate_results(self, results):
+        for field in ('driver_number', 'position'):
+            values = [result[field] for result in results]
+            if len(values) != len(set(values)):
+                raise serializers.ValidationError(f"Each {field} can only appear once")
+
+        return results
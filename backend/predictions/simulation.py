@@ -0,0 +1,74 @@
+import numpy as np
+from scipy.special import ndtr
+
+# Simulated seasons held in memory at once
+CHUNK_SIZE = 100_000
+
+
+def clipped_normal_moments(mean, std):
+    """
+    Mean and variance of max(0, X) for X ~ N(mean, std), the points of one round
+    :param mean:
+    :param std:
+    :return: tuple of arrays
+    """
+
+    a = mean / std
+    cdf = ndtr(a)
+    pdf = np.exp(-a ** 2 / 2) / np.sqrt(2 * np.pi)
+
+    first = mean * cdf + std * pdf
+    second = (mean ** 2 + std ** 2) * cdf + mean * std * pdf
+    return first, np.maximum(second - first ** 2, 0)
+
+
+def simulate_championship(current_points, expected_gain, std, rounds_remaining, simulations=100_000, seed=None):
+    """
+    Monte Carlo simulation of the rest of the championship.
+    Each driver scores max(0, N(expected_gain, std)) points in every remaining round. The
+    rounds are independent, so their sum is drawn in one go from a normal with the same
+    mean and variance, one draw per driver per simulated season.
+    :param current_points: points of every driver so far
+    :param expected_gain: predicted points per round of every driver
+    :param std: spread of the points per round, e.g. the points model's residual std
+    :param rounds_remaining: rounds left in the season
+    :param simulations: simulated seasons
+    :param seed:
+    :return: dict of per-driver arrays: title_probability, podium_probability, expected_points
+    """
+
+    current_points = np.asarray(current_points, dtype=float)
+    expected_gain = np.maximum(np.asarray(expected_gain, dtype=float), 0)
+    drivers = len(current_points)
+
+    if rounds_remaining <= 0 or std <= 0:
+        mean, variance = expected_gain * max(rounds_remaining, 0), np.zeros(drivers)
+    else:
+        round_mean, round_variance = clipped_normal_moments(expected_gain, std)
+        mean, variance = round_mean * rounds_remaining, round_variance * rounds_remaining
+
+    rng = np.random.default_rng(seed)
+    titles = np.zeros(drivers)
+    podiums = np.zeros(drivers)
+    podium_size = min(3, drivers)
+
+    for start in range(0, simulations, CHUNK_SIZE):
+        size = min(CHUNK_SIZE, simulations - start)
+
+        totals = rng.standard_normal((size, drivers), dtype=np.float32)
+        totals *= np.sqrt(variance, dtype=np.float32)
+        totals += (current_points + mean).astype(np.float32)
+        np.maximum(totals, current_points.astype(np.float32), out=totals)
+
+        titles += np.bincount(totals.argmax(axis=1), minlength=drivers)
+        if podium_size < drivers:
+            podium = np.argpartition(-totals, podium_size - 1, axis=1)[:, :podium_size]
+            podiums += np.bincount(podium.ravel(), minlength=drivers)
+        else:
+            podiums += size
+
+    return {
+        'title_probability': titles / simulations,
+        'podium_probability': podiums / simulations,
+        'expected_points': current_points + mean,
+    }
@@ -1,3 +1,548 @@
-from django.test import TestCase
+import multiprocessing
+import tempfile
+import threading
+import time
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+import numpy as np
+import pandas as pd
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from benchmarks.synthetic import generate_standings
+from .artifacts import load_or_train
+from .feature_store import load_features, sync_feature_store
+from drivers.models import DriverStanding, Meeting
+from drivers.tests import QueryPlanMixin
+from .features import TARGET_COLUMNS, lagged, next_round_features, rolling_slope
+from .loaders import load_standings, season_length
+from .models import ChampionshipProbability, FeatureRow, Prediction
+from .search import load_best_params, sample_candidates, save_best_params, successive_halving
+from .simulation import simulate_championship
+from .utils import Predictor
+from . import whatif
+from .whatif import MicroBatcher, WarmPredictor, apply_results, scenario_features
+
+
+class PrepareFeaturesTests(SimpleTestCase):
+    """The vectorized feature engine must reproduce the per-row loop exactly"""
+
+    def setUp(self):
+        self.predictor = Predictor()
+
+    def assert_same_features(self, df):
+        expected = self.predictor._prepare_features_iterative(df)
+        actual = self.predictor.prepare_features(df)
+        pd.testing.assert_frame_equal(actual, expected)
+
+    def test_matches_iterative_on_full_season(self):
+        for seed in range(3):
+            df = pd.DataFrame(generate_standings(drivers=20, rounds=24, seed=seed))
+            self.assert_same_features(df.sample(frac=1, random_state=seed))
+
+    def test_matches_iterative_on_irregular_history(self):
+        # missed rounds, a single-round driver and a win count that goes down
+        df = pd.DataFrame({
+            'driver_number': [1, 1, 1, 1, 1, 1, 2, 2, 3],
+            'round': [1, 2, 3, 5, 6, 7, 1, 2, 1],
+            'position': [3, 1, 2, 5, 4, 1, 2, 2, 7],
+            'points': [5, 30, 40, 41, 60, 85, 1, 2, 0],
+            'wins': [0, 1, 1, 0, 1, 2, 0, 0, 0],
+        })
+        self.assert_same_features(df)
+
+    def test_history_does_not_cross_seasons(self):
+        df = pd.DataFrame(generate_standings(drivers=4, rounds=5, seasons=2))
+        features = self.predictor.prepare_features(df)
+
+        self.assertEqual(len(features), 4 * 2 * 4)
+        self.assertEqual(features['round'].min(), 2)
+
+
+class RollingSlopeTests(SimpleTestCase):
+    """The closed-form slope must match np.polyfit over the same window"""
+
+    def test_matches_polyfit(self):
+        values = np.random.default_rng(0).integers(0, 26, 12).astype(float)
+        offsets = np.arange(len(values))
+
+        for window in (2, 3, 5):
+            slopes = rolling_slope(lagged(values, offsets, window), offsets, window)
+
+            for history, slope in enumerate(slopes):
+                recent = values[max(0, history - window):history]
+                expected = np.polyfit(np.arange(len(recent)), recent, 1)[0] if len(recent) >= 2 else 0
+                self.assertAlmostEqual(slope, expected, places=10)
+
+    def test_short_windows(self):
+        # the per-row reference of Predictor fits np.polyfit, independently of the kernel
+        values = np.array([1.0, 7.0, 4.0, 2.0])
+        offsets = np.arange(len(values) + 1)
+        slopes = rolling_slope(lagged(np.append(values, np.nan), offsets, 3), offsets, 3)
+
+        for history, slope in enumerate(slopes):
+            self.assertAlmostEqual(slope, Predictor()._calculate_trend(values[:history], window=3), places=10)
+
+
+class CountingModel:
+    """Stand-in regressor that records how many times it is called"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def predict(self, X):
+        self.calls += 1
+        return np.asarray(X['last_position'], dtype=float)
+
+
+class PredictManyTests(SimpleTestCase):
+    def setUp(self):
+        self.standings = generate_standings(drivers=20, rounds=10)
+        self.predictor = Predictor()
+        self.predictor.position_model = CountingModel()
+        self.predictor.points_model = CountingModel()
+        self.predictor.feature_names = [
+            col for col in self.predictor.prepare_features(pd.DataFrame(self.standings)).columns
+            if col not in TARGET_COLUMNS
+        ]
+
+    def test_next_round_features_match_training_rows(self):
+        df = pd.DataFrame(self.standings)
+        training = self.predictor.prepare_features(df)
+        expected = training[training['round'] == 10].drop(columns=TARGET_COLUMNS).reset_index(drop=True)
+
+        actual = next_round_features(df[df['round'] < 10]).drop(columns=TARGET_COLUMNS)
+        pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+
+    def test_whole_grid_uses_one_call_per_model(self):
+        predictions = self.predictor.predict_many(self.standings)
+
+        self.assertEqual(len(predictions), 20)
+        self.assertEqual(self.predictor.position_model.calls, 1)
+        self.assertEqual(self.predictor.points_model.calls, 1)
+
+    def test_predict_matches_predict_many(self):
+        predictions = self.predictor.predict_many(self.standings)
+
+        for driver_number in (1, 44, 81):
+            self.assertEqual(self.predictor.predict(self.standings, driver_number), predictions[driver_number])
+        self.assertIsNone(self.predictor.predict(self.standings, 99))
+
+
+class TrainTests(SimpleTestCase):
+    def test_models_share_thread_budget_and_report_timings(self):
+        predictor = Predictor('random_forest', params={'n_estimators': 5}, n_jobs=4)
+        result = predictor.train(generate_standings(drivers=6, rounds=8))
+
+        self.assertEqual(predictor.position_model.n_jobs, 2)
+        self.assertEqual(predictor.points_model.n_jobs, 2)
+        self.assertLessEqual(
+            {'features', 'scaling', 'position_model', 'points_model', 'fit', 'evaluation', 'total'},
+            set(result['timings'])
+        )
+
+
+class FeatureStoreTests(TestCase):
+    def setUp(self):
+        self.standings = generate_standings(drivers=4, rounds=6, seasons=2)
+        self.predictor = Predictor()
+
+    def test_store_matches_prepare_features(self):
+        sync_feature_store(self.standings)
+        df = pd.DataFrame(self.standings)
+
+        pd.testing.assert_frame_equal(
+            load_features(), self.predictor.prepare_features(df), check_dtype=False
+        )
+        pd.testing.assert_frame_equal(
+            load_features(upcoming=True).drop(columns=TARGET_COLUMNS),
+            next_round_features(df).drop(columns=TARGET_COLUMNS),
+            check_dtype=False,
+        )
+
+    def test_new_round_only_computes_affected_rows(self):
+        latest_round = [row for row in self.standings if row['season'] == '2026' and row['round'] == 6]
+        sync_feature_store([row for row in self.standings if row not in latest_round])
+
+        # one finished round and one new upcoming round per driver
+        self.assertEqual(sync_feature_store(self.standings), {'computed': 8, 'deleted': 0})
+        self.assertEqual(sync_feature_store(self.standings), {'computed': 0, 'deleted': 0})
+        self.assertEqual(FeatureRow.objects.count(), 4 * 5 * 2 + 4)
+
+    def test_corrected_standing_recomputes_later_rounds(self):
+        sync_feature_store(self.standings)
+
+        corrected = [dict(row) for row in self.standings]
+        for row in corrected:
+            if row['season'] == '2025' and row['driver_number'] == 1 and row['round'] >= 4:
+                row['points'] += 1
+
+        # rounds 4-6 of one driver season
+        self.assertEqual(sync_feature_store(corrected)['computed'], 3)
+        pd.testing.assert_frame_equal(
+            load_features(), self.predictor.prepare_features(pd.DataFrame(corrected)), check_dtype=False
+        )
+
+
+class LoadStandingsTests(TestCase):
+    def setUp(self):
+        self.standings = generate_standings(drivers=4, rounds=5, seasons=2)
+        DriverStanding.objects.bulk_create(DriverStanding(**row) for row in self.standings)
+
+    def test_loads_typed_columns(self):
+        standings = load_standings(chunk_size=7)
+
+        self.assertEqual(len(standings['round']), len(self.standings))
+        self.assertEqual(standings['points'].dtype, np.float64)
+        self.assertEqual(set(standings['season']), {'2025', '2026'})
+
+    def test_season_filter(self):
+        standings = load_standings(seasons=[2026])
+
+        self.assertEqual(len(standings['round']), 4 * 5)
+        self.assertEqual(set(standings['season']), {'2026'})
+        self.assertEqual(len(load_standings(seasons=[1950])['round']), 0)
+
+    def test_predictor_accepts_loaded_standings(self):
+        standings = load_standings()
+        expected = Predictor().prepare_features(pd.DataFrame(self.standings))
+
+        pd.testing.assert_frame_equal(
+            Predictor().prepare_features(pd.DataFrame(standings)), expected, check_dtype=False
+        )
+
+    def test_season_length_from_stored_calendar(self):
+        for i, name in enumerate(['Pre-Season Testing', 'Australian Grand Prix', 'Chinese Grand Prix']):
+            Meeting.objects.create(
+                circuit_key=i, circuit_short_name=name, country_code='XX', country_key=i,
+                date_start=f'2025-03-0{i + 1}T04:00:00+00:00', gmt_offset='00:00:00', location=name,
+                meeting_key=1250 + i, meeting_name=name, meeting_official_name=name, year=2025,
+            )
+
+        self.assertEqual(season_length('2025'), 2)
+
+        self.assertEqual(season_length('2026'), 23)
+
+
+class TemporaryArtifactDirMixin:
+    """Point MODEL_ARTIFACT_DIR at a temporary folder for each test"""
+
+    def setUp(self):
+        folder = tempfile.TemporaryDirectory()
+        self.addCleanup(folder.cleanup)
+        self.settings_override = override_settings(MODEL_ARTIFACT_DIR=Path(folder.name))
+        self.settings_override.enable()
+        self.addCleanup(self.settings_override.disable)
+
+
+class ArtifactTests(TemporaryArtifactDirMixin, SimpleTestCase):
+    def setUp(self):
+        super().setUp()
+        self.features = Predictor().prepare_features(pd.DataFrame(generate_standings(drivers=6, rounds=8)))
+
+    def test_unchanged_data_loads_saved_models(self):
+        trained = Predictor('xgboost', params={'n_estimators': 5})
+        self.assertFalse(load_or_train(trained, self.features)['cached'])
+
+        loaded = Predictor('xgboost', params={'n_estimators': 5})
+        self.assertTrue(load_or_train(loaded, self.features)['cached'])
+        self.assertEqual(loaded.feature_names, trained.feature_names)
+
+        upcoming = next_round_features(pd.DataFrame(generate_standings(drivers=6, rounds=8)))
+        self.assertEqual(loaded.predict_many(features=upcoming), trained.predict_many(features=upcoming))
+
+    def test_changed_data_or_params_retrain(self):
+        load_or_train(Predictor('xgboost', params={'n_estimators': 5}), self.features)
+
+        changed = self.features.copy()
+        changed.loc[0, 'target_position'] += 1
+
+        self.assertFalse(load_or_train(Predictor('xgboost', params={'n_estimators': 5}), changed)['cached'])
+        self.assertFalse(load_or_train(Predictor('xgboost', params={'n_estimators': 6}), self.features)['cached'])
+
+
+class SearchTests(TemporaryArtifactDirMixin, SimpleTestCase):
+    def test_candidates_start_with_defaults(self):
+        candidates = sample_candidates('xgboost', 5)
+
+        self.assertEqual(len(candidates), 5)
+        self.assertEqual(candidates[0]['max_depth'], 6)
+        self.assertNotIn('n_estimators', candidates[0])
+
+    def test_search_saves_winner(self):
+        features = Predictor().prepare_features(pd.DataFrame(generate_standings(drivers=6, rounds=8)))
+        result = successive_halving(
+            features, candidates=3, min_estimators=3, max_estimators=9, folds=2, budget=60, workers=1
+        )
+        save_best_params(result)
+
+        self.assertIn(result['model_type'], ('random_forest', 'xgboost'))
+        self.assertEqual(result['params']['n_estimators'], 9)
+        self.assertEqual(load_best_params()['params'], result['params'])
+
+    def test_search_stops_at_budget(self):
+        features = Predictor().prepare_features(pd.DataFrame(generate_standings(drivers=6, rounds=8)))
+
+        # fits of 2000 trees outlast the budget, the ones running when it ends are killed
+        start = time.monotonic()
+        try:
+            successive_halving(
+                features, model_types=('random_forest',), candidates=4, min_estimators=2000,
+                max_estimators=2000, folds=2, budget=1, workers=2,
+            )
+        except ValueError:
+            pass
+
+        self.assertLess(time.monotonic() - start, 5)
+        self.assertEqual(multiprocessing.active_children(), [])
+
+
+class ChampionshipSimulationTests(SimpleTestCase):
+    def test_probabilities_are_consistent(self):
+        result = simulate_championship([100, 90, 80, 40, 10], [15, 15, 15, 10, 1], 8, 5, seed=0)
+
+        self.assertAlmostEqual(result['title_probability'].sum(), 1)
+        self.assertAlmostEqual(result['podium_probability'].sum(), 3)
+        self.assertTrue((result['podium_probability'] >= result['title_probability']).all())
+        self.assertEqual(result['title_probability'][4], 0)
+
+    def test_decided_championship(self):
+        result = simulate_championship([300, 100, 90], [10, 10, 10], 8, 0, simulations=1000, seed=0)
+
+        self.assertEqual(result['title_probability'].tolist(), [1, 0, 0])
+        self.assertEqual(result['expected_points'].tolist(), [300, 100, 90])
+
+    def test_simulations_are_reproducible(self):
+        first = simulate_championship([50, 48, 45], [12, 12, 12], 8, 10, simulations=250_000, seed=1)
+        second = simulate_championship([50, 48, 45], [12, 12, 12], 8, 10, simulations=250_000, seed=1)
+
+        np.testing.assert_array_equal(first['title_probability'], second['title_probability'])
+        self.assertGreater(first['title_probability'][0], first['title_probability'][2])
+
+
+class ChampionshipViewTests(TestCase):
+    def test_lists_probabilities(self):
+        for driver_number, title_probability in ((1, 0.2), (4, 0.8)):
+            ChampionshipProbability.objects.create(
+                driver_number=driver_number, title_probability=title_probability, podium_probability=1,
+                expected_points=100, current_points=90, rounds_remaining=2, simulations=1000,
+                generated_at='2025-09-24T10:00:00',
+            )
+
+        response = self.client.get('/predictions/championship/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row['driver_number'] for row in response.json()['probabilities']], [4, 1])
+        self.assertEqual(response.json()['simulations'], 1000)
+
+    def test_no_simulation(self):
+        self.assertEqual(self.client.get('/predictions/championship/').status_code, 404)
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class PredictionViewTests(QueryPlanMixin, TestCase):
+    def setUp(self):
+        cache.clear()
+        for driver_number in (1, 4):
+            self.create_prediction(driver_number, '2025-09-24T10:00:00')
+
+    def create_prediction(self, driver_number, generated_at, points_gain=20):
+        # the cache is invalidated when the write commits
+        with self.captureOnCommitCallbacks(execute=True):
+            Prediction.objects.update_or_create(driver_number=driver_number, defaults={
+                'predicted_position': 1.5, 'predicted_points_gain': points_gain, 'predicted_total_points': 300,
+                'current_position': 1, 'current_points': 280, 'confidence': 0.8,
+                'generated_at': generated_at, 'model_type': 'xgboost',
+            })
+
+    def test_sends_validators(self):
+        response = self.client.get('/predictions/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['ETag'])
+        self.assertEqual(response['Last-Modified'], 'Wed, 24 Sep 2025 10:00:00 GMT')
+        self.assertEqual(len(response.json()['predictions']), 2)
+
+    def test_aware_run_timestamp(self):
+        # run_predictions stamps runs with timezone.now(), in UTC or with its offset
+        for driver_number in (1, 4):
+            self.create_prediction(driver_number, '2025-09-24T12:00:00+02:00')
+
+        self.assertEqual(self.client.get('/predictions/')['Last-Modified'], 'Wed, 24 Sep 2025 10:00:00 GMT')
+
+    def test_conditional_requests_get_not_modified(self):
+        etag = self.client.get('/predictions/')['ETag']
+
+        self.assertEqual(self.client.get('/predictions/', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.assertEqual(
+            self.client.get('/predictions/', HTTP_IF_MODIFIED_SINCE='Wed, 24 Sep 2025 10:00:00 GMT').status_code, 304
+        )
+
+    def test_steady_state_skips_database(self):
+        self.client.get('/predictions/')
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get('/predictions/').status_code, 200)
+
+    def test_new_run_invalidates_cache(self):
+        etag = self.client.get('/predictions/')['ETag']
+        self.create_prediction(1, '2025-09-25T10:00:00')
+
+        response = self.client.get('/predictions/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_etag_follows_the_body(self):
+        etag = self.client.get('/predictions/')['ETag']
+
+        # same run timestamp, different rows
+        self.create_prediction(1, '2025-09-24T10:00:00', points_gain=25)
+
+        self.assertNotEqual(self.client.get('/predictions/')['ETag'], etag)
+
+    def test_uncommitted_writes_keep_the_cache(self):
+        self.client.get('/predictions/')
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            Prediction.objects.get(driver_number=1).save()
+
+        with self.assertNumQueries(0):
+            self.client.get('/predictions/')
+        self.assertEqual(len(callbacks), 1)
+
+    def test_reads_through_indexes(self):
+        self.assert_get_indexed('/predictions/')
+        self.assert_indexed(lambda: self.create_prediction(4, '2025-09-25T10:00:00'))
+
+
+class ApplyResultsTests(SimpleTestCase):
+    def setUp(self):
+        self.standings = pd.DataFrame({
+            'driver_number': [1, 4, 16, 1, 4, 16],
+            'round': [1, 1, 1, 2, 2, 2],
+            'position': [1, 2, 3, 1, 2, 3],
+            'points': [25, 18, 15, 50, 36, 30],
+            'wins': [1, 0, 0, 2, 0, 0],
+        })
+
+    def test_adds_round_and_reranks(self):
+        scenario = apply_results(self.standings, {16: {'position': 1}, 4: {'position': 2, 'points': 19}})
+        latest = scenario[scenario['round'] == 3].set_index('driver_number')
+
+        self.assertEqual(len(scenario), 9)
+        self.assertEqual(latest['points'].to_dict(), {1: 50, 4: 55, 16: 55})
+        self.assertEqual(latest['wins'].to_dict(), {1: 2, 4: 0, 16: 1})
+        # tied on points, the win puts 16 ahead
+        self.assertEqual(latest['position'].to_dict(), {1: 3, 4: 2, 16: 1})
+
+    def test_unknown_driver(self):
+        with self.assertRaises(ValueError):
+            apply_results(self.standings, {99: {'position': 1}})
+
+    def test_batched_features_match_each_scenario(self):
+        standings = pd.DataFrame(generate_standings(drivers=6, rounds=8))
+        scenarios = [apply_results(standings, {number: {'position': 1}}) for number in (1, 4, 10)]
+
+        for features, scenario in zip(scenario_features(scenarios), scenarios):
+            pd.testing.assert_frame_equal(features, next_round_features(scenario))
+
+
+class MicroBatcherTests(SimpleTestCase):
+    def test_concurrent_calls_share_a_batch(self):
+        calls = []
+
+        def double(items):
+            calls.append(items)
+            return [item * 2 for item in items]
+
+        batcher = MicroBatcher(double, max_batch=8, max_wait=0.2)
+        results = {}
+        threads = [
+            threading.Thread(target=lambda i=i: results.__setitem__(i, batcher.submit(i))) for i in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results, {i: i * 2 for i in range(5)})
+        self.assertEqual(len(calls), 1)
+
+    def test_errors_reach_every_caller(self):
+        def fail(items):
+            raise RuntimeError('model failed')
+
+        with self.assertRaisesMessage(RuntimeError, 'model failed'):
+            MicroBatcher(fail, max_wait=0).submit(1)
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class WhatIfViewTests(TemporaryArtifactDirMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.standings = generate_standings(drivers=6, rounds=8)
+        DriverStanding.objects.bulk_create(DriverStanding(**row) for row in self.standings)
+
+        # every test starts from a cold process
+        patcher = mock.patch.object(whatif, 'warm_predictor', WarmPredictor())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def train(self):
+        predictor = Predictor('xgboost', params={'n_estimators': 5})
+        load_or_train(predictor, predictor.prepare_features(pd.DataFrame(self.standings)))
+        return predictor
+
+    def post(self, results):
+        return self.client.post('/predictions/whatif/', {'results': results}, content_type='application/json')
+
+    def test_predicts_whole_grid(self):
+        predictor = self.train()
+        response = self.post([{'driver_number': 10, 'position': 1}, {'driver_number': 1, 'position': 2}])
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['round'], 9)
+        self.assertEqual(response.json()['model_type'], 'xgboost')
+
+        predictions = response.json()['predictions']
+        scenario = apply_results(pd.DataFrame(self.standings), {10: {'position': 1}, 1: {'position': 2}})
+        expected = predictor.predict_many(features=next_round_features(scenario))
+        self.assertEqual(len(predictions), 6)
+        self.assertEqual({row['driver_number']: row for row in predictions}, expected)
+
+    def test_model_stays_loaded(self):
+        self.train()
+        self.post([{'driver_number': 1, 'position': 1}])
+
+        with mock.patch.object(Predictor, 'load') as load, self.assertNumQueries(0):
+            self.assertEqual(self.post([{'driver_number': 4, 'position': 1}]).status_code, 200)
+        load.assert_not_called()
+
+    def test_reloads_changed_standings(self):
+        self.train()
+        self.post([{'driver_number': 1, 'position': 1}])
+
+        standing = DriverStanding.objects.get(driver_number=1, round=8)
+        standing.points += 100
+        standing.save()
+
+        # the save bumps the season's standings version, the next check loads the new rows
+        whatif.warm_predictor._checked_at = None
+        _, standings, _ = whatif.warm_predictor.state()
+        latest = standings[(standings['driver_number'] == 1) & (standings['round'] == 8)]
+        self.assertEqual(latest['points'].item(), standing.points)
+
+    def test_invalid_scenarios(self):
+        self.train()
+
+        self.assertEqual(self.post([]).status_code, 400)
+        self.assertEqual(self.post([{'driver_number': 1, 'position': 0}]).status_code, 400)
+        self.assertEqual(
+            self.post([{'driver_number': 1, 'position': 1}, {'driver_number': 4, 'position': 1}]).status_code, 400
+        )
+        self.assertEqual(self.post([{'driver_number': 99, 'position': 1}]).status_code, 400)
+
+    def test_no_model(self):
+        self.assertEqual(self.post([{'driver_number': 1, 'position': 1}]).status_code, 503)
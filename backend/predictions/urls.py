@@ -1,7 +1,9 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import PredictionView
+from .views import PredictionView, ChampionshipView, WhatIfView
 
 urlpatterns = [
-    path('predictions/', PredictionView.as_view(), name='predictions')
+    path('predictions/', PredictionView.as_view(), name='predictions'),
+    path('predictions/championship/', ChampionshipView.as_view(), name='championship'),
+    path('predictions/whatif/', WhatIfView.as_view(), name='whatif'),
 ]
\ No newline at end of file
@@ -5,16 +5,108 @@ from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler
 from sklearn.metrics import mean_absolute_error
 import xgboost as xgb
+import joblib
+import os
+import time
 import warnings
+from concurrent.futures import ThreadPoolExecutor
+from .features import TARGET_COLUMNS, build_features, next_round_features
 warnings.filterwarnings('ignore')
 
+# Hyperparameters of each supported model type
+DEFAULT_PARAMS = {
+    'random_forest': {
+        'n_estimators': 100,
+        'max_depth': 10,
+        'random_state': 42,
+    },
+    'xgboost': {
+        'n_estimators': 100,
+        'max_depth': 6,
+        'learning_rate': 0.1,
+        'random_state': 42,
+    },
+}
+
 class Predictor:
-    def __init__(self, model_type='random_forest'):
+    def __init__(self, model_type='random_forest', params=None, n_jobs=None):
+        if model_type not in DEFAULT_PARAMS:
+            raise ValueError(f"Unknown model type: {model_type}")
+
         self.model_type = model_type
+        self.params = {**DEFAULT_PARAMS[model_type], **(params or {})}
+        # total threads available to training, shared by the models fitted together
+        self.n_jobs = n_jobs or os.cpu_count() or 1
         self.position_model = None
         self.points_model = None
         self.scaler = StandardScaler()
         self.feature_names = []
+        # spread of each model's errors on the test split, set by train() or load()
+        self.residual_std = None
+
+    def _build_model(self, n_jobs=1):
+        """Create an untrained regressor of this predictor's model type"""
+
+        if self.model_type == 'random_forest':
+            return RandomForestRegressor(**self.params, n_jobs=n_jobs)
+        elif self.model_type == 'xgboost':
+            return xgb.XGBRegressor(**self.params, n_jobs=n_jobs)
+
+    def _fit_model(self, X, y, n_jobs):
+        """
+        Fit a new regressor and time it
+        :param X:
+        :param y:
+        :param n_jobs: threads the regressor may use
+        :return: fitted model and fit time in seconds
+        """
+
+        start = time.perf_counter()
+        model = self._build_model(n_jobs=n_jobs)
+        model.fit(X, y)
+
+        return model, time.perf_counter() - start
+
+    def save(self, path, metadata=None):
+        """
+        Save the trained models, scaler and feature names to disk
+        :param path:
+        :param metadata: extra information stored alongside, e.g. training metrics
+        :return:
+        """
+
+        if self.position_model is None:
+            raise ValueError("Model not trained yet. Call train_models() first.")
+
+        joblib.dump({
+            'model_type': self.model_type,
+            'params': self.params,
+            'position_model': self.position_model,
+            'points_model': self.points_model,
+            'scaler': self.scaler,
+            'feature_names': self.feature_names,
+            'residual_std': self.residual_std,
+            'metadata': metadata or {},
+        }, path)
+
+    def load(self, path):
+        """
+        Load models saved with save() into this predictor
+        :param path:
+        :return: metadata stored with the models
+        """
+
+        state = joblib.load(path)
+
+        self.model_type = state['model_type']
+        self.params = state['params']
+        self.position_model = state['position_model']
+        self.points_model = state['points_model']
+        self.scaler = state['scaler']
+        self.feature_names = state['feature_names']
+        self.residual_std = state['residual_std']
+
+        return state['metadata']
 
     def prepare_features(self, df):
         """
@@ -23,6 +115,16 @@ class Predictor:
         :return:
         """
 
+        return build_features(df)
+
+    def _prepare_features_iterative(self, df):
+        """
+        Per-row reference implementation of prepare_features.
+        Kept to check the vectorized engine against and to benchmark it.
+        :param df:
+        :return:
+        """
+
         features_list = []
 
         df = df.sort_values(['driver_number', 'round'])
@@ -128,23 +230,31 @@ class Predictor:
 
         return len(wins)
 
-    def train(self, standings):
+    def train(self, standings=None, features=None):
         """
         Train models on standings data
         :param standings:
+        :param features: precomputed feature rows, e.g. from the feature store
         :return:
         """
 
-        print("Preparing features...")
-        df = pd.DataFrame(standings)
-        features_df = self.prepare_features(df)
+        timings = {}
+        start = time.perf_counter()
+
+        if features is None:
+            print("Preparing features...")
+            df = pd.DataFrame(standings)
+            features = self.prepare_features(df)
+            timings['features'] = time.perf_counter() - start
+
+        # rows for upcoming rounds have no targets yet
+        features_df = features.dropna(subset=TARGET_COLUMNS)
 
         if len(features_df) == 0:
             raise ValueError("No training data available. Need at least 2 races per driver.")
 
         # separate features and targets
-        target_cols = ['target_position', 'target_points_gained']
-        feature_cols = [col for col in features_df.columns if col not in target_cols]
+        feature_cols = [col for col in features_df.columns if col not in TARGET_COLUMNS]
 
         X = features_df[feature_cols]
         y_position = features_df['target_position']
@@ -160,53 +270,38 @@ class Predictor:
         )
 
         # scaling features
+        phase_start = time.perf_counter()
         X_train_scaled = self.scaler.fit_transform(X_train)
         X_test_scaled = self.scaler.transform(X_test)
+        timings['scaling'] = time.perf_counter() - phase_start
 
-        # 1. train position prediction model
-        print("Training position prediction model...")
-        if self.model_type == 'random_forest':
-            self.position_model = RandomForestRegressor(
-                n_estimators=100,
-                max_depth=10,
-                random_state=42,
-                n_jobs=-1
-            )
-            self.position_model.fit(X_train, y_pos_train)
-        elif self.model_type == 'xgboost':
-            self.position_model = xgb.XGBRegressor(
-                n_estimators=100,
-                max_depth=6,
-                learning_rate=0.1,
-                random_state=42
-            )
-            self.position_model.fit(X_train, y_pos_train)
-
-        # 2. train points prediction model
-        print("Training points prediction model...")
-        if self.model_type == 'random_forest':
-            self.points_model = RandomForestRegressor(
-                n_estimators=100,
-                max_depth=10,
-                random_state=42,
-                n_jobs=-1
-            )
-            self.points_model.fit(X_train, y_pts_train)
-        elif self.model_type == 'xgboost':
-            self.points_model = xgb.XGBRegressor(
-                n_estimators=100,
-                max_depth=6,
-                learning_rate=0.1,
-                random_state=42
-            )
-            self.points_model.fit(X_train, y_pts_train)
+        # train position and points prediction models side by side, splitting the
+        # thread budget between them so the two fits don't oversubscribe the cpus
+        print("Training position and points prediction models...")
+        phase_start = time.perf_counter()
+        n_jobs = max(1, self.n_jobs // 2)
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            position_fit = executor.submit(self._fit_model, X_train, y_pos_train, n_jobs)
+            points_fit = executor.submit(self._fit_model, X_train, y_pts_train, n_jobs)
+
+            self.position_model, timings['position_model'] = position_fit.result()
+            self.points_model, timings['points_model'] = points_fit.result()
+
+        timings['fit'] = time.perf_counter() - phase_start
 
         # evaluate models
+        phase_start = time.perf_counter()
         pos_pred = self.position_model.predict(X_test)
         pts_pred = self.points_model.predict(X_test)
 
         pos_mae = mean_absolute_error(y_pos_test, pos_pred)
         pts_mae = mean_absolute_error(y_pts_test, pts_pred)
+        self.residual_std = {
+            'position': float(np.std(y_pos_test - pos_pred)),
+            'points': float(np.std(y_pts_test - pts_pred)),
+        }
+        timings['evaluation'] = time.perf_counter() - phase_start
 
         print(f"\nModel Performance:")
         print(f"Position Prediction MAE: {pos_mae:.2f} positions")
@@ -223,11 +318,14 @@ class Predictor:
             for i, row in importance_df.head(10).iterrows():
                 print(f"  {row['feature']}: {row['importance']:.3f}")
 
+        timings['total'] = time.perf_counter() - start
+
         return {
             'position_mae': pos_mae,
             'points_mae': pts_mae,
             'training_samples': len(X_train),
-            'test_samples': len(X_test)
+            'test_samples': len(X_test),
+            'timings': timings
         }
 
     def predict(self, standings, driver_number):
@@ -238,73 +336,88 @@ class Predictor:
         :return:
         """
 
+        return self.predict_many(standings, [driver_number]).get(driver_number)
+
+    def predict_many(self, standings=None, driver_numbers=None, features=None):
+        """
+        Predict next race performance for the whole grid.
+        Features for every driver are built in one pass and each model is called once.
+        :param standings:
+        :param driver_numbers: drivers to predict for, all drivers of the latest season if None
+        :param features: precomputed next-round feature rows, e.g. from the feature store
+        :return: dict of predictions keyed by driver number
+        """
+
         if self.position_model is None:
             raise ValueError("Model not trained yet. Call train_models() first.")
 
-        df = pd.DataFrame(standings)
-        driver_data = df[df['driver_number'] == driver_number].sort_values('round')
-
-        if len(driver_data) == 0:
-            return None
-
-        # get latest data for this driver
-        latest_race = driver_data.iloc[-1]
-        history = driver_data
-
-        # features for prediction (same as training but for current state)
-        features = {
-            'driver_number': driver_number,
-            'round': latest_race['round'] + 1,  # next race
-            'last_position': latest_race['position'],
-            'last_2_avg_position': history.iloc[-2:]['position'].mean() if len(history) >= 2 else latest_race[
-                'position'],
-            'last_3_avg_position': history.iloc[-3:]['position'].mean() if len(history) >= 3 else history[
-                'position'].mean(),
-            'last_5_avg_position': history.iloc[-5:]['position'].mean() if len(history) >= 5 else history[
-                'position'].mean(),
-            'position_trend_3_races': self._calculate_trend(history['position'].values, window=3),
-            'points_trend_3_races': self._calculate_trend(history['points'].values, window=3),
-            'position_std_3_races': history.iloc[-3:]['position'].std() if len(history) >= 3 else 0,
-            'position_std_5_races': history.iloc[-5:]['position'].std() if len(history) >= 5 else 0,
-            'current_championship_position': latest_race['position'],
-            'current_points': latest_race['points'],
-            'current_wins': latest_race['wins'],
-            'season_progress': (latest_race['round'] + 1) / 23,
-            'recent_wins': history.iloc[-3:]['wins'].max() - history.iloc[-3:]['wins'].min() if len(
-                history) >= 3 else 0,
-            'races_since_last_win': self._races_since_last_win(history),
-            'points_per_race_avg': latest_race['points'] / len(history),
-            'points_per_race_recent': (history.iloc[-3:]['points'].iloc[-1] - history.iloc[-3:]['points'].iloc[
-                0]) / 3 if len(history) >= 3 else 0,
-            'position_change_last_race': latest_race['position'] - history.iloc[-2]['position'] if len(
-                history) >= 2 else 0,
-            'best_position_last_5': history.iloc[-5:]['position'].min() if len(history) >= 5 else history[
-                'position'].min(),
-            'worst_position_last_5': history.iloc[-5:]['position'].max() if len(history) >= 5 else history[
-                'position'].max(),
-        }
+        if features is None:
+            df = pd.DataFrame(standings)
+            if len(df) == 0:
+                return {}
+
+            # features for prediction (same as training but for current state)
+            features = next_round_features(df)
 
-        # convert to pandas df with same column order as training
-        feature_df = pd.DataFrame([features])
-        feature_df = feature_df[self.feature_names]  # Ensure same order
+        if driver_numbers is not None:
+            features = features[features['driver_number'].isin(driver_numbers)]
+
+        if len(features) == 0:
+            return {}
+
+        predicted_positions, predicted_points_gains = self.predict_features(features)
+        return self.format_predictions(features, predicted_positions, predicted_points_gains)
+
+    def predict_features(self, features):
+        """
+        Run both models over feature rows, which may mix rows of different scenarios
+        :param features: next-round feature rows
+        :return: arrays of predicted positions and points gains, aligned with the rows
+        """
+
+        feature_df = features[self.feature_names]  # Ensure same order
 
         # make predictions (or predict whatever)
-        predicted_position = self.position_model.predict(feature_df)[0]
-        predicted_points_gain = self.points_model.predict(feature_df)[0]
+        predicted_positions = self.position_model.predict(feature_df)
+        predicted_points_gains = self.points_model.predict(feature_df)
 
         # ensure realistic bounds
-        predicted_position = max(1, min(20, predicted_position))
-        predicted_points_gain = max(0, predicted_points_gain)
+        predicted_positions = np.clip(predicted_positions, 1, 20)
+        predicted_points_gains = np.maximum(predicted_points_gains, 0)
 
-        return {
-            'driver_number': driver_number,
-            'predicted_position': round(predicted_position, 1),
-            'predicted_points_gain': round(predicted_points_gain, 1),
-            'predicted_total_points': round(latest_race['points'] + predicted_points_gain, 1),
-            'current_position': latest_race['position'],
-            'current_points': latest_race['points'],
-            'confidence': self._calculate_confidence(feature_df)
-        }
+        return predicted_positions, predicted_points_gains
+
+    def format_predictions(self, features, predicted_positions, predicted_points_gains):
+        """
+        Prediction dicts of feature rows from the arrays returned by predict_features
+        :param features:
+        :param predicted_positions:
+        :param predicted_points_gains:
+        :return: dict of predictions keyed by driver number
+        """
+
+        confidence = self._calculate_confidence(features[self.feature_names])
+
+        # only three columns are needed, reading them whole is much cheaper than a tuple per row
+        rows = zip(
+            features['driver_number'].tolist(), features['current_championship_position'].tolist(),
+            features['current_points'].tolist(), predicted_positions, predicted_points_gains,
+        )
+
+        predictions = {}
+        for driver_number, current_position, current_points, predicted_position, predicted_points_gain in rows:
+            driver_number = int(driver_number)
+            predictions[driver_number] = {
+                'driver_number': driver_number,
+                'predicted_position': round(predicted_position, 1),
+                'predicted_points_gain': round(predicted_points_gain, 1),
+                'predicted_total_points': round(current_points + predicted_points_gain, 1),
+                'current_position': int(current_position),
+                'current_points': float(current_points),
+                'confidence': confidence
+            }
+
+        return predictions
 
     def _calculate_confidence(self, features):
         """
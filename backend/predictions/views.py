@@ -4,9 +4,13 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from drivers.models import Driver, DriverStanding
-from .models import Prediction
-from .serializers import PredictionSerializer
+from .models import ChampionshipProbability
+from .serializers import ChampionshipProbabilitySerializer, WhatIfSerializer
 from .utils import Predictor
+from .cache import get_payload
+from .whatif import ModelUnavailable, predict_what_if
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
 import logging
 from datetime import datetime
 
@@ -14,21 +18,81 @@ logger = logging.getLogger(__name__)
 
 class PredictionView(APIView):
     def get(self, request):
+        """
+        Predictions of the latest run, served from cache until run_predictions writes a new one.
+        Clients revalidating with If-None-Match or If-Modified-Since get a 304.
+        """
         try:
-            predictions = Prediction.objects.all()
-            serializer = PredictionSerializer(predictions, many=True)
+            payload = get_payload()
+
+            not_modified = get_conditional_response(
+                request, etag=payload['etag'], last_modified=payload['last_modified']
+            )
+            if not_modified is not None:
+                patch_cache_control(not_modified, no_cache=True)
+                return not_modified
+
+            response = Response(payload['body'])
+            response['ETag'] = payload['etag']
+            if payload['last_modified'] is not None:
+                response['Last-Modified'] = http_date(payload['last_modified'])
+            patch_cache_control(response, no_cache=True)
+
+            return response
+
+        except Exception as e:
+            logger.error(f"Error getting predictions: {e}")
+            return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class ChampionshipView(APIView):
+    def get(self, request):
+        """Title and podium probabilities from the last championship simulation"""
+        try:
+            probabilities = ChampionshipProbability.objects.all()
+            serializer = ChampionshipProbabilitySerializer(probabilities, many=True)
 
             data = serializer.data
-            first_prediction = data[0]
+            if not data:
+                return Response({"error": "No championship simulation available"}, status=status.HTTP_404_NOT_FOUND)
+
+            first_probability = data[0]
 
             return Response({
-                'predictions': data,
-                'model_type': first_prediction['model_type'],
-                'generated_at': first_prediction['generated_at']
+                'probabilities': data,
+                'simulations': first_probability['simulations'],
+                'rounds_remaining': first_probability['rounds_remaining'],
+                'generated_at': first_probability['generated_at']
             })
 
-
         except Exception as e:
-            logger.error(f"Error getting predictions: {e}")
+            logger.error(f"Error getting championship probabilities: {e}")
             return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+
+class WhatIfView(APIView):
+    def post(self, request):
+        """
+        Predictions for the whole grid if the next race finished as posted, e.g.
+        {"results": [{"driver_number": 1, "position": 1}, {"driver_number": 4, "position": 2, "points": 19}]}.
+        Points default to the race points of the position. Served from the model loaded in memory,
+        concurrent requests share one model call.
+        """
+        serializer = WhatIfSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response({"error": serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        results = {result['driver_number']: result for result in serializer.validated_data['results']}
+
+        try:
+            return Response(predict_what_if(results))
+
+        except ModelUnavailable as e:
+            return Response({"error": str(e)}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        except Exception as e:
+            logger.error(f"Error predicting what-if scenario: {e}")
+            return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
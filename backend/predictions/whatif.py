@@ -0,0 +1,257 @@
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+import pandas as pd
+from django.db.models import Max
+
+from drivers.models import DriverStanding
+from drivers.standings import standings_versions
+from .artifacts import latest_artifact
+from .features import build_features, current_season
+from .loaders import load_standings
+from .search import load_best_params
+from .utils import Predictor
+
+logger = logging.getLogger(__name__)
+
+# Points for finishing 1st to 10th in a grand prix
+RACE_POINTS = [25, 18, 15, 12, 10, 8, 6, 4, 2, 1]
+
+# Seconds between checks for a newer model artifact or changed standings
+RELOAD_INTERVAL = 5
+
+# Requests arriving within MAX_WAIT seconds of each other share one model call
+MAX_BATCH = 32
+MAX_WAIT = 0.002
+
+
+class ModelUnavailable(Exception):
+    """No trained model has been saved yet"""
+
+
+def race_points(position):
+    return RACE_POINTS[position - 1] if 1 <= position <= len(RACE_POINTS) else 0
+
+
+def apply_results(standings, results):
+    """
+    Standings of the latest season with one more round, built from hypothetical results of the next race.
+    Drivers without a result score nothing, and the championship is re-ranked by points, then wins.
+    :param standings: pd.DataFrame with driver_number, round, position, points and wins
+    :param results: dict of driver number -> dict with the finishing position and optionally the points scored
+    :return: pd.DataFrame including the hypothetical round
+    """
+
+    season = current_season(standings)
+    latest = season.groupby('driver_number', sort=False).tail(1)
+    driver_numbers = latest['driver_number'].tolist()
+
+    unknown = sorted(set(results) - set(driver_numbers))
+    if unknown:
+        raise ValueError(f"Drivers not in the current standings: {unknown}")
+
+    finish = [results.get(driver_number, {}).get('position') for driver_number in driver_numbers]
+    gained = [
+        results[driver_number].get('points', race_points(position)) if position is not None else 0
+        for driver_number, position in zip(driver_numbers, finish)
+    ]
+
+    points = latest['points'].to_numpy() + np.array(gained, dtype=latest['points'].dtype)
+    wins = latest['wins'].to_numpy() + np.array([position == 1 for position in finish], dtype=latest['wins'].dtype)
+
+    # championship order after the round, ties keep the order from before it
+    order = np.lexsort((latest['position'].to_numpy(), -wins, -points))
+    positions = np.empty(len(order), dtype=latest['position'].dtype)
+    positions[order] = np.arange(1, len(order) + 1)
+
+    hypothetical = latest.assign(round=latest['round'] + 1, position=positions, points=points, wins=wins)
+    return pd.concat([season, hypothetical], ignore_index=True)
+
+
+class WarmPredictor:
+    """
+    Latest trained model and latest season's standings, loaded once per process and reloaded
+    only when run_predictions saved a newer artifact or the season's standings changed
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._checked_at = None
+        self._artifact = None
+        self._standings_version = None
+        self.predictor = None
+        self.standings = None
+        self.trained_at = None
+
+    def state(self):
+        """
+        :return: predictor, latest season standings as a pd.DataFrame, and when the model was trained
+        """
+
+        with self._lock:
+            if self._checked_at is None or time.monotonic() - self._checked_at >= RELOAD_INTERVAL:
+                self._reload()
+                self._checked_at = time.monotonic()
+
+            if self.predictor is None:
+                raise ModelUnavailable("No trained model available, run run_predictions first")
+
+            return self.predictor, self.standings, self.trained_at
+
+    def _reload(self):
+        best = load_best_params()
+        model_type = best['model_type'] if best else 'xgboost'
+
+        path = latest_artifact(model_type)
+        artifact = (path, path.stat().st_mtime) if path else None
+        if artifact != self._artifact and path is not None:
+            predictor = Predictor(model_type)
+            metadata = predictor.load(path)
+            self.predictor, self.trained_at = predictor, metadata.get('trained_at')
+            logger.info(f"Loaded {model_type} artifact {path.name} for what-if predictions")
+        self._artifact = artifact
+
+        season = DriverStanding.objects.aggregate(season=Max('season'))['season']
+        version = (season, standings_versions([season])[season])
+        if version != self._standings_version:
+            self.standings = pd.DataFrame(load_standings(seasons=[season] if season else []))
+            self._standings_version = version
+
+
+class MicroBatcher:
+    """
+    Run calls from concurrent requests as batches on one background thread.
+    A batch closes after max_wait seconds or max_batch calls, whichever comes first.
+    """
+
+    def __init__(self, func, max_batch=MAX_BATCH, max_wait=MAX_WAIT):
+        """
+        :param func: called with a list of items, returns a list of results in the same order
+        :param max_batch:
+        :param max_wait:
+        """
+
+        self.func = func
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def submit(self, item):
+        """
+        Add an item to the next batch and wait for its result
+        :param item:
+        :return: the result func returned for the item
+        """
+
+        future = Future()
+        self._queue.put((item, future))
+
+        # started lazily, so worker processes forked after import each get their own thread
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+
+        return future.result()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.max_wait
+
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            try:
+                results = self.func([item for item, _ in batch])
+                for (_, future), result in zip(batch, results):
+                    future.set_result(result)
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+
+
+def scenario_features(scenarios):
+    """
+    Next-round feature rows of many scenarios from a single build_features call.
+    Every scenario is keyed as a season of its own, so histories never mix, and each
+    scenario's rows match next_round_features of that scenario alone.
+    :param scenarios: list of standings of one season each, as returned by apply_results
+    :return: list of pd.DataFrame, one per scenario in driver_number order
+    """
+
+    history = pd.concat(
+        [scenario.assign(season=i) for i, scenario in enumerate(scenarios)], ignore_index=True
+    )
+    latest = history.groupby(['season', 'driver_number'], sort=False).tail(1)
+    upcoming = latest.assign(round=latest['round'] + 1, position=np.nan, points=np.nan, wins=np.nan)
+
+    features = build_features(pd.concat([history, upcoming], ignore_index=True), with_season=True)
+    features = features.groupby(['season', 'driver_number'], sort=False).tail(1)
+
+    return [
+        rows.drop(columns='season').reset_index(drop=True)
+        for _, rows in features.groupby('season', sort=True)
+    ]
+
+
+def predict_batch(items):
+    """
+    Features and predictions of many scenarios, with one feature pass and one model call per predictor
+    :param items: list of (predictor, scenario standings) pairs
+    :return: list of (features, predicted positions, predicted points gains), one per item
+    """
+
+    results = [None] * len(items)
+    groups = {}
+    for i, (predictor, _) in enumerate(items):
+        groups.setdefault(id(predictor), (predictor, []))[1].append(i)
+
+    for predictor, indexes in groups.values():
+        frames = scenario_features([items[i][1] for i in indexes])
+        positions, gains = predictor.predict_features(pd.concat(frames, ignore_index=True))
+
+        start = 0
+        for i, frame in zip(indexes, frames):
+            end = start + len(frame)
+            results[i] = (frame, positions[start:end], gains[start:end])
+            start = end
+
+    return results
+
+
+warm_predictor = WarmPredictor()
+batcher = MicroBatcher(predict_batch)
+
+
+def predict_what_if(results):
+    """
+    Predictions for the whole grid after a hypothetical next race
+    :param results: dict of driver number -> dict with the finishing position and optionally the points scored
+    :return: dict with the hypothetical round, the model used and the predictions for the round after it
+    """
+
+    predictor, standings, trained_at = warm_predictor.state()
+
+    scenario = apply_results(standings, results)
+    features, positions, gains = batcher.submit((predictor, scenario))
+    predictions = predictor.format_predictions(features, positions, gains)
+
+    return {
+        'round': int(scenario['round'].max()),
+        'predictions': sorted(predictions.values(), key=lambda prediction: prediction['predicted_position']),
+        'model_type': predictor.model_type,
+        'trained_at': trained_at,
+    }
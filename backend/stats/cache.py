@@ -0,0 +1,79 @@
+from django.core.cache import cache
+
+from drivers.models import DriverStanding
+from drivers.standings import standings_versions
+
+# a payload built for an older version of the season's standings is stale
+POINTS_KEY = 'stats:driverpoints:{season}'
+
+
+def build_season_points(seasons):
+    """
+    Pivot the standings of each season into one points array per driver
+    :param seasons: seasons to build
+    :return: dict of season -> {'season', 'rounds', 'drivers'}, where drivers maps each
+        driver number to its points in every round of `rounds`, None where it has no standing
+    """
+
+    rows = (
+        DriverStanding.objects.filter(season__in=seasons)
+        .order_by('season', 'driver_number', 'round')
+        .values_list('season', 'driver_number', 'round', 'points')
+    )
+
+    by_season = {}
+    for season, driver_number, round_number, points in rows:
+        by_season.setdefault(season, {}).setdefault(driver_number, {})[round_number] = points
+
+    payloads = {}
+    for season, drivers in by_season.items():
+        rounds = sorted({round_number for points in drivers.values() for round_number in points})
+        payloads[season] = {
+            'season': season,
+            'rounds': rounds,
+            'drivers': {
+                str(driver_number): [points.get(round_number) for round_number in rounds]
+                for driver_number, points in drivers.items()
+            },
+        }
+
+    return payloads
+
+
+def season_points(seasons=None):
+    """
+    Cached pivoted points of each season, rebuilt from the database only for seasons
+    whose standings changed since they were cached
+    :param seasons: seasons to return, every season with standings if None
+    :return: list of season payloads as built by build_season_points, oldest season first
+    """
+
+    if seasons is None:
+        seasons = DriverStanding.objects.values_list('season', flat=True).distinct()
+
+    seasons = sorted(set(seasons))
+    cached = cache.get_many([POINTS_KEY.format(season=season) for season in seasons])
+    versions = standings_versions(seasons)
+
+    payloads = {}
+    stale = {}
+    for season in seasons:
+        generation = versions[season]
+        entry = cached.get(POINTS_KEY.format(season=season))
+
+        if entry is None or entry['generation'] != generation:
+            stale[season] = generation
+        else:
+            payloads[season] = entry['payload']
+
+    if stale:
+        built = build_season_points(list(stale))
+        cache.set_many({
+            POINTS_KEY.format(season=season): {'generation': generation, 'payload': built[season]}
+            for season, generation in stale.items()
+            if season in built
+        }, timeout=None)
+        payloads.update(built)
+
+    return [payloads[season] for season in seasons if season in payloads]
+
@@ -1,3 +1,62 @@
-from django.test import TestCase
+from django.core.cache import cache
+from django.test import TestCase, override_settings
 
-# Create your tests here.
+from drivers.models import DriverStanding
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class DriverPointsStatViewTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        for season, driver_number, round_number, points in [
+            ('2024', 1, 1, 25), ('2024', 1, 2, 43),
+            ('2025', 1, 1, 18), ('2025', 1, 2, 36), ('2025', 4, 2, 25),
+        ]:
+            self.create_standing(season, driver_number, round_number, points)
+
+    def create_standing(self, season, driver_number, round_number, points):
+        DriverStanding.objects.update_or_create(
+            season=season, round=round_number, driver_number=driver_number,
+            defaults={'position': 1, 'points': points, 'wins': 0},
+        )
+
+    def test_pivots_points_per_season(self):
+        response = self.client.get('/driverpoints/', {'season': 'all'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['seasons'], [
+            {'season': '2024', 'rounds': [1, 2], 'drivers': {'1': [25, 43]}},
+            {'season': '2025', 'rounds': [1, 2], 'drivers': {'1': [18, 36], '4': [None, 25]}},
+        ])
+
+    def test_pivot_defaults_to_latest_season(self):
+        seasons = self.client.get('/driverpoints/').json()['seasons']
+        self.assertEqual([payload['season'] for payload in seasons], ['2025'])
+
+        DriverStanding.objects.all().delete()
+        self.assertEqual(self.client.get('/driverpoints/').json(), {'seasons': []})
+
+    def test_row_layout_is_kept(self):
+        response = self.client.get('/driverpoints/', {'season': '2024', 'layout': 'rows'})
+
+        self.assertEqual(response.json(), [
+            {'points': 25, 'driver_number': 1, 'round': 1},
+            {'points': 43, 'driver_number': 1, 'round': 2},
+        ])
+
+    def test_only_changed_seasons_are_rebuilt(self):
+        self.client.get('/driverpoints/', {'season': 'all'})
+
+        # one query for the list of seasons, both payloads come from the cache
+        with self.assertNumQueries(1):
+            self.client.get('/driverpoints/', {'season': 'all'})
+
+        self.create_standing('2025', 4, 1, 10)
+
+        with self.assertNumQueries(2):
+            response = self.client.get('/driverpoints/', {'season': 'all'})
+
+        self.assertEqual(response.json()['seasons'][1]['drivers']['4'], [10, 25])
+
+    def test_rejects_unknown_layout(self):
+        self.assertEqual(self.client.get('/driverpoints/', {'layout': 'columns'}).status_code, 400)
@@ -1,7 +1,9 @@
 from rest_framework.viewsets import ViewSet
 from rest_framework.response import Response
 from rest_framework import status
+from django.db.models import Max
 from drivers.models import DriverStanding
+from .cache import season_points
 from .serializers import DriverPointsStatSerializer
 
 
@@ -9,13 +11,39 @@ class DriverPointsStatViewSet(ViewSet):
     """API ViewSet for driver points statistics"""
 
     def list(self, request):
-        """Get all driver points data for graphing"""
+        """
+        Get all driver points data for graphing.
+        By default the latest season comes pivoted, one points array per driver, from a
+        per-season cache, ?season=all pivots every season. ?layout=rows returns one object
+        per standing instead.
+        """
+        layout = request.query_params.get('layout', 'pivot')
+        if layout not in ('pivot', 'rows'):
+            return Response(
+                {'error': 'layout must be pivot or rows'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
         try:
             # Get all standings, filter by season
             season = request.query_params.get('season')
-            queryset = DriverStanding.objects.all()
 
-            
+            if layout == 'pivot':
+                if season == 'all':
+                    seasons = None
+                elif season:
+                    seasons = [season]
+                else:
+                    # only the latest season, a backfilled history would otherwise come whole
+                    latest = DriverStanding.objects.aggregate(season=Max('season'))['season']
+                    seasons = [latest] if latest else []
+
+                return Response(
+                    {'seasons': season_points(seasons)},
+                    status=status.HTTP_200_OK
+                )
+
+            queryset = DriverStanding.objects.all()
 
             if season:
                 queryset = queryset.filter(season=season)
@@ -31,4 +59,4 @@ class DriverPointsStatViewSet(ViewSet):
             return Response(
                 {'error': 'Unable to fetch points data'},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
\ No newline at end of file
+            )
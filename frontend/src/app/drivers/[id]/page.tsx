@@ -5,6 +5,7 @@ import { Footer } from "@/components/shared/footer"
 import { SpeedLines } from "@/components/shared/speed-lines"
 import { User, Calendar, Trophy, Users, ArrowLeft } from "lucide-react"
 import Image from "next/image"
+import { driverPhotoUrl } from "@/lib/photos"
 import Link from "next/link"
 import { getDriverData, getLatestDriverStanding } from "@/lib/api"
 
@@ -79,7 +80,8 @@ export default async function DriverDetailPage({ params }: { params: Promise<{ i
                 <div className="animate-slide-in-right">
                   <div className="w-64 h-64 mx-auto relative">
                     <Image
-                      src={`/drivers/${driver.driver_number}.png` || "placeholder.svg"}
+                      src={driverPhotoUrl(driver, "lg")}
+                      unoptimized={Boolean(driver.photo_urls)}
                       alt={driver.full_name}
                       fill
                       className="rounded-full object-cover shadow-2xl ring-8 ring-white group-hover:ring-pennred transition-all duration-500 scale-300"
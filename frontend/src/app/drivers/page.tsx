@@ -4,6 +4,7 @@ import { Header } from "@/components/shared/header"
 import { Footer } from "@/components/shared/footer"
 import { Users, Zap } from "lucide-react"
 import Image from "next/image"
+import { driverPhotoUrl } from "@/lib/photos"
 import Link from "next/link"
 import { getAllDrivers } from "@/lib/api"
 
@@ -55,7 +56,8 @@ export default async function DriversPage() {
                       {/* Driver Photo */}
                       <div className="w-24 h-24 mx-auto mb-4 relative">
                         <Image
-                          src={`/drivers/${driver.driver_number}.png` || "/placeholder.svg"}
+                          src={driverPhotoUrl(driver, "md")}
+                          unoptimized={Boolean(driver.photo_urls)}
                           alt={driver.full_name}
                           fill
                           className="rounded-full object-cover shadow-lg ring-4 ring-white group-hover:ring-pennred transition-all duration-300"
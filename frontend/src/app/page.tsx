@@ -4,6 +4,7 @@ import { Header } from "@/components/shared/header"
 import { Footer } from "@/components/shared/footer"
 import { Trophy, Clock, Check, Activity } from "lucide-react"
 import Image from "next/image"
+import { driverPhotoUrl } from "@/lib/photos"
 import { getPodiumData, getDriverData } from "@/lib/api"
 import { formatTime, formatGap } from "@/lib/format"
 
@@ -101,7 +102,8 @@ export default async function HomePage() {
                           {driver?.headshot_url && (
                             <div className="w-14 h-14 sm:w-16 sm:h-16 lg:w-20 lg:h-20 relative flex-shrink-0">
                               <Image
-                                src={`/drivers/${driver.driver_number}.png` || "/placeholder.svg"}
+                                src={driverPhotoUrl(driver, "md")}
+                                unoptimized={Boolean(driver.photo_urls)}
                                 alt={driver.full_name || `Driver #${result.driver_number}`}
                                 fill
                                 className="rounded-full object-cover shadow-lg ring-2 sm:ring-4 ring-white group-hover:ring-pennred transition-all duration-300"
@@ -4,6 +4,7 @@ import { Header } from "@/components/shared/header"
 import { Footer } from "@/components/shared/footer"
 import { TrendingUp, TrendingDown, Minus, Brain, Clock, Target } from "lucide-react"
 import Image from "next/image"
+import { driverPhotoUrl } from "@/lib/photos"
 import { getPredictions, getDriverData } from "@/lib/api"
 
 export const dynamic = 'force-dynamic'
@@ -108,7 +109,8 @@ export default async function PredictionsPage() {
                           {driver?.headshot_url && (
                             <div className="w-20 h-20 relative">
                               <Image
-                                src={`/drivers/${driver.driver_number}.png` || "/placeholder.svg"}
+                                src={driverPhotoUrl(driver, "md")}
+                                unoptimized={Boolean(driver.photo_urls)}
                                 alt={driver.full_name || `Driver #${prediction.driver_number}`}
                                 fill
                                 className="rounded-full object-cover shadow-lg ring-4 ring-white group-hover:ring-pennred transition-all duration-300"
@@ -10,19 +10,19 @@ import { getDriverPoints, getAllDrivers } from "@/lib/api"
 export default async function StatsPage() {
   const [driverPointsData, driversData] = await Promise.all([getDriverPoints(), getAllDrivers()])
 
-  // Group points by driver
+  // Latest season, one points array per driver aligned with its rounds
+  const latestSeason = driverPointsData.seasons[driverPointsData.seasons.length - 1]
   const driverPointsMap = new Map()
-  driverPointsData.forEach((point) => {
-    if (!driverPointsMap.has(point.driver_number)) {
-      driverPointsMap.set(point.driver_number, [])
-    }
-    driverPointsMap.get(point.driver_number).push(point)
-  })
-
-  // Sort points by round for each driver
-  driverPointsMap.forEach((points: any[]) => {
-    points.sort((a: any, b: any) => a.round - b.round)
-  })
+  if (latestSeason) {
+    Object.entries(latestSeason.drivers).forEach(([driverNumber, points]) => {
+      driverPointsMap.set(
+        Number(driverNumber),
+        latestSeason.rounds
+          .map((round, i) => ({ round, points: points[i] }))
+          .filter((point) => point.points !== null),
+      )
+    })
+  }
 
   // Get current standings (latest round points)
   const currentStandings = Array.from(driverPointsMap.entries())
@@ -37,7 +37,7 @@ export default async function StatsPage() {
     })
     .sort((a, b) => b.points - a.points)
 
-  const totalRounds = Math.max(...driverPointsData.map((p) => p.round))
+  const totalRounds = latestSeason ? Math.max(...latestSeason.rounds) : 0
 
   return (
     <div className="min-h-screen bg-gradient-to-br from-silver via-white to-silver font-mono">
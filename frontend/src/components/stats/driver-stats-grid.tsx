@@ -4,6 +4,7 @@ import { Card, CardContent, CardHeader } from "@/components/ui/card"
 import { Badge } from "@/components/ui/badge"
 import { TrendingUp, TrendingDown, Minus, Trophy } from "lucide-react"
 import Image from "next/image"
+import { driverPhotoUrl } from "@/lib/photos"
 
 interface DriverStatsGridProps {
   driverPointsMap: Map<number, any[]>
@@ -125,7 +126,8 @@ export function DriverStatsGrid({ driverPointsMap, driversData, currentStandings
                 {stats.driver && (
                   <div className="w-16 h-16 relative">
                     <Image
-                      src={`/drivers/${stats.driver.driver_number}.png` || "/placeholder.svg"}
+                      src={driverPhotoUrl(stats.driver, "md")}
+                      unoptimized={Boolean(stats.driver.photo_urls)}
                       alt={stats.driver?.full_name || `Driver #${stats.driver?.driver_number}`}
                       fill
                       className="rounded-full object-cover shadow-lg ring-2 ring-white group-hover:ring-pennred transition-all duration-300"
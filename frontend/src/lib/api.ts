@@ -1,4 +1,4 @@
-import type { Driver, PodiumData, Standing, PredictionsResponse } from "./types"
+import type { Driver, PodiumData, Standing, PredictionsResponse, DriverPointsResponse } from "./types"
 
 export const dynamic = 'force-dynamic'
 const API_BASE_URL = process.env.NEXT_PUBLIC_API_URL || 'http://127.0.0.1:8000'
@@ -39,17 +39,29 @@ export async function getDriverData(driverNumber: number): Promise<Driver | null
     }
 }
 
-export async function getAllDrivers(): Promise<Driver[]> {
-  try {
-    const response = await fetch(`${API_BASE_URL}/drivers/`, {
-      cache: "no-store",
-    })
-    
+// List endpoints are cursor paginated, follow the next links until the last page
+async function fetchAllPages<T>(url: string): Promise<T[]> {
+  const results: T[] = []
+  let next: string | null = url
+
+  while (next) {
+    const response: Response = await fetch(next, { cache: "no-store" })
+
     if (!response.ok) {
-      throw new Error("Failed to fetch drivers")
+      throw new Error(`Failed to fetch ${url}`)
     }
-    
-    return await response.json()
+
+    const page = await response.json()
+    results.push(...page.results)
+    next = page.next
+  }
+
+  return results
+}
+
+export async function getAllDrivers(): Promise<Driver[]> {
+  try {
+    return await fetchAllPages<Driver>(`${API_BASE_URL}/drivers/`)
   } catch (error) {
     console.error("Error fetching drivers:", error)
     return []
@@ -92,7 +104,7 @@ export async function getLatestDriverStanding(driverNumber: number): Promise<Sta
     }
 }
 
-export async function getDriverPoints(): Promise<any[]> {
+export async function getDriverPoints(): Promise<DriverPointsResponse> {
     try {
         const response = await fetch(`${API_BASE_URL}/driverpoints/`, {
             cache: "no-store",
@@ -105,7 +117,7 @@ export async function getDriverPoints(): Promise<any[]> {
         return await response.json()
     } catch (error) {
         console.error("Error fetching driver points:", error)
-        return []
+        return { seasons: [] }
     }
 }
 
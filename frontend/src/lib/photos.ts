@@ -0,0 +1,6 @@
+import type { Driver, PhotoSize } from "./types"
+
+// Versioned photo URL from the API, cached by browsers for good, or the bundled headshot
+export function driverPhotoUrl(driver: Driver, size: PhotoSize = "md"): string {
+  return driver.photo_urls?.[size] ?? `/drivers/${driver.driver_number}.png`
+}
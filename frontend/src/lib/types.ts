@@ -11,8 +11,11 @@ export interface Driver {
   name_acronym: string
   session_key: number
   team_name: string
+  photo_urls: Record<PhotoSize, string> | null
 }
 
+export type PhotoSize = "sm" | "md" | "lg"
+
 export interface PodiumResult {
   position: number
   driver_number: number
@@ -39,6 +42,16 @@ export interface Standing {
   driver_number: number
 }
 
+export interface SeasonPoints {
+  season: string
+  rounds: number[]
+  drivers: Record<string, (number | null)[]>
+}
+
+export interface DriverPointsResponse {
+  seasons: SeasonPoints[]
+}
+
 export interface Prediction {
   driver_number: number
   predicted_position: number